@@ -0,0 +1,61 @@
+"""Conditional GET support: ETags from change versions and 304 responses.
+
+A response's ETag is derived from the change version of the data it reads
+plus the request path and query string, so it can be computed and compared
+before any document is loaded or any response model is built.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+# Authenticated data: shared caches must not store it, clients must revalidate
+CACHE_CONTROL = "private, no-cache"
+VARY = "Authorization, Accept-Language"
+
+
+def make_etag(scope: str, version, request: Request) -> str:
+    """Strong ETag for ``request`` against version ``version`` of ``scope``."""
+    language = request.headers.get("accept-language", "")
+    digest = hashlib.sha1(
+        f"{scope}:{version}:{request.url.path}?{request.url.query}:{language}".encode()
+    ).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def add_vary(response: Response, *headers: str) -> None:
+    """Add ``headers`` to the response's ``Vary`` list, keeping those already there."""
+    listed = [name.strip() for name in response.headers.get("Vary", "").split(",") if name.strip()]
+    known = {name.lower() for name in listed}
+    listed += [name for name in headers if name.lower() not in known]
+    response.headers["Vary"] = ", ".join(listed)
+
+
+def conditional_response(request: Request, response: Response, scope: str, version) -> Optional[Response]:
+    """
+    Handle ``If-None-Match`` for a GET endpoint.
+
+    Returns a 304 response to send as-is when the client's copy is current.
+    Otherwise sets ``ETag`` and caching headers on ``response`` and returns
+    None so the endpoint builds the full response.
+    """
+    etag = make_etag(scope, version, request)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    add_vary(response, *VARY.split(", "))
+    response.headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
@@ -1,40 +1,89 @@
 """API dependencies for dependency injection."""
 
-from typing import Optional
+from typing import Any, Dict, Optional, Union
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
 from fastapi import Depends, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.config import settings
 from app.models.user import User, Role
 from app.core.security import decode_token
-from app.core.exceptions import raise_unauthorized, raise_forbidden
+from app.core.principals import Principal, principal_cache
+from app.core.revocation import revocation_store
+from app.core.exceptions import raise_unauthorized, raise_forbidden, raise_bad_request
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
-    """Get current authenticated user from JWT token."""
-    token = credentials.credentials
-    payload = decode_token(token)
+def _decode_credentials(credentials: HTTPAuthorizationCredentials) -> Dict[str, Any]:
+    """Decode the bearer token and validate the basic claims."""
+    payload = decode_token(credentials.credentials)
 
     if not payload:
         raise_unauthorized("Invalid or expired token")
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub") or payload.get("type") != "access":
         raise_unauthorized("Invalid token payload")
 
-    user = await User.get(user_id)
-    if not user:
-        raise_unauthorized("User not found")
+    return payload
+
+
+async def _load_user(payload: Dict[str, Any]) -> User:
+    """Resolve the token subject to an active user, using the principal cache."""
+    user_id = payload["sub"]
+    revoked_at = await revocation_store.revoked_since(user_id)
+    if revoked_at is not None and (payload.get("iat") is None or payload["iat"] < revoked_at):
+        raise_unauthorized("Token has been revoked")
 
-    if not user.is_active:
-        raise_unauthorized("User account is inactive")
+    await principal_cache.check_version()
+    user = principal_cache.get(user_id, not_before=revoked_at)
+    if user is None:
+        # Taken before the read, so a put that raced an invalidation is dropped
+        read_at = principal_cache.now()
+        user = await User.get(user_id)
+        if not user:
+            raise_unauthorized("User not found")
+
+        if not user.is_active:
+            raise_unauthorized("User account is inactive")
+
+        principal_cache.put(user, read_at)
 
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> User:
+    """Get current authenticated user from JWT token."""
+    payload = _decode_credentials(credentials)
+    return await _load_user(payload)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Union[User, Principal]:
+    """
+    Get the authenticated principal for authorization checks.
+
+    With ``settings.auth_stateless_roles`` enabled the principal is built from
+    the verified token claims and checked against the revocation store only,
+    so no database lookup happens. Otherwise this resolves the full ``User``.
+    Both expose ``id``, ``username`` and ``role``.
+    """
+    payload = _decode_credentials(credentials)
+
+    if settings.auth_stateless_roles:
+        principal = Principal.from_claims(payload)
+        if principal:
+            if await revocation_store.is_revoked(principal.id, principal.issued_at):
+                raise_unauthorized("Token has been revoked")
+            return principal
+
+    return await _load_user(payload)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -47,7 +96,9 @@ async def get_current_active_user(
 def require_role(*allowed_roles: Role):
     """Dependency to check if user has required role."""
 
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(
+        current_user: Union[User, Principal] = Depends(get_current_principal)
+    ) -> Union[User, Principal]:
         if current_user.role not in allowed_roles:
             raise_forbidden(f"This action requires one of these roles: {', '.join(r.value for r in allowed_roles)}")
         return current_user
@@ -55,8 +106,18 @@ def require_role(*allowed_roles: Role):
     return role_checker
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_admin(
+    current_user: Union[User, Principal] = Depends(get_current_principal)
+) -> Union[User, Principal]:
     """Require admin role."""
     if current_user.role != Role.ADMIN:
         raise_forbidden("Admin access required")
     return current_user
+
+
+def parse_object_id(value: str, field: str) -> PydanticObjectId:
+    """Parse an ObjectId query parameter, rejecting malformed values with 400."""
+    try:
+        return PydanticObjectId(value)
+    except (InvalidId, TypeError):
+        raise_bad_request(f"Invalid {field}")
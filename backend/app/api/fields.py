@@ -0,0 +1,68 @@
+"""Response field selection: ``?fields=`` sparse fieldsets and single-language responses."""
+
+from typing import Literal, Optional
+
+from fastapi import Header, Query, Response
+
+from app.api.conditional import add_vary
+from app.core.exceptions import raise_bad_request
+from app.core.serialization import ModelSerializer
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated response fields to return, e.g. id,risk_id,title_en (id is always included)",
+)
+
+
+def sparse_fields(serializer: ModelSerializer, fields: Optional[str]) -> ModelSerializer:
+    """Serializer limited to the requested fields, rejecting unknown names with 400."""
+    if not fields:
+        return serializer
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(serializer.fields))
+    if unknown:
+        raise_bad_request(f"Unknown fields: {', '.join(unknown)}")
+
+    return serializer.select(requested)
+
+
+LANGUAGES = ("en", "ar")
+
+
+def get_language(
+    lang: Optional[Literal["en", "ar"]] = Query(
+        None, description="Return only this language's *_en/*_ar fields (default: both)"
+    ),
+    accept_language: Optional[str] = Header(None),
+) -> Optional[str]:
+    """
+    Negotiate a single-language response.
+
+    ``?lang=`` wins. ``Accept-Language`` is honoured only when it names a
+    single language (``ar`` or ``ar-SA``); browsers send weighted lists by
+    default, and those keep the bilingual response.
+    """
+    if lang:
+        return lang
+    if accept_language and "," not in accept_language:
+        primary = accept_language.split(";")[0].strip().split("-")[0].lower()
+        if primary in LANGUAGES:
+            return primary
+    return None
+
+
+def localized(serializer: ModelSerializer, language: Optional[str]) -> ModelSerializer:
+    """Serializer without the other languages' fields; the projection shrinks with it."""
+    if not language:
+        return serializer
+
+    dropped = tuple(f"_{other}" for other in LANGUAGES if other != language)
+    return serializer.select([name for name in serializer.fields if not name.endswith(dropped)])
+
+
+def set_content_language(response: Response, language: Optional[str]) -> None:
+    """Mark a language-negotiated response; it varies on Accept-Language even when bilingual."""
+    add_vary(response, "Accept-Language")
+    if language:
+        response.headers["Content-Language"] = language
@@ -0,0 +1,146 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Lists are ordered newest first by ``(created_at, _id)``. The cursor is an
+opaque token holding the sort key of the last item on a page; the next page
+is fetched with a range query on that key instead of ``skip``, so every page
+costs the same no matter how deep the client goes. The cursor for the next
+page is returned in the ``X-Next-Cursor`` response header and is absent on
+the last page, which keeps response bodies plain JSON arrays.
+
+The ``skip`` offset of the old offset pagination is still honoured on a
+first page for existing clients; such responses carry ``Deprecation: true``.
+"""
+
+import base64
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+from fastapi import Query, Response
+from pymongo import DESCENDING
+
+from app.config import settings
+from app.core.exceptions import raise_bad_request
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEPRECATION_HEADER = "Deprecation"
+
+# Sort order shared by all paginated lists; backed by a compound index on each model
+SORT_KEY: List[Tuple[str, int]] = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+class PageParams:
+    """Query parameters shared by paginated list endpoints."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+        limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+        skip: int = Query(0, ge=0, deprecated=True, description="Offset into the list; use cursor instead"),
+    ):
+        if skip and cursor:
+            raise_bad_request("skip cannot be combined with cursor")
+        self.cursor = cursor
+        self.limit = limit
+        self.skip = skip
+
+
+def encode_cursor(created_at: datetime, doc_id: Any) -> str:
+    """Encode the sort key of the last item on a page."""
+    raw = json.dumps([created_at.isoformat(), str(doc_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, PydanticObjectId]:
+    """Decode a cursor, rejecting tampered or malformed values with 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), PydanticObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId):
+        raise_bad_request("Invalid pagination cursor")
+
+
+def keyset_filter(cursor: Optional[str]) -> Dict[str, Any]:
+    """Range filter selecting the items that come after the cursor."""
+    if not cursor:
+        return {}
+
+    created_at, doc_id = decode_cursor(cursor)
+    return {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}},
+        ]
+    }
+
+
+def _set_next_cursor(docs: list, page: PageParams, response: Response) -> list:
+    if page.skip:
+        response.headers[DEPRECATION_HEADER] = "true"
+    if len(docs) > page.limit:
+        docs = docs[:page.limit]
+        last = docs[-1]
+        if isinstance(last, dict):
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last["created_at"], last["_id"])
+        else:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    return docs
+
+
+async def paginate(query, page: PageParams, response: Response) -> list:
+    """
+    Fetch one page of a Beanie ``FindMany`` query.
+
+    One extra document is read to learn whether another page exists; if so
+    its cursor is set on the response.
+    """
+    cursor_filter = keyset_filter(page.cursor)
+    if cursor_filter:
+        query = query.find(cursor_filter)
+
+    query = query.sort(SORT_KEY)
+    if page.skip:
+        query = query.skip(page.skip)
+    docs = await query.limit(page.limit + 1).to_list()
+    return _set_next_cursor(docs, page, response)
+
+
+async def paginate_raw(
+    collection,
+    criteria: Dict[str, Any],
+    projection: Dict[str, int],
+    page: PageParams,
+    response: Response,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch one page as raw BSON dicts, skipping Beanie document construction.
+
+    The sort key is always projected so the next cursor can be built.
+    """
+    cursor_filter = keyset_filter(page.cursor)
+    if cursor_filter:
+        criteria = {"$and": [criteria, cursor_filter]} if criteria else cursor_filter
+
+    projection = {**projection, "created_at": 1}
+    cursor = collection.find(criteria, projection).sort(SORT_KEY)
+    if page.skip:
+        cursor = cursor.skip(page.skip)
+    docs = await cursor.limit(page.limit + 1).to_list(length=None)
+    return _set_next_cursor(docs, page, response)
+
+
+def paginate_items(items: Iterable, page: PageParams, response: Response) -> list:
+    """
+    Page through in-memory documents with the same cursor semantics as ``paginate``.
+
+    ``items`` must already be ordered newest first by ``(created_at, id)``.
+    """
+    if page.cursor:
+        created_at, doc_id = decode_cursor(page.cursor)
+        items = (d for d in items if (d.created_at, d.id) < (created_at, doc_id))
+
+    return _set_next_cursor(list(islice(items, page.skip, page.skip + page.limit + 1)), page, response)
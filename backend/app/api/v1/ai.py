@@ -1,21 +1,33 @@
 """AI service endpoints."""
 
+from datetime import datetime
+from typing import Any, Dict, Optional
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from app.services.ai_service import AIService, ComplianceSuggestion
-from app.models.control import Control
+from app.services.assessment_cache import assessment_cache
+from app.services.catalog import catalog
+from app.models.evidence import Evidence
 from app.models.user import Role
-from app.api.deps import require_role
+from app.api.deps import parse_object_id, require_role
 from app.core.exceptions import raise_not_found, AIServiceError
 
 router = APIRouter()
 
 
+def get_ai_service() -> AIService:
+    """AI service on the shared vLLM client; override in tests to stub vLLM."""
+    return AIService()
+
+
 class AnalyzeEvidenceRequest(BaseModel):
     """Request to analyze evidence."""
     control_id: str
     evidence_text: str
+    # Evidence record of this control to store the assessment on
+    evidence_id: Optional[str] = None
 
 
 class AnalyzeEvidenceResponse(BaseModel):
@@ -25,40 +37,44 @@ class AnalyzeEvidenceResponse(BaseModel):
     reasoning_en: str
     reasoning_ar: str
     recommendations: list[str]
+    cached: bool = False
 
 
 @router.post("/analyze-evidence", response_model=AnalyzeEvidenceResponse)
 async def analyze_evidence(
     request: AnalyzeEvidenceRequest,
     current_user=Depends(require_role(Role.ADMIN, Role.RISK_OFFICER, Role.AUDITOR)),
+    ai_service: AIService = Depends(get_ai_service),
 ):
     """
     Analyze evidence against a control using AI.
 
     This endpoint uses vLLM to assess whether provided evidence
     demonstrates compliance with a specific control requirement.
+    Repeated analyses of the same control and evidence are served from the
+    assessment cache. With ``evidence_id`` the result is also stored on
+    that evidence record as ``ai_assessment`` / ``ai_confidence``.
     """
     # Get control
-    control = await Control.get(request.control_id)
+    await catalog.ensure_loaded()
+    control = catalog.get_control(request.control_id)
     if not control:
         raise_not_found("Control not found")
 
+    evidence = Evidence.get_motor_collection()
+    evidence_id = None
+    if request.evidence_id is not None:
+        evidence_id = parse_object_id(request.evidence_id, "evidence_id")
+        if not await evidence.find_one({"_id": evidence_id, "control.$id": control.id}, {"_id": 1}):
+            raise_not_found("Evidence not found for this control")
+
     # Call AI service
     try:
-        ai_service = AIService()
         suggestion = await ai_service.analyze_evidence(
             evidence_text=request.evidence_text,
             control=control
         )
 
-        return AnalyzeEvidenceResponse(
-            compliance_status=suggestion.compliance_status,
-            confidence=suggestion.confidence,
-            reasoning_en=suggestion.reasoning_en,
-            reasoning_ar=suggestion.reasoning_ar,
-            recommendations=suggestion.recommendations,
-        )
-
     except AIServiceError as e:
         # Return graceful degradation if AI service is unavailable
         return AnalyzeEvidenceResponse(
@@ -68,3 +84,30 @@ async def analyze_evidence(
             reasoning_ar=f"خدمة الذكاء الاصطناعي غير متاحة: {str(e)}",
             recommendations=[],
         )
+
+    if evidence_id is not None:
+        await evidence.update_one(
+            {"_id": evidence_id},
+            {"$set": {
+                "ai_assessment": suggestion.compliance_status,
+                "ai_confidence": suggestion.confidence,
+                "updated_at": datetime.utcnow(),
+            }},
+        )
+
+    return AnalyzeEvidenceResponse(
+        compliance_status=suggestion.compliance_status,
+        confidence=suggestion.confidence,
+        reasoning_en=suggestion.reasoning_en,
+        reasoning_ar=suggestion.reasoning_ar,
+        recommendations=suggestion.recommendations,
+        cached=suggestion.cached,
+    )
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(
+    current_user=Depends(require_role(Role.ADMIN)),
+) -> Dict[str, Any]:
+    """Hit rates of this worker's AI assessment cache (memory and MongoDB tiers)."""
+    return assessment_cache.stats()
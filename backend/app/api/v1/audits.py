@@ -1,8 +1,8 @@
 """Audit management endpoints."""
 
-from typing import List
+from typing import List, Literal, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from app.schemas.audit import (
     AuditCreate,
@@ -15,35 +15,49 @@ from app.schemas.audit import (
 from app.models.audit import Audit, AuditStatus
 from app.models.nonconformity import NonConformity, Severity, NonConformityStatus
 from app.models.user import User, Role
-from app.api.deps import get_current_user, require_role
+from app.api.deps import get_current_principal, parse_object_id, require_role
+from app.api.pagination import PageParams, paginate, paginate_raw
+from app.api.export import UPDATED_SINCE_QUERY, stream_export
+from app.api.fields import FIELDS_QUERY, get_language, localized, set_content_language, sparse_fields
+from app.services.sequences import sequences
+from app.services.dashboard_stats import dashboard_counters
+from app.core.serialization import ModelSerializer
 from app.core.exceptions import raise_not_found, raise_bad_request
 
 router = APIRouter()
 
+audit_serializer = ModelSerializer(AuditResponse, lead_auditor_id="lead_auditor.$id")
+finding_serializer = ModelSerializer(
+    NonConformityResponse,
+    audit_id="audit.$id",
+    control_id="control.$id",
+    assigned_to_id="assigned_to.$id",
+)
+
+
+@router.get("/", response_model=List[AuditResponse], dependencies=[Depends(get_current_principal)])
+async def list_audits(
+    response: Response,
+    status: Optional[AuditStatus] = Query(None),
+    lead_auditor_id: Optional[str] = Query(None),
+    fields: Optional[str] = FIELDS_QUERY,
+    language: Optional[str] = Depends(get_language),
+    page: PageParams = Depends(),
+):
+    """List audits with optional filters, newest first."""
+    serializer = localized(sparse_fields(audit_serializer, fields), language)
+    criteria = {}
+
+    if status:
+        criteria["status"] = status.value
+    if lead_auditor_id:
+        criteria["lead_auditor.$id"] = parse_object_id(lead_auditor_id, "lead_auditor_id")
 
-@router.get("/", response_model=List[AuditResponse], dependencies=[Depends(get_current_user)])
-async def list_audits():
-    """List all audits."""
-    audits = await Audit.find_all().to_list()
-    return [
-        AuditResponse(
-            id=str(audit.id),
-            audit_id=audit.audit_id,
-            title_en=audit.title_en,
-            title_ar=audit.title_ar,
-            scope=audit.scope,
-            description_en=audit.description_en,
-            description_ar=audit.description_ar,
-            status=audit.status.value,
-            lead_auditor_id=str(audit.lead_auditor.ref.id),
-            auditor_ids=audit.auditor_ids,
-            start_date=audit.start_date,
-            end_date=audit.end_date,
-            findings_summary=audit.findings_summary,
-            created_at=audit.created_at,
-        )
-        for audit in audits
-    ]
+    audits = await paginate_raw(
+        Audit.get_motor_collection(), criteria, serializer.projection(), page, response
+    )
+    set_content_language(response, language)
+    return serializer.list_response(audits, response)
 
 
 @router.post("/", response_model=AuditResponse, status_code=status.HTTP_201_CREATED)
@@ -56,12 +70,9 @@ async def create_audit(
     if not lead_auditor:
         raise_bad_request("Lead auditor not found")
 
-    # Generate audit ID
-    count = await Audit.count()
-    audit_id = f"AUD-{datetime.now().year}-{count + 1:04d}"
-
+    # The audit ID is assigned on insert
     audit = Audit(
-        audit_id=audit_id,
+        audit_id="",
         title_en=audit_data.title_en,
         title_ar=audit_data.title_ar,
         scope=audit_data.scope,
@@ -73,55 +84,51 @@ async def create_audit(
         end_date=audit_data.end_date,
     )
 
-    await audit.insert()
-
-    return AuditResponse(
-        id=str(audit.id),
-        audit_id=audit.audit_id,
-        title_en=audit.title_en,
-        title_ar=audit.title_ar,
-        scope=audit.scope,
-        description_en=audit.description_en,
-        description_ar=audit.description_ar,
-        status=audit.status.value,
-        lead_auditor_id=str(audit.lead_auditor.ref.id),
-        auditor_ids=audit.auditor_ids,
-        start_date=audit.start_date,
-        end_date=audit.end_date,
-        findings_summary=audit.findings_summary,
-        created_at=audit.created_at,
+    await sequences.insert_with_id(audit, "audit_id", "AUD")
+    await dashboard_counters.record(audit)
+
+    return audit_serializer.response(audit, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/findings/export", dependencies=[Depends(get_current_principal)])
+async def export_findings(
+    audit_id: Optional[str] = Query(None),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    updated_since: Optional[datetime] = UPDATED_SINCE_QUERY,
+):
+    """Stream audit findings, across all audits or for one, as NDJSON or CSV."""
+    criteria = {}
+    if audit_id:
+        criteria["audit.$id"] = parse_object_id(audit_id, "audit_id")
+    return stream_export(
+        NonConformity.get_motor_collection(), criteria, finding_serializer, format, "findings", updated_since
     )
 
 
 @router.get("/{audit_id}/findings", response_model=List[NonConformityResponse])
 async def list_audit_findings(
     audit_id: str,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    status: Optional[NonConformityStatus] = Query(None),
+    severity: Optional[Severity] = Query(None),
+    page: PageParams = Depends(),
+    current_user=Depends(get_current_principal),
 ):
-    """List all findings for an audit."""
+    """List findings for an audit with optional filters, newest first."""
     audit = await Audit.get(audit_id)
     if not audit:
         raise_not_found("Audit not found")
 
-    findings = await NonConformity.find(NonConformity.audit.ref.id == audit_id).to_list()
-
-    return [
-        NonConformityResponse(
-            id=str(nc.id),
-            audit_id=str(nc.audit.ref.id),
-            control_id=str(nc.control.ref.id) if nc.control else None,
-            finding=nc.finding,
-            severity=nc.severity.value,
-            status=nc.status.value,
-            corrective_action=nc.corrective_action,
-            assigned_to_id=str(nc.assigned_to.ref.id) if nc.assigned_to else None,
-            due_date=nc.due_date,
-            resolution_notes=nc.resolution_notes,
-            resolved_at=nc.resolved_at,
-            created_at=nc.created_at,
-        )
-        for nc in findings
-    ]
+    query = NonConformity.find({"audit.$id": audit.id})
+
+    if status:
+        query = query.find(NonConformity.status == status)
+    if severity:
+        query = query.find(NonConformity.severity == severity)
+
+    findings = await paginate(query, page, response)
+
+    return finding_serializer.list_response(findings, response)
 
 
 @router.post("/{audit_id}/findings", response_model=NonConformityResponse, status_code=status.HTTP_201_CREATED)
@@ -155,18 +162,6 @@ async def create_finding(
             nonconformity.assigned_to = assignee
 
     await nonconformity.insert()
+    await dashboard_counters.record(nonconformity)
 
-    return NonConformityResponse(
-        id=str(nonconformity.id),
-        audit_id=str(nonconformity.audit.ref.id),
-        control_id=str(nonconformity.control.ref.id) if nonconformity.control else None,
-        finding=nonconformity.finding,
-        severity=nonconformity.severity.value,
-        status=nonconformity.status.value,
-        corrective_action=nonconformity.corrective_action,
-        assigned_to_id=str(nonconformity.assigned_to.ref.id) if nonconformity.assigned_to else None,
-        due_date=nonconformity.due_date,
-        resolution_notes=nonconformity.resolution_notes,
-        resolved_at=nonconformity.resolved_at,
-        created_at=nonconformity.created_at,
-    )
+    return finding_serializer.response(nonconformity, status_code=status.HTTP_201_CREATED)
@@ -2,10 +2,12 @@
 
 from fastapi import APIRouter, Depends, status
 
-from app.schemas.auth import LoginRequest, TokenResponse, UserProfile
+from app.schemas.auth import LoginRequest, TokenResponse, RefreshTokenRequest, UserProfile
 from app.services.auth_service import AuthService
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_principal
 from app.models.user import User
+from app.core.exceptions import AuthenticationError, raise_unauthorized
+from app.core.principals import revoke_principal
 
 router = APIRouter()
 
@@ -30,6 +32,45 @@ async def login(request: LoginRequest):
     )
 
 
+@router.post("/refresh", response_model=TokenResponse, status_code=status.HTTP_200_OK)
+async def refresh(request: RefreshTokenRequest):
+    """
+    Exchange a refresh token for a new access and refresh token pair.
+
+    Refresh tokens are single-use: the presented token is rotated, and
+    replaying an already used token revokes the whole session.
+    """
+    auth_service = AuthService()
+    try:
+        user, access_token, refresh_token = await auth_service.refresh_tokens(
+            request.refresh_token
+        )
+    except AuthenticationError as e:
+        raise_unauthorized(e.message)
+
+    return TokenResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer"
+    )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(request: RefreshTokenRequest):
+    """Revoke the session the given refresh token belongs to."""
+    auth_service = AuthService()
+    try:
+        await auth_service.revoke_refresh_token(request.refresh_token)
+    except AuthenticationError as e:
+        raise_unauthorized(e.message)
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(current_user=Depends(get_current_principal)):
+    """Revoke every session and token of the current user."""
+    await revoke_principal(str(current_user.id))
+
+
 @router.get("/me", response_model=UserProfile, status_code=status.HTTP_200_OK)
 async def get_current_user_profile(current_user: User = Depends(get_current_user)):
     """Get current user profile."""
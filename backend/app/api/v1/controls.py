@@ -1,74 +1,221 @@
 """Controls endpoints."""
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
-
-from app.schemas.control import ControlResponse, ControlUpdate
-from app.models.control import Control
+from collections import Counter as Tally
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from beanie import PydanticObjectId
+from beanie.operators import In
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic_core import to_json
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.schemas.control import (
+    ControlBulkResponse,
+    ControlBulkResult,
+    ControlBulkUpdate,
+    ControlResponse,
+    ControlSearchResult,
+    ControlUpdate,
+)
+from app.models.control import Control, ImplementationStatus
 from app.models.user import Role
-from app.api.deps import get_current_user, require_role
+from app.api.deps import get_current_principal, parse_object_id, require_role
+from app.api.pagination import PageParams, paginate_items
+from app.api.conditional import conditional_response
+from app.api.export import UPDATED_SINCE_QUERY, stream_export
+from app.api.fields import FIELDS_QUERY, get_language, localized, set_content_language, sparse_fields
+from app.services.catalog import catalog
+from app.services.compliance import compliance_rollup
+from app.services.dashboard_stats import counter_changes, dashboard_counters, snapshot
+from app.config import settings
+from app.core.serialization import ModelSerializer, json_response
 from app.core.exceptions import raise_not_found
 
 router = APIRouter()
 
+control_serializer = ModelSerializer(ControlResponse)
+
 
-@router.get("/", response_model=List[ControlResponse], dependencies=[Depends(get_current_user)])
+@router.get("/", response_model=List[ControlResponse], dependencies=[Depends(get_current_principal)])
 async def list_controls(
+    request: Request,
+    response: Response,
     standard_id: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
+    language: Optional[str] = Depends(get_language),
+    page: PageParams = Depends(),
 ):
     """List controls with optional filters."""
-    query = Control.find()
+    serializer = localized(sparse_fields(control_serializer, fields), language)
+    if standard_id:
+        parse_object_id(standard_id, "standard_id")
 
+    await catalog.ensure_loaded()
+    not_modified = conditional_response(request, response, "catalog", catalog.version)
+    if not_modified:
+        return not_modified
+
+    controls = paginate_items(
+        catalog.list_controls(standard_id=standard_id, priority=priority, status=status),
+        page,
+        response,
+    )
+
+    set_content_language(response, language)
+    return serializer.list_response(controls, response)
+
+
+@router.get("/search", response_model=List[ControlSearchResult], dependencies=[Depends(get_current_principal)])
+async def search_controls(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Keywords in English or Arabic"),
+    standard_id: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=settings.page_size_max),
+    fields: Optional[str] = FIELDS_QUERY,
+    language: Optional[str] = Depends(get_language),
+):
+    """Full-text search over control codes, titles, domains and descriptions, best match first."""
+    serializer = localized(sparse_fields(control_serializer, fields), language)
     if standard_id:
-        query = query.find(Control.standard.ref.id == standard_id)
-    if priority:
-        query = query.find(Control.priority == priority)
-    if status:
-        query = query.find(Control.implementation_status == status)
-
-    controls = await query.skip(skip).limit(limit).to_list()
-
-    return [
-        ControlResponse(
-            id=str(ctrl.id),
-            control_id=ctrl.control_id,
-            domain_en=ctrl.domain_en,
-            domain_ar=ctrl.domain_ar,
-            title_en=ctrl.title_en,
-            title_ar=ctrl.title_ar,
-            description_en=ctrl.description_en,
-            description_ar=ctrl.description_ar,
-            priority=ctrl.priority,
-            implementation_status=ctrl.implementation_status.value,
-            implementation_notes=ctrl.implementation_notes,
-        )
-        for ctrl in controls
-    ]
-
-
-@router.get("/{control_id}", response_model=ControlResponse, dependencies=[Depends(get_current_user)])
-async def get_control(control_id: str):
+        parse_object_id(standard_id, "standard_id")
+
+    await catalog.ensure_loaded()
+    not_modified = conditional_response(request, response, "catalog", catalog.version)
+    if not_modified:
+        return not_modified
+
+    hits = catalog.search_controls(q, standard_id=standard_id, limit=limit)
+
+    set_content_language(response, language)
+    rows = [{**serializer.row(control), "score": round(score, 4)} for control, score in hits]
+    return json_response(to_json(rows), response)
+
+
+@router.get("/export", dependencies=[Depends(get_current_principal)])
+async def export_controls(
+    standard_id: str = Query(..., description="Standard whose controls are exported"),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    updated_since: Optional[datetime] = UPDATED_SINCE_QUERY,
+):
+    """Stream a standard's controls as NDJSON or CSV, oldest change first."""
+    criteria = {"standard.$id": parse_object_id(standard_id, "standard_id")}
+    return stream_export(
+        Control.get_motor_collection(), criteria, control_serializer, format, "controls", updated_since
+    )
+
+
+@router.get("/{control_id}", response_model=ControlResponse, dependencies=[Depends(get_current_principal)])
+async def get_control(
+    control_id: str,
+    request: Request,
+    response: Response,
+    language: Optional[str] = Depends(get_language),
+):
     """Get control by ID."""
-    control = await Control.get(control_id)
+    await catalog.ensure_loaded()
+    not_modified = conditional_response(request, response, "catalog", catalog.version)
+    if not_modified:
+        return not_modified
+
+    control = catalog.get_control(control_id)
     if not control:
         raise_not_found("Control not found")
 
-    return ControlResponse(
-        id=str(control.id),
-        control_id=control.control_id,
-        domain_en=control.domain_en,
-        domain_ar=control.domain_ar,
-        title_en=control.title_en,
-        title_ar=control.title_ar,
-        description_en=control.description_en,
-        description_ar=control.description_ar,
-        priority=control.priority,
-        implementation_status=control.implementation_status.value,
-        implementation_notes=control.implementation_notes,
+    set_content_language(response, language)
+    return localized(control_serializer, language).response(control, response)
+
+
+def control_changes(update_data: ControlUpdate) -> Dict[str, Any]:
+    """Field changes requested by a control update. Raises ValueError on an unknown status."""
+    changes: Dict[str, Any] = {}
+    if update_data.implementation_status:
+        changes["implementation_status"] = ImplementationStatus(update_data.implementation_status)
+    if update_data.implementation_notes is not None:
+        changes["implementation_notes"] = update_data.implementation_notes
+    return changes
+
+
+@router.patch("/bulk", response_model=ControlBulkResponse)
+async def bulk_update_controls(
+    update_data: ControlBulkUpdate,
+    current_user = Depends(require_role(Role.ADMIN, Role.RISK_OFFICER)),
+):
+    """
+    Update the status and notes of many controls in one request.
+
+    Changes are applied with a single unordered ``bulk_write`` of targeted
+    ``$set`` updates; one item failing does not stop the others. Results are
+    returned per item, in request order.
+    """
+    now = datetime.utcnow()
+    results: List[ControlBulkResult] = []
+    pending: Dict[PydanticObjectId, tuple] = {}
+
+    for item in update_data.updates:
+        result = ControlBulkResult(id=item.id, status="updated")
+        results.append(result)
+        try:
+            object_id = PydanticObjectId(item.id)
+            changes = control_changes(item)
+        except (InvalidId, ValueError) as e:
+            result.status, result.detail = "invalid", str(e)
+            continue
+        if object_id in pending:
+            result.status, result.detail = "invalid", "Duplicate control id in request"
+            continue
+        pending[object_id] = (result, changes)
+
+    # One read for the current values the counters and the catalog need
+    controls = {}
+    if pending:
+        controls = {c.id: c for c in await Control.find(In(Control.id, list(pending))).to_list()}
+
+    operations, applied = [], []
+    for object_id, (result, changes) in pending.items():
+        control = controls.get(object_id)
+        if control is None:
+            result.status, result.detail = "not_found", "Control not found"
+            continue
+        stored = {k: v.value if isinstance(v, ImplementationStatus) else v for k, v in changes.items()}
+        operations.append(UpdateOne({"_id": object_id}, {"$set": {**stored, "updated_at": now}}))
+        applied.append((result, control, changes))
+
+    write_errors: Dict[int, str] = {}
+    if operations:
+        try:
+            await Control.get_motor_collection().bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            write_errors = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+
+    counters = Tally()
+    updated: List[Control] = []
+    for index, (result, control, changes) in enumerate(applied):
+        if index in write_errors:
+            result.status, result.detail = "failed", write_errors[index]
+            continue
+        before = snapshot(control)
+        for field, value in changes.items():
+            setattr(control, field, value)
+        control.updated_at = now
+        counters.update(counter_changes(control, before))
+        updated.append(control)
+
+    counters = {path: delta for path, delta in counters.items() if delta}
+    if counters:
+        await dashboard_counters.apply(counters)
+    if updated:
+        compliance_rollup.invalidate()
+        await catalog.controls_updated(updated)
+
+    return ControlBulkResponse(
+        updated=len(updated),
+        failed=len(results) - len(updated),
+        results=results,
     )
 
 
@@ -83,25 +230,18 @@ async def update_control(
     if not control:
         raise_not_found("Control not found")
 
+    before = snapshot(control)
+
     if update_data.implementation_status:
-        from app.models.control import ImplementationStatus
         control.implementation_status = ImplementationStatus(update_data.implementation_status)
 
     if update_data.implementation_notes is not None:
         control.implementation_notes = update_data.implementation_notes
 
+    control.updated_at = datetime.utcnow()
     await control.save()
+    await dashboard_counters.record(control, before)
+    compliance_rollup.invalidate()
+    await catalog.control_updated(control)
 
-    return ControlResponse(
-        id=str(control.id),
-        control_id=control.control_id,
-        domain_en=control.domain_en,
-        domain_ar=control.domain_ar,
-        title_en=control.title_en,
-        title_ar=control.title_ar,
-        description_en=control.description_en,
-        description_ar=control.description_ar,
-        priority=control.priority,
-        implementation_status=control.implementation_status.value,
-        implementation_notes=control.implementation_notes,
-    )
+    return control_serializer.response(control)
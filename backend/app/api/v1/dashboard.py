@@ -1,13 +1,19 @@
 """Dashboard summary endpoints."""
 
-from fastapi import APIRouter, Depends
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Request, Response
 from pydantic import BaseModel
 
-from app.models.control import Control, ImplementationStatus
-from app.models.risk import Risk, RiskLevel
-from app.models.audit import Audit, AuditStatus
-from app.models.nonconformity import NonConformity, NonConformityStatus
-from app.api.deps import get_current_user
+from app.models.control import ImplementationStatus
+from app.models.risk import RiskLevel
+from app.models.audit import AuditStatus
+from app.models.nonconformity import NonConformityStatus
+from app.api.deps import get_current_principal
+from app.api.conditional import conditional_response
+from app.services.catalog import catalog
+from app.services.compliance import compliance_rollup
+from app.services.dashboard_stats import dashboard_counters
 
 router = APIRouter()
 
@@ -23,44 +29,101 @@ class DashboardSummary(BaseModel):
     total_audits: int
     active_audits: int
     open_findings: int
+    controls_by_status: Dict[str, int]
+    controls_by_priority: Dict[str, int]
+    risks_by_status: Dict[str, int]
+    risks_by_level: Dict[str, int]
+    audits_by_status: Dict[str, int]
+    findings_by_status: Dict[str, int]
+    findings_by_severity: Dict[str, int]
 
 
-@router.get("/summary", response_model=DashboardSummary)
-async def get_dashboard_summary(current_user = Depends(get_current_user)):
-    """Get aggregated dashboard statistics."""
-    # Controls stats
-    total_controls = await Control.count()
-    implemented_controls = await Control.find(
-        Control.implementation_status == ImplementationStatus.IMPLEMENTED
-    ).count()
-    compliance_percentage = (
-        (implemented_controls / total_controls * 100) if total_controls > 0 else 0
-    )
+class ComplianceScore(BaseModel):
+    """Control counts and compliance for a set of controls."""
+    total_controls: int
+    applicable_controls: int
+    implemented_controls: int
+    compliance_percentage: float
+    weighted_compliance_percentage: float
+    by_status: Dict[str, int]
+
+
+class DomainCompliance(ComplianceScore):
+    """Compliance of one domain of a standard."""
+    domain_en: str
+    domain_ar: str
+    by_priority: Dict[str, Dict[str, int]]
+
+
+class StandardCompliance(ComplianceScore):
+    """Compliance of one standard, broken down by domain."""
+    standard_id: str
+    code: Optional[str] = None
+    name_en: Optional[str] = None
+    name_ar: Optional[str] = None
+    domains: List[DomainCompliance]
 
-    # Risk stats
-    total_risks = await Risk.count()
-    open_risks = await Risk.find(Risk.status == "OPEN").count()
-    critical_risks = await Risk.find(Risk.risk_level == RiskLevel.CRITICAL).count()
 
-    # Audit stats
-    total_audits = await Audit.count()
-    active_audits = await Audit.find(
-        Audit.status.in_([AuditStatus.PLANNED, AuditStatus.IN_PROGRESS])
-    ).count()
+class ComplianceRollup(ComplianceScore):
+    """Overall compliance broken down by standard and domain."""
+    standards: List[StandardCompliance]
 
-    # Findings stats
-    open_findings = await NonConformity.find(
-        NonConformity.status.in_([NonConformityStatus.OPEN, NonConformityStatus.IN_PROGRESS])
-    ).count()
+
+def build_summary(stats: Dict[str, Dict[str, Dict[str, int]]]) -> DashboardSummary:
+    """Derive the dashboard headline numbers from the per-collection breakdowns."""
+    controls, risks = stats["controls"], stats["risks"]
+    audits, findings = stats["audits"], stats["findings"]
+
+    total_controls = sum(controls["by_status"].values())
+    implemented_controls = controls["by_status"][ImplementationStatus.IMPLEMENTED.value]
+    compliance_percentage = (
+        (implemented_controls / total_controls * 100) if total_controls > 0 else 0
+    )
 
     return DashboardSummary(
         total_controls=total_controls,
         implemented_controls=implemented_controls,
         compliance_percentage=round(compliance_percentage, 1),
-        total_risks=total_risks,
-        open_risks=open_risks,
-        critical_risks=critical_risks,
-        total_audits=total_audits,
-        active_audits=active_audits,
-        open_findings=open_findings,
+        total_risks=sum(risks["by_status"].values()),
+        open_risks=risks["by_status"]["OPEN"],
+        critical_risks=risks["by_level"][RiskLevel.CRITICAL.value],
+        total_audits=sum(audits["by_status"].values()),
+        active_audits=sum(
+            audits["by_status"][s.value] for s in (AuditStatus.PLANNED, AuditStatus.IN_PROGRESS)
+        ),
+        open_findings=sum(
+            findings["by_status"][s.value]
+            for s in (NonConformityStatus.OPEN, NonConformityStatus.IN_PROGRESS)
+        ),
+        controls_by_status=controls["by_status"],
+        controls_by_priority=controls["by_priority"],
+        risks_by_status=risks["by_status"],
+        risks_by_level=risks["by_level"],
+        audits_by_status=audits["by_status"],
+        findings_by_status=findings["by_status"],
+        findings_by_severity=findings["by_severity"],
     )
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(current_user=Depends(get_current_principal)):
+    """Get dashboard statistics from the materialized counters."""
+    return build_summary(await dashboard_counters.read())
+
+
+@router.get("/compliance", response_model=ComplianceRollup, dependencies=[Depends(get_current_principal)])
+async def get_compliance_rollup(request: Request, response: Response):
+    """
+    Compliance per standard and per domain, with the status counts per priority.
+
+    ``weighted_compliance_percentage`` weights controls by priority and
+    gives half credit to partially implemented ones; not-applicable
+    controls are excluded from both percentages.
+    """
+    await catalog.ensure_loaded()
+    not_modified = conditional_response(request, response, "catalog", catalog.version)
+    if not_modified:
+        return not_modified
+
+    standards = {str(s.id): s for s in catalog.list_standards(active_only=False)}
+    return await compliance_rollup.get(catalog.version, standards)
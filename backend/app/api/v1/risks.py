@@ -1,47 +1,84 @@
 """Risk management endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
 from datetime import datetime
 
-from app.schemas.risk import RiskCreate, RiskUpdate, RiskResponse
-from app.models.risk import Risk
+from app.schemas.risk import RiskCreate, RiskImportReport, RiskUpdate, RiskResponse
+from app.models.risk import Risk, RiskLevel, RiskTreatment
 from app.models.user import User, Role
-from app.api.deps import get_current_user, require_role
+from app.api.deps import get_current_principal, parse_object_id, require_role
+from app.api.pagination import PageParams, paginate_raw
+from app.api.fields import FIELDS_QUERY, get_language, localized, set_content_language, sparse_fields
+from app.api.conditional import conditional_response
+from app.api.export import UPDATED_SINCE_QUERY, stream_export
+from app.config import settings
+from app.services.risk_import import (
+    build_risk,
+    detect_format,
+    import_risks,
+    iter_lines,
+    iter_records,
+    read_chunks,
+)
+from app.services.sequences import sequences
+from app.services.dashboard_stats import dashboard_counters, snapshot
+from app.services.versions import bump_version, get_version
+from app.core.serialization import ModelSerializer
 from app.core.exceptions import raise_not_found, raise_bad_request
 
 router = APIRouter()
 
+risk_serializer = ModelSerializer(RiskResponse, owner_id="owner.$id")
 
-@router.get("/", response_model=List[RiskResponse], dependencies=[Depends(get_current_user)])
-async def list_risks():
-    """List all risks."""
-    risks = await Risk.find_all().to_list()
-    return [
-        RiskResponse(
-            id=str(risk.id),
-            risk_id=risk.risk_id,
-            title_en=risk.title_en,
-            title_ar=risk.title_ar,
-            description_en=risk.description_en,
-            description_ar=risk.description_ar,
-            asset=risk.asset,
-            threat=risk.threat,
-            vulnerability=risk.vulnerability,
-            impact_score=risk.impact_score,
-            likelihood_score=risk.likelihood_score,
-            risk_score=risk.risk_score,
-            risk_level=risk.risk_level.value,
-            treatment=risk.treatment.value,
-            treatment_plan=risk.treatment_plan,
-            status=risk.status,
-            owner_id=str(risk.owner.ref.id),
-            review_date=risk.review_date,
-            created_at=risk.created_at,
-            updated_at=risk.updated_at,
-        )
-        for risk in risks
-    ]
+
+@router.get("/", response_model=List[RiskResponse], dependencies=[Depends(get_current_principal)])
+async def list_risks(
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(None),
+    risk_level: Optional[RiskLevel] = Query(None),
+    treatment: Optional[RiskTreatment] = Query(None),
+    owner_id: Optional[str] = Query(None),
+    fields: Optional[str] = FIELDS_QUERY,
+    language: Optional[str] = Depends(get_language),
+    page: PageParams = Depends(),
+):
+    """List risks with optional filters, newest first."""
+    not_modified = conditional_response(request, response, "risks", await get_version("risks"))
+    if not_modified:
+        return not_modified
+
+    serializer = localized(sparse_fields(risk_serializer, fields), language)
+    criteria = {}
+
+    if status:
+        criteria["status"] = status
+    if risk_level:
+        criteria["risk_level"] = risk_level.value
+    if treatment:
+        criteria["treatment"] = treatment.value
+    if owner_id:
+        criteria["owner.$id"] = parse_object_id(owner_id, "owner_id")
+
+    risks = await paginate_raw(
+        Risk.get_motor_collection(), criteria, serializer.projection(), page, response
+    )
+    set_content_language(response, language)
+    return serializer.list_response(risks, response)
+
+
+@router.get("/export", dependencies=[Depends(get_current_principal)])
+async def export_risks(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    updated_since: Optional[datetime] = UPDATED_SINCE_QUERY,
+    status: Optional[str] = Query(None),
+):
+    """Stream the whole risk register as NDJSON or CSV, oldest change first."""
+    criteria = {"status": status} if status else {}
+    return stream_export(
+        Risk.get_motor_collection(), criteria, risk_serializer, format, "risks", updated_since
+    )
 
 
 @router.post("/", response_model=RiskResponse, status_code=status.HTTP_201_CREATED)
@@ -55,87 +92,59 @@ async def create_risk(
     if not owner:
         raise_bad_request("Owner not found")
 
-    # Generate risk ID
-    count = await Risk.count()
-    risk_id = f"RISK-{datetime.now().year}-{count + 1:04d}"
-
-    # Create risk
-    from app.models.risk import RiskTreatment
-    risk = Risk(
-        risk_id=risk_id,
-        title_en=risk_data.title_en,
-        title_ar=risk_data.title_ar,
-        description_en=risk_data.description_en,
-        description_ar=risk_data.description_ar,
-        asset=risk_data.asset,
-        threat=risk_data.threat,
-        vulnerability=risk_data.vulnerability,
-        impact_score=risk_data.impact_score,
-        likelihood_score=risk_data.likelihood_score,
-        treatment=RiskTreatment(risk_data.treatment),
-        treatment_plan=risk_data.treatment_plan,
-        owner=owner,
-        review_date=risk_data.review_date,
-    )
+    # Create risk; the risk ID is assigned on insert
+    risk = build_risk(risk_data, owner)
 
-    # Calculate risk score and level
-    risk.calculate_risk_score()
-
-    await risk.insert()
-
-    return RiskResponse(
-        id=str(risk.id),
-        risk_id=risk.risk_id,
-        title_en=risk.title_en,
-        title_ar=risk.title_ar,
-        description_en=risk.description_en,
-        description_ar=risk.description_ar,
-        asset=risk.asset,
-        threat=risk.threat,
-        vulnerability=risk.vulnerability,
-        impact_score=risk.impact_score,
-        likelihood_score=risk.likelihood_score,
-        risk_score=risk.risk_score,
-        risk_level=risk.risk_level.value,
-        treatment=risk.treatment.value,
-        treatment_plan=risk.treatment_plan,
-        status=risk.status,
-        owner_id=str(risk.owner.ref.id),
-        review_date=risk.review_date,
-        created_at=risk.created_at,
-        updated_at=risk.updated_at,
-    )
+    await sequences.insert_with_id(risk, "risk_id", "RISK")
+    await dashboard_counters.record(risk)
+    await bump_version("risks")
+
+    return risk_serializer.response(risk, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/import", response_model=RiskImportReport)
+async def import_risk_register(
+    file: UploadFile = File(..., description="CSV with a header row, or JSON Lines"),
+    format: Optional[Literal["csv", "jsonl"]] = Query(None, description="Defaults to the file extension"),
+    current_user = Depends(require_role(Role.ADMIN, Role.RISK_OFFICER)),
+):
+    """
+    Import risks from a CSV or JSON Lines file with ``RiskCreate`` columns.
+
+    Valid rows are inserted even when others fail; failed rows are listed
+    with their line number.
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt is None:
+        raise_bad_request("Cannot tell the file format, pass format=csv or format=jsonl")
 
+    records = iter_records(iter_lines(read_chunks(file)), fmt)
+    try:
+        report = await import_risks(records, settings.risk_import_chunk_size)
+    except ValueError as e:
+        raise_bad_request(str(e))
 
-@router.get("/{risk_id}", response_model=RiskResponse, dependencies=[Depends(get_current_user)])
-async def get_risk(risk_id: str):
+    return RiskImportReport.model_validate(report)
+
+
+@router.get("/{risk_id}", response_model=RiskResponse, dependencies=[Depends(get_current_principal)])
+async def get_risk(
+    risk_id: str,
+    request: Request,
+    response: Response,
+    language: Optional[str] = Depends(get_language),
+):
     """Get risk by ID."""
+    not_modified = conditional_response(request, response, "risks", await get_version("risks"))
+    if not_modified:
+        return not_modified
+
     risk = await Risk.get(risk_id)
     if not risk:
         raise_not_found("Risk not found")
 
-    return RiskResponse(
-        id=str(risk.id),
-        risk_id=risk.risk_id,
-        title_en=risk.title_en,
-        title_ar=risk.title_ar,
-        description_en=risk.description_en,
-        description_ar=risk.description_ar,
-        asset=risk.asset,
-        threat=risk.threat,
-        vulnerability=risk.vulnerability,
-        impact_score=risk.impact_score,
-        likelihood_score=risk.likelihood_score,
-        risk_score=risk.risk_score,
-        risk_level=risk.risk_level.value,
-        treatment=risk.treatment.value,
-        treatment_plan=risk.treatment_plan,
-        status=risk.status,
-        owner_id=str(risk.owner.ref.id),
-        review_date=risk.review_date,
-        created_at=risk.created_at,
-        updated_at=risk.updated_at,
-    )
+    set_content_language(response, language)
+    return localized(risk_serializer, language).response(risk, response)
 
 
 @router.put("/{risk_id}", response_model=RiskResponse)
@@ -149,6 +158,8 @@ async def update_risk(
     if not risk:
         raise_not_found("Risk not found")
 
+    before = snapshot(risk)
+
     # Update fields
     update_dict = update_data.model_dump(exclude_unset=True)
 
@@ -165,29 +176,10 @@ async def update_risk(
 
     risk.updated_at = datetime.utcnow()
     await risk.save()
+    await dashboard_counters.record(risk, before)
+    await bump_version("risks")
 
-    return RiskResponse(
-        id=str(risk.id),
-        risk_id=risk.risk_id,
-        title_en=risk.title_en,
-        title_ar=risk.title_ar,
-        description_en=risk.description_en,
-        description_ar=risk.description_ar,
-        asset=risk.asset,
-        threat=risk.threat,
-        vulnerability=risk.vulnerability,
-        impact_score=risk.impact_score,
-        likelihood_score=risk.likelihood_score,
-        risk_score=risk.risk_score,
-        risk_level=risk.risk_level.value,
-        treatment=risk.treatment.value,
-        treatment_plan=risk.treatment_plan,
-        status=risk.status,
-        owner_id=str(risk.owner.ref.id),
-        review_date=risk.review_date,
-        created_at=risk.created_at,
-        updated_at=risk.updated_at,
-    )
+    return risk_serializer.response(risk)
 
 
 @router.delete("/{risk_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -200,5 +192,10 @@ async def delete_risk(
     if not risk:
         raise_not_found("Risk not found")
 
+    before = snapshot(risk)
     risk.status = "CLOSED"
+    # Incremental exports (updated_since) must pick up the closure
+    risk.updated_at = datetime.utcnow()
     await risk.save()
+    await dashboard_counters.record(risk, before)
+    await bump_version("risks")
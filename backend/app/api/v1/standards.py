@@ -1,51 +1,57 @@
 """Standards endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
 from app.schemas.standard import StandardResponse
-from app.models.standard import Standard
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
+from app.api.pagination import PageParams, paginate_items
+from app.api.conditional import conditional_response
+from app.api.fields import get_language, localized, set_content_language
+from app.services.catalog import catalog
+from app.core.serialization import ModelSerializer
 from app.core.exceptions import raise_not_found
 
 router = APIRouter()
 
-
-@router.get("/", response_model=List[StandardResponse], dependencies=[Depends(get_current_user)])
-async def list_standards():
-    """List all standards."""
-    standards = await Standard.find(Standard.is_active == True).to_list()
-    return [
-        StandardResponse(
-            id=str(std.id),
-            code=std.code,
-            name_en=std.name_en,
-            name_ar=std.name_ar,
-            description_en=std.description_en,
-            description_ar=std.description_ar,
-            version=std.version,
-            category=std.category,
-            is_active=std.is_active,
-        )
-        for std in standards
-    ]
-
-
-@router.get("/{standard_id}", response_model=StandardResponse, dependencies=[Depends(get_current_user)])
-async def get_standard(standard_id: str):
+standard_serializer = ModelSerializer(StandardResponse)
+
+
+@router.get("/", response_model=List[StandardResponse], dependencies=[Depends(get_current_principal)])
+async def list_standards(
+    request: Request,
+    response: Response,
+    category: Optional[str] = Query(None),
+    language: Optional[str] = Depends(get_language),
+    page: PageParams = Depends(),
+):
+    """List active standards, optionally filtered by category."""
+    await catalog.ensure_loaded()
+    not_modified = conditional_response(request, response, "catalog", catalog.version)
+    if not_modified:
+        return not_modified
+
+    standards = paginate_items(catalog.list_standards(category=category), page, response)
+    set_content_language(response, language)
+    return localized(standard_serializer, language).list_response(standards, response)
+
+
+@router.get("/{standard_id}", response_model=StandardResponse, dependencies=[Depends(get_current_principal)])
+async def get_standard(
+    standard_id: str,
+    request: Request,
+    response: Response,
+    language: Optional[str] = Depends(get_language),
+):
     """Get standard by ID."""
-    standard = await Standard.get(standard_id)
+    await catalog.ensure_loaded()
+    not_modified = conditional_response(request, response, "catalog", catalog.version)
+    if not_modified:
+        return not_modified
+
+    standard = catalog.get_standard(standard_id)
     if not standard:
         raise_not_found("Standard not found")
 
-    return StandardResponse(
-        id=str(standard.id),
-        code=standard.code,
-        name_en=standard.name_en,
-        name_ar=standard.name_ar,
-        description_en=standard.description_en,
-        description_ar=standard.description_ar,
-        version=standard.version,
-        category=standard.category,
-        is_active=standard.is_active,
-    )
+    set_content_language(response, language)
+    return localized(standard_serializer, language).response(standard, response)
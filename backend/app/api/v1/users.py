@@ -1,34 +1,47 @@
 """User management endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from app.schemas.user import UserResponse, UserCreate, UserUpdate
 from app.models.user import User, Role
-from app.api.deps import get_current_user, require_admin
+from app.api.deps import get_current_principal, require_admin
+from app.api.pagination import PageParams, paginate_raw
+from app.api.fields import FIELDS_QUERY, get_language, localized, set_content_language, sparse_fields
+from app.core.serialization import ModelSerializer
 from app.core.exceptions import raise_not_found, raise_bad_request
+from app.core.principals import invalidate_principal, revoke_principal
 from app.services.auth_service import AuthService
 
 router = APIRouter()
 
+user_serializer = ModelSerializer(UserResponse)
+
 
 @router.get("/", response_model=List[UserResponse], dependencies=[Depends(require_admin)])
-async def list_users():
-    """List all users (admin only)."""
-    users = await User.find_all().to_list()
-    return [
-        UserResponse(
-            id=str(user.id),
-            username=user.username,
-            email=user.email,
-            full_name_en=user.full_name_en,
-            full_name_ar=user.full_name_ar,
-            role=user.role.value,
-            is_active=user.is_active,
-            is_ldap_user=user.is_ldap_user,
-        )
-        for user in users
-    ]
+async def list_users(
+    response: Response,
+    role: Optional[Role] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    fields: Optional[str] = FIELDS_QUERY,
+    language: Optional[str] = Depends(get_language),
+    page: PageParams = Depends(),
+):
+    """List users with optional filters (admin only)."""
+    serializer = localized(sparse_fields(user_serializer, fields), language)
+    criteria = {}
+
+    if role:
+        criteria["role"] = role.value
+    if is_active is not None:
+        criteria["is_active"] = is_active
+
+    users = await paginate_raw(
+        User.get_motor_collection(), criteria, serializer.projection(), page, response
+    )
+    set_content_language(response, language)
+    return serializer.list_response(users, response)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_admin)])
@@ -50,20 +63,16 @@ async def create_user(user_data: UserCreate):
         role=Role(user_data.role),
     )
 
-    return UserResponse(
-        id=str(user.id),
-        username=user.username,
-        email=user.email,
-        full_name_en=user.full_name_en,
-        full_name_ar=user.full_name_ar,
-        role=user.role.value,
-        is_active=user.is_active,
-        is_ldap_user=user.is_ldap_user,
-    )
+    return user_serializer.response(user, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: str, current_user: User = Depends(get_current_user)):
+async def get_user(
+    user_id: str,
+    response: Response,
+    language: Optional[str] = Depends(get_language),
+    current_user=Depends(get_current_principal),
+):
     """Get user by ID."""
     # Users can view their own profile, admins can view any profile
     if str(current_user.id) != user_id and current_user.role != Role.ADMIN:
@@ -73,13 +82,33 @@ async def get_user(user_id: str, current_user: User = Depends(get_current_user))
     if not user:
         raise_not_found("User not found")
 
-    return UserResponse(
-        id=str(user.id),
-        username=user.username,
-        email=user.email,
-        full_name_en=user.full_name_en,
-        full_name_ar=user.full_name_ar,
-        role=user.role.value,
-        is_active=user.is_active,
-        is_ldap_user=user.is_ldap_user,
-    )
+    set_content_language(response, language)
+    return localized(user_serializer, language).response(user, response)
+
+
+@router.patch("/{user_id}", response_model=UserResponse, dependencies=[Depends(require_admin)])
+async def update_user(user_id: str, update_data: UserUpdate):
+    """Update a user's profile, role or active flag (admin only)."""
+    user = await User.get(user_id)
+    if not user:
+        raise_not_found("User not found")
+
+    update_dict = update_data.model_dump(exclude_unset=True)
+
+    for field, value in update_dict.items():
+        if field == "role" and value:
+            setattr(user, field, Role(value))
+        else:
+            setattr(user, field, value)
+
+    user.updated_at = datetime.utcnow()
+    await user.save()
+
+    # Role and active-flag changes must apply to the user's next request,
+    # including tokens verified statelessly from their claims
+    if "role" in update_dict or "is_active" in update_dict:
+        await revoke_principal(str(user.id))
+    else:
+        await invalidate_principal(str(user.id))
+
+    return user_serializer.response(user)
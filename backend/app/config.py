@@ -27,6 +27,46 @@ class Settings(BaseSettings):
     jwt_access_token_expire_minutes: int = 15
     jwt_refresh_token_expire_days: int = 7
 
+    # List Pagination
+    page_size_default: int = 50
+    page_size_max: int = 200
+
+    # Human-readable ID sequences (IDs reserved per worker per round-trip)
+    sequence_block_size: int = 1
+
+    # Bulk risk import: rows validated, resolved and inserted per batch
+    risk_import_chunk_size: int = 500
+
+    # Streaming exports: documents per cursor batch and per write
+    export_batch_size: int = 1000
+
+    # Dashboard counters: full recount interval correcting drift
+    dashboard_reconcile_interval_seconds: float = 300.0
+
+    # Catalog Cache (standards and controls held in memory per worker)
+    catalog_version_check_seconds: float = 2.0
+
+    # Principal Cache Configuration
+    principal_cache_ttl_seconds: float = 60.0
+    principal_cache_max_size: int = 10000
+    # How often each worker checks for user changes made on other workers
+    principal_version_check_seconds: float = 2.0
+
+    # Authorization state: serve role checks from verified token claims
+    auth_stateless_roles: bool = False
+    # auto: Redis whenever REDIS_URL is set. Memory stores are per worker,
+    # so they only suit single-worker deployments and tests.
+    auth_store_backend: str = "auto"  # auto, memory, redis
+    revocation_cache_seconds: float = 2.0
+
+    # Password Hashing Configuration
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    # Login Bookkeeping
+    last_login_flush_seconds: float = 5.0
+    last_login_max_pending: int = 1000
+
     # LDAP Configuration
     ldap_server: str = "ldap://localhost:389"
     ldap_base_dn: str = "dc=example,dc=com"
@@ -34,12 +74,42 @@ class Settings(BaseSettings):
     ldap_bind_password: str = ""
     ldap_user_search_base: str = "ou=users,dc=example,dc=com"
     ldap_user_search_filter: str = "(sAMAccountName={username})"
+    ldap_pool_size: int = 8
+    ldap_connect_timeout: float = 3.0
+    ldap_receive_timeout: float = 5.0
+    ldap_call_timeout: float = 10.0
+    ldap_circuit_failure_threshold: int = 3
+    ldap_circuit_reset_seconds: float = 30.0
+    ldap_negative_cache_seconds: float = 300.0
+    ldap_username_attribute: str = "sAMAccountName"
+
+    # Background LDAP Directory Sync
+    ldap_sync_enabled: bool = False
+    ldap_sync_interval_seconds: float = 900.0
+    ldap_sync_lease_seconds: float = 300.0  # renewed after every page
+    ldap_sync_page_size: int = 500
+    ldap_sync_filter: str = "(objectClass=person)"
+    ldap_sync_watermark_attribute: str = "modifyTimestamp"  # modifyTimestamp, uSNChanged
 
     # vLLM AI Configuration
     vllm_base_url: str = "http://localhost:8000"
     vllm_model_name: str = "Qwen/Qwen3-Coder-MoE"
     vllm_max_tokens: int = 2048
     vllm_temperature: float = 0.1
+    vllm_connect_timeout: float = 5.0
+    vllm_read_timeout: float = 120.0  # Generation can take a while on long evidence
+    vllm_write_timeout: float = 10.0
+    vllm_pool_timeout: float = 5.0
+    vllm_max_connections: int = 20
+    vllm_max_keepalive_connections: int = 10
+    vllm_keepalive_expiry_seconds: float = 60.0
+    vllm_http2: bool = False  # Needs the h2 package and an https:// base URL
+
+    # AI Assessment Cache (per-worker LRU in front of a shared MongoDB tier)
+    ai_cache_enabled: bool = True
+    ai_cache_memory_size: int = 1000
+    ai_cache_memory_ttl_seconds: float = 3600.0
+    ai_cache_ttl_days: float = 30.0
 
     # Application Configuration
     app_env: str = "development"
@@ -51,6 +121,13 @@ class Settings(BaseSettings):
     default_admin_password: str = "changeme"
     default_admin_email: str = "admin@example.com"
 
+    @property
+    def auth_store(self) -> str:
+        """Refresh token and revocation store backend in effect."""
+        if self.auth_store_backend != "auto":
+            return self.auth_store_backend
+        return "redis" if "redis_url" in self.model_fields_set else "memory"
+
 
 # Global settings instance
 settings = Settings()
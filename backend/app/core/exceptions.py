@@ -43,6 +43,11 @@ class AIServiceError(AmanaGRCException):
     pass
 
 
+class ServiceUnavailableError(AmanaGRCException):
+    """Service temporarily saturated; the client should retry later."""
+    pass
+
+
 # HTTP exceptions
 def raise_unauthorized(detail: str = "Could not validate credentials"):
     """Raise 401 Unauthorized."""
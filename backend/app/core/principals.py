@@ -0,0 +1,178 @@
+"""Principal (authenticated user) caching."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.revocation import revocation_store
+from app.core.token_store import refresh_token_store
+from app.models.user import User, Role
+from app.services.versions import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+VERSION_SCOPE = "principals"
+
+
+class Principal(BaseModel):
+    """Authenticated identity built from verified access token claims."""
+    id: str
+    username: str
+    role: Role
+    issued_at: Optional[float] = None
+
+    @classmethod
+    def from_claims(cls, payload: Dict[str, Any]) -> Optional["Principal"]:
+        """Build a principal from a decoded token, or None if claims are missing."""
+        try:
+            return cls(
+                id=payload["sub"],
+                username=payload["username"],
+                role=Role(payload["role"]),
+                issued_at=payload.get("iat"),
+            )
+        except (KeyError, ValueError):
+            return None
+
+
+class PrincipalCache:
+    """Cache of active ``User`` documents resolved from access tokens.
+
+    Every worker keeps its own copy. Changes are published by bumping the
+    shared ``principals`` version (``invalidate_principal``); each worker
+    compares it at most every ``check_interval`` seconds and drops its whole
+    cache when it moved, so that interval bounds how long another worker can
+    serve a stale role or active flag.
+
+    Entries remember when their database read started. A read that started
+    before the user was last invalidated is never cached, so a lookup racing
+    a role change cannot store the old role.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        check_interval: float = 0.0,
+        timer: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.version: Optional[int] = None
+        self._timer = timer
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Last invalidation per user, oldest first; kept for one TTL
+        self._invalidated: "OrderedDict[str, float]" = OrderedDict()
+        self._cleared_at = float("-inf")
+        self._checked_at = float("-inf")
+
+    def now(self) -> float:
+        """Timestamp to take before reading a user, for ``put``."""
+        return self._timer()
+
+    def get(self, user_id: str, not_before: Optional[float] = None) -> Optional[User]:
+        """Return the cached user, or None on a miss.
+
+        Entries read before ``not_before`` (a revocation timestamp recorded
+        by another worker) count as misses.
+        """
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return None
+
+        read_at, user = entry
+        if not_before is not None and read_at < not_before:
+            self._cache.pop(user_id)
+            return None
+        return user
+
+    def put(self, user: User, read_at: float) -> None:
+        """Cache an active user whose database read started at ``read_at`` (see ``now``)."""
+        if not user.is_active:
+            return
+        user_id = str(user.id)
+        if read_at <= max(self._invalidated.get(user_id, self._cleared_at), self._cleared_at):
+            # Invalidated while the read was in flight
+            return
+        remaining = self.ttl - (self._timer() - read_at)
+        if remaining > 0:
+            self._cache.set(user_id, (read_at, user), ttl=remaining)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user on this worker after deactivation, a role change or a directory re-sync."""
+        user_id = str(user_id)
+        now = self._timer()
+        self._cache.pop(user_id)
+        self._invalidated[user_id] = now
+        self._invalidated.move_to_end(user_id)
+
+        # Reads older than the TTL are never cached, so older marks are moot
+        while self._invalidated:
+            oldest, invalidated_at = next(iter(self._invalidated.items()))
+            if invalidated_at > now - self.ttl:
+                break
+            del self._invalidated[oldest]
+
+    def clear(self) -> None:
+        """Drop every cached principal."""
+        self._cache.clear()
+        self._invalidated.clear()
+        self._cleared_at = self._timer()
+
+    async def check_version(self) -> None:
+        """Drop the cache if another worker published a change since the last check."""
+        checked_at = time.monotonic()
+        if checked_at - self._checked_at < self.check_interval:
+            return
+        self._checked_at = checked_at
+
+        try:
+            version = await get_version(VERSION_SCOPE)
+        except Exception as e:
+            logger.error(f"Principal version check failed: {e}")
+            return
+        if self.version is not None and version != self.version:
+            self.clear()
+        self.version = version
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+        return self._cache.stats()
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache(
+    maxsize=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds,
+    check_interval=settings.principal_version_check_seconds,
+)
+
+
+async def publish_principal_changes() -> None:
+    """Make every worker drop its cached principals at its next version check."""
+    await bump_version(VERSION_SCOPE)
+
+
+async def invalidate_principal(user_id: str) -> None:
+    """Drop a user's cached principal on this worker now and on the others shortly."""
+    principal_cache.invalidate(str(user_id))
+    await publish_principal_changes()
+
+
+async def revoke_principal(user_id: str, publish: bool = True) -> None:
+    """
+    Invalidate a user's cached principal and revoke its outstanding tokens.
+
+    Pass ``publish=False`` when revoking many users and call
+    ``publish_principal_changes`` once afterwards.
+    """
+    principal_cache.invalidate(str(user_id))
+    if publish:
+        await publish_principal_changes()
+    await revocation_store.revoke_user(str(user_id))
+    await refresh_token_store.revoke_user(str(user_id))
@@ -0,0 +1,119 @@
+"""Token revocation store.
+
+Records, per user, the moment after which previously issued tokens must no
+longer be honoured. Tokens carry an ``iat`` claim; a token is revoked when it
+was issued before the user's revocation timestamp.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from app.config import settings
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_NOT_REVOKED = 0.0
+
+
+class RevocationStore(ABC):
+    """Base revocation store."""
+
+    @abstractmethod
+    async def revoke_user(self, user_id: str) -> float:
+        """Revoke every token issued to a user so far and return the timestamp."""
+
+    @abstractmethod
+    async def revoked_since(self, user_id: str) -> Optional[float]:
+        """Return when the user's tokens were last revoked, if ever."""
+
+    async def is_revoked(self, user_id: str, issued_at: Optional[float]) -> bool:
+        """Check whether a token issued at ``issued_at`` has been revoked."""
+        revoked_at = await self.revoked_since(user_id)
+        if revoked_at is None:
+            return False
+        return issued_at is None or issued_at < revoked_at
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+
+class InMemoryRevocationStore(RevocationStore):
+    """Process-local revocation store (single worker deployments and tests)."""
+
+    def __init__(self, retention_seconds: float):
+        self.retention_seconds = retention_seconds
+        self._revoked: Dict[str, float] = {}
+
+    async def revoke_user(self, user_id: str) -> float:
+        now = time.time()
+        self._revoked[str(user_id)] = now
+        self._prune(now)
+        return now
+
+    async def revoked_since(self, user_id: str) -> Optional[float]:
+        return self._revoked.get(str(user_id))
+
+    def _prune(self, now: float) -> None:
+        """Forget revocations older than the longest-lived token."""
+        cutoff = now - self.retention_seconds
+        for user_id in [uid for uid, ts in self._revoked.items() if ts < cutoff]:
+            del self._revoked[user_id]
+
+
+class RedisRevocationStore(RevocationStore):
+    """Revocation store shared by all workers through Redis.
+
+    Lookups are memoised locally for ``local_ttl`` seconds, which bounds how
+    long a revocation takes to reach every worker.
+    """
+
+    key_prefix = "amana:revoked:"
+
+    def __init__(self, redis_url: str, retention_seconds: float, local_ttl: float):
+        from redis import asyncio as aioredis
+
+        self.retention_seconds = retention_seconds
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+        self._local = TTLCache(maxsize=10000, ttl=local_ttl)
+
+    async def revoke_user(self, user_id: str) -> float:
+        now = time.time()
+        await self._redis.set(
+            f"{self.key_prefix}{user_id}", now, ex=int(self.retention_seconds)
+        )
+        self._local.set(str(user_id), now)
+        return now
+
+    async def revoked_since(self, user_id: str) -> Optional[float]:
+        user_id = str(user_id)
+        cached = self._local.get(user_id)
+        if cached is None:
+            value = await self._redis.get(f"{self.key_prefix}{user_id}")
+            cached = float(value) if value is not None else _NOT_REVOKED
+            self._local.set(user_id, cached)
+        return cached or None
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._redis.aclose()
+
+
+def create_revocation_store() -> RevocationStore:
+    """Build the revocation store selected by ``settings.auth_store``."""
+    retention = settings.jwt_refresh_token_expire_days * 24 * 3600
+    if settings.auth_store == "redis":
+        logger.info("Using Redis token revocation store")
+        return RedisRevocationStore(
+            settings.redis_url,
+            retention_seconds=retention,
+            local_ttl=settings.revocation_cache_seconds,
+        )
+    return InMemoryRevocationStore(retention_seconds=retention)
+
+
+# Global revocation store instance
+revocation_store = create_revocation_store()
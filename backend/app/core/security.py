@@ -1,11 +1,18 @@
 """Security utilities for JWT and password hashing."""
 
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
+from app.core.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -21,6 +28,111 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasher:
+    """
+    Runs bcrypt work on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL, so hashing on worker threads keeps the event loop
+    responsive. At most ``max_workers`` operations run at once; once
+    ``max_pending`` operations are queued or running, new ones are rejected
+    with ``ServiceUnavailableError`` instead of piling up behind a login burst.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.started = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await self._run(get_password_hash, password)
+
+    async def _run(self, func: Callable, *args) -> Any:
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning("Password hashing queue is full, rejecting request")
+            raise ServiceUnavailableError("Too many concurrent sign-in attempts, please retry")
+
+        self._pending += 1
+        enqueued_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+
+        def timed_call():
+            self._record_queue_time(time.monotonic() - enqueued_at)
+            return func(*args)
+
+        def finished(_future) -> None:
+            # Runs when bcrypt is done, not when the awaiting request is cancelled
+            try:
+                loop.call_soon_threadsafe(self._finish)
+            except RuntimeError:
+                # Event loop already closed at shutdown
+                pass
+
+        try:
+            future = self.executor.submit(timed_call)
+        except BaseException:
+            self._pending -= 1
+            raise
+        future.add_done_callback(finished)
+        return await asyncio.wrap_future(future)
+
+    def _finish(self) -> None:
+        self._pending -= 1
+        self.completed += 1
+
+    def _record_queue_time(self, waited: float) -> None:
+        self.started += 1
+        self.queue_time_total += waited
+        self.queue_time_max = max(self.queue_time_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and queue-time metrics."""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_time_avg": (
+                self.queue_time_total / self.started if self.started else 0.0
+            ),
+            "queue_time_max": self.queue_time_max,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -29,7 +141,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.jwt_access_token_expire_minutes)
 
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": time.time(), "type": "access"})
     encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
@@ -38,7 +150,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.jwt_refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": time.time(), "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
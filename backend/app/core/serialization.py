@@ -0,0 +1,158 @@
+"""Fast-path JSON serialization for API responses.
+
+Handlers used to build a ``*Response`` model field by field, which FastAPI
+then validated and encoded again through ``response_model``. A
+``ModelSerializer`` is compiled once per response model and maps Beanie
+documents or raw BSON dicts straight to JSON bytes with ``pydantic_core``.
+The endpoint keeps its ``response_model`` so the OpenAPI schema is
+unchanged; the returned ``Response`` skips the second validation pass.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Type
+
+from bson import DBRef, ObjectId
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+# Response headers that belong to the body, not to the endpoint's sub-response
+_BODY_HEADERS = {"content-length", "content-type"}
+
+
+def _step(obj: Any, key: str) -> Any:
+    """One nested path step on BSON (dicts, DBRefs) or Beanie values (Links, documents)."""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(key)
+    if key == "$id":
+        # DBRef, unfetched beanie Link, or a fetched/assigned document
+        if isinstance(obj, DBRef):
+            return obj.id
+        ref = getattr(obj, "ref", None)
+        return ref.id if ref is not None else getattr(obj, "id", None)
+    return getattr(obj, key, None)
+
+
+_PASSTHROUGH = {str, int, float, bool, type(None), datetime}
+
+
+def _plain(value: Any) -> Any:
+    """Convert values pydantic_core cannot encode to their API representation."""
+    if type(value) in _PASSTHROUGH:
+        return value
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, DBRef):
+        return str(value.id)
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _compile_getter(path: str, document: bool) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Getter reading ``path`` from a BSON dict, or from a document's ``__dict__``.
+
+    Beanie documents are read through ``__dict__`` because attribute access
+    on them is several times slower than a dict lookup.
+    """
+    keys = path.split(".")
+    if document and keys[0] == "_id":
+        keys[0] = "id"
+    first, rest = keys[0], keys[1:]
+
+    if not rest:
+        return lambda data: _plain(data.get(first))
+
+    def getter(data):
+        value = data.get(first)
+        for key in rest:
+            value = _step(value, key)
+        return _plain(value)
+
+    return getter
+
+
+class ModelSerializer:
+    """
+    Precompiled mapping from stored documents to a response model's JSON.
+
+    Each response field is read from the attribute or BSON key of the same
+    name unless ``sources`` maps it to another path, e.g.
+    ``owner_id="owner.$id"``. ``id`` defaults to ``_id``.
+    """
+
+    def __init__(
+        self,
+        response_model: Type[BaseModel],
+        fields: Optional[Sequence[str]] = None,
+        **sources: str,
+    ):
+        self.response_model = response_model
+        self._sources = sources
+        sources = {"id": "_id", **sources}
+        self.fields: Tuple[str, ...] = tuple(fields or response_model.model_fields)
+        self.paths: Dict[str, str] = {name: sources.get(name, name) for name in self.fields}
+        self._bson_getters = [(name, _compile_getter(path, False)) for name, path in self.paths.items()]
+        self._document_getters = [(name, _compile_getter(path, True)) for name, path in self.paths.items()]
+        self._subsets: Dict[Tuple[str, ...], "ModelSerializer"] = {}
+
+    def select(self, fields: Sequence[str]) -> "ModelSerializer":
+        """Serializer for a subset of the fields (``id`` is always included), cached per subset."""
+        wanted = set(fields) | {"id"}
+        key = tuple(name for name in self.fields if name in wanted)
+        if key not in self._subsets:
+            self._subsets[key] = ModelSerializer(self.response_model, key, **self._sources)
+        return self._subsets[key]
+
+    def extend(self, *fields: str) -> "ModelSerializer":
+        """Serializer that also outputs stored fields missing from the response model."""
+        extra = tuple(name for name in fields if name not in self.fields)
+        if not extra:
+            return self
+        return ModelSerializer(self.response_model, self.fields + extra, **self._sources)
+
+    def projection(self) -> Dict[str, int]:
+        """MongoDB projection loading only the stored fields these response fields read."""
+        return {path.split(".")[0]: 1 for path in self.paths.values()}
+
+    def row(self, obj: Any) -> Dict[str, Any]:
+        """Plain dict for one BSON dict or document."""
+        if isinstance(obj, dict):
+            getters = self._bson_getters
+        else:
+            obj, getters = vars(obj), self._document_getters
+        return {name: getter(obj) for name, getter in getters}
+
+    def dumps(self, obj: Any) -> bytes:
+        return to_json(self.row(obj))
+
+    def dumps_many(self, objs: Iterable[Any]) -> bytes:
+        row = self.row
+        return to_json([row(obj) for obj in objs])
+
+    def response(self, obj: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+        """JSON response for one document, keeping headers set on ``response``."""
+        return json_response(self.dumps(obj), response, status_code)
+
+    def list_response(self, objs: Iterable[Any], response: Optional[Response] = None) -> Response:
+        """JSON array response, keeping headers set on ``response`` (e.g. the next cursor)."""
+        return json_response(self.dumps_many(objs), response)
+
+
+def json_response(content: bytes, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """Wrap pre-encoded JSON, carrying over headers set on the endpoint's sub-response."""
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k not in _BODY_HEADERS}
+    return Response(
+        content=content,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
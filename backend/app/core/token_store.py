@@ -0,0 +1,196 @@
+"""Server-side refresh token store.
+
+Every refresh token has a unique ``jti`` and belongs to a family: the chain of
+tokens descending from one login. Refreshing consumes the presented token and
+issues the next one in the same family. Presenting an already consumed token
+means it was copied, so the whole family is revoked.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set
+
+from pydantic import BaseModel
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenRecord(BaseModel):
+    """Stored state of one refresh token."""
+    jti: str
+    user_id: str
+    family_id: str
+    reused: bool = False
+
+
+class RefreshTokenStore(ABC):
+    """Base refresh token store."""
+
+    @abstractmethod
+    async def add(self, jti: str, user_id: str, family_id: str, ttl: int) -> None:
+        """Register a newly issued refresh token."""
+
+    @abstractmethod
+    async def consume(self, jti: str) -> Optional[RefreshTokenRecord]:
+        """
+        Mark a token as used.
+
+        Returns:
+            The record (with ``reused`` set if it had been consumed before),
+            or None if the token is unknown, expired or revoked
+        """
+
+    @abstractmethod
+    async def revoke_family(self, family_id: str) -> None:
+        """Revoke every token descending from one login."""
+
+    @abstractmethod
+    async def revoke_user(self, user_id: str) -> None:
+        """Revoke every refresh token issued to a user."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+
+class InMemoryRefreshTokenStore(RefreshTokenStore):
+    """Process-local refresh token store (single worker deployments and tests)."""
+
+    def __init__(self):
+        self._tokens: Dict[str, dict] = {}
+        self._families: Dict[str, Set[str]] = {}
+        self._user_families: Dict[str, Set[str]] = {}
+
+    async def add(self, jti: str, user_id: str, family_id: str, ttl: int) -> None:
+        self._prune()
+        self._tokens[jti] = {
+            "user_id": user_id,
+            "family_id": family_id,
+            "used": False,
+            "expires_at": time.time() + ttl,
+        }
+        self._families.setdefault(family_id, set()).add(jti)
+        self._user_families.setdefault(user_id, set()).add(family_id)
+
+    async def consume(self, jti: str) -> Optional[RefreshTokenRecord]:
+        token = self._tokens.get(jti)
+        if token is None or token["expires_at"] <= time.time():
+            return None
+
+        reused = token["used"]
+        token["used"] = True
+        return RefreshTokenRecord(
+            jti=jti,
+            user_id=token["user_id"],
+            family_id=token["family_id"],
+            reused=reused,
+        )
+
+    async def revoke_family(self, family_id: str) -> None:
+        for jti in self._families.pop(family_id, set()):
+            token = self._tokens.pop(jti, None)
+            if token:
+                self._user_families.get(token["user_id"], set()).discard(family_id)
+
+    async def revoke_user(self, user_id: str) -> None:
+        for family_id in list(self._user_families.pop(user_id, set())):
+            await self.revoke_family(family_id)
+
+    def _prune(self) -> None:
+        """Forget expired tokens."""
+        now = time.time()
+        for jti in [jti for jti, t in self._tokens.items() if t["expires_at"] <= now]:
+            token = self._tokens.pop(jti)
+            family = self._families.get(token["family_id"])
+            if family is not None:
+                family.discard(jti)
+                if not family:
+                    del self._families[token["family_id"]]
+                    self._user_families.get(token["user_id"], set()).discard(token["family_id"])
+
+
+# Atomically bump the use counter of an existing token
+_CONSUME_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local uses = redis.call('HINCRBY', KEYS[1], 'uses', 1)
+return {redis.call('HGET', KEYS[1], 'user_id'), redis.call('HGET', KEYS[1], 'family_id'), uses}
+"""
+
+
+class RedisRefreshTokenStore(RefreshTokenStore):
+    """Refresh token store shared by all workers through Redis."""
+
+    prefix = "amana:rt:"
+
+    def __init__(self, redis_url: str):
+        from redis import asyncio as aioredis
+
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+        self._consume = self._redis.register_script(_CONSUME_SCRIPT)
+
+    def _token_key(self, jti: str) -> str:
+        return f"{self.prefix}token:{jti}"
+
+    def _family_key(self, family_id: str) -> str:
+        return f"{self.prefix}family:{family_id}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.prefix}user:{user_id}"
+
+    async def add(self, jti: str, user_id: str, family_id: str, ttl: int) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._token_key(jti), mapping={
+                "user_id": user_id,
+                "family_id": family_id,
+                "uses": 0,
+            })
+            pipe.expire(self._token_key(jti), ttl)
+            pipe.sadd(self._family_key(family_id), jti)
+            pipe.expire(self._family_key(family_id), ttl)
+            pipe.sadd(self._user_key(user_id), family_id)
+            pipe.expire(self._user_key(user_id), ttl)
+            await pipe.execute()
+
+    async def consume(self, jti: str) -> Optional[RefreshTokenRecord]:
+        result = await self._consume(keys=[self._token_key(jti)])
+        if not result:
+            return None
+
+        user_id, family_id, uses = result
+        return RefreshTokenRecord(
+            jti=jti,
+            user_id=user_id,
+            family_id=family_id,
+            reused=int(uses) > 1,
+        )
+
+    async def revoke_family(self, family_id: str) -> None:
+        jtis = await self._redis.smembers(self._family_key(family_id))
+        keys = [self._token_key(jti) for jti in jtis] + [self._family_key(family_id)]
+        await self._redis.delete(*keys)
+
+    async def revoke_user(self, user_id: str) -> None:
+        for family_id in await self._redis.smembers(self._user_key(user_id)):
+            await self.revoke_family(family_id)
+        await self._redis.delete(self._user_key(user_id))
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._redis.aclose()
+
+
+def create_refresh_token_store() -> RefreshTokenStore:
+    """Build the refresh token store selected by ``settings.auth_store``."""
+    if settings.auth_store == "redis":
+        logger.info("Using Redis refresh token store")
+        return RedisRefreshTokenStore(settings.redis_url)
+    return InMemoryRefreshTokenStore()
+
+
+# Global refresh token store instance
+refresh_token_store = create_refresh_token_store()
@@ -2,13 +2,24 @@
 
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config import settings
 from app.database import Database
 from app.models import DOCUMENT_MODELS
 from app.core.middleware import RequestLoggingMiddleware, setup_cors
+from app.core.revocation import revocation_store
+from app.core.token_store import refresh_token_store
+from app.core.security import password_hasher
+from app.core.exceptions import ServiceUnavailableError
+from app.services.ldap_backend import close_ldap_backend
+from app.services.last_login import last_login_buffer
+from app.services.directory_sync import directory_sync
+from app.services.dashboard_stats import dashboard_counters
+from app.services.catalog import catalog
+from app.services.ai_service import close_vllm_client, open_vllm_client
 from app.api.v1.router import api_router
 from app.api.health import router as health_router
 
@@ -27,11 +38,27 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Amana-GRC application...")
     await Database.connect_db(DOCUMENT_MODELS)
     logger.info("Database connection established")
+    await catalog.load()
+    catalog.start()
+    open_vllm_client()
+    last_login_buffer.start()
+    dashboard_counters.start()
+    if settings.ldap_sync_enabled:
+        directory_sync.start()
 
     yield
 
     # Shutdown
     logger.info("Shutting down Amana-GRC application...")
+    await directory_sync.stop()
+    await dashboard_counters.stop()
+    await catalog.stop()
+    await close_vllm_client()
+    await last_login_buffer.stop()
+    close_ldap_backend()
+    password_hasher.shutdown()
+    await revocation_store.close()
+    await refresh_token_store.close()
     await Database.close_db()
     logger.info("Database connection closed")
 
@@ -52,6 +79,17 @@ setup_cors(app)
 # Add middleware
 app.add_middleware(RequestLoggingMiddleware)
 
+
+@app.exception_handler(ServiceUnavailableError)
+async def service_unavailable_handler(request: Request, exc: ServiceUnavailableError):
+    """Ask clients to back off while a bounded resource is saturated."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": exc.message},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include routers
 app.include_router(health_router, tags=["Health"])
 app.include_router(api_router, prefix="/api")
@@ -7,6 +7,10 @@ from app.models.risk import Risk, RiskLevel, RiskTreatment
 from app.models.evidence import Evidence, EvidenceStatus
 from app.models.audit import Audit, AuditStatus
 from app.models.nonconformity import NonConformity, Severity, NonConformityStatus
+from app.models.sync_state import DirectorySyncState
+from app.models.counter import Counter
+from app.models.dashboard_stats import DashboardStats
+from app.models.ai_assessment import AIAssessment
 
 __all__ = [
     "User",
@@ -24,6 +28,10 @@ __all__ = [
     "NonConformity",
     "Severity",
     "NonConformityStatus",
+    "DirectorySyncState",
+    "Counter",
+    "DashboardStats",
+    "AIAssessment",
 ]
 
 # List of all document models for Beanie initialization
@@ -35,4 +43,8 @@ DOCUMENT_MODELS = [
     Evidence,
     Audit,
     NonConformity,
+    DirectorySyncState,
+    Counter,
+    DashboardStats,
+    AIAssessment,
 ]
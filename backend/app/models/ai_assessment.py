@@ -0,0 +1,30 @@
+"""Cached AI compliance assessment model."""
+
+from datetime import datetime
+from typing import Any, Dict
+from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class AIAssessment(Document):
+    """
+    Result of one vLLM compliance analysis, keyed by a hash of its inputs.
+
+    The key covers the control text, the normalized evidence, the model,
+    the sampling settings and the prompt version, so any change to those
+    produces a new key. MongoDB removes entries once ``expires_at`` passes.
+    """
+
+    key: Indexed(str, unique=True)  # type: ignore
+    model: str
+    prompt_version: str
+    result: Dict[str, Any]
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    class Settings:
+        name = "ai_assessments"
+        indexes = [
+            IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        ]
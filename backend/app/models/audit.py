@@ -5,6 +5,7 @@ from enum import Enum
 from typing import List, Optional
 from beanie import Document, Indexed, Link
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from app.models.user import User
 
@@ -39,8 +40,10 @@ class Audit(Document):
         name = "audits"
         indexes = [
             "audit_id",
-            "status",
             "start_date",
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("lead_auditor.$id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
     class Config:
@@ -5,6 +5,7 @@ from enum import Enum
 from typing import Optional
 from beanie import Document, Indexed, Link
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from app.models.standard import Standard
 
@@ -40,6 +41,17 @@ class Control(Document):
             "control_id",
             "priority",
             "implementation_status",
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Catalog filters, in the order list_controls applies them
+            IndexModel([
+                ("standard.$id", ASCENDING),
+                ("priority", ASCENDING),
+                ("implementation_status", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING),
+            ]),
+            # Per-standard exports ordered by last change
+            IndexModel([("standard.$id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)]),
         ]
 
     class Config:
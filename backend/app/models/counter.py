@@ -0,0 +1,16 @@
+"""Sequence counter model."""
+
+from datetime import datetime
+from beanie import Document, Indexed
+from pydantic import Field
+
+
+class Counter(Document):
+    """Last value handed out for a human-readable ID sequence (e.g. ``RISK-2024``)."""
+
+    name: Indexed(str, unique=True)  # type: ignore
+    value: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "counters"
@@ -0,0 +1,30 @@
+"""Materialized dashboard statistics model."""
+
+from datetime import datetime
+from typing import Dict, Optional
+from beanie import Document, Indexed
+from pydantic import Field
+
+
+class DashboardStats(Document):
+    """
+    Running status breakdowns per collection, e.g. ``risks.by_level.HIGH``.
+
+    Write paths keep the counters current with ``$inc`` and bump
+    ``version``; a periodic reconciliation, run by whichever worker holds
+    the lease, recomputes them from the collections.
+    """
+
+    name: Indexed(str, unique=True)  # type: ignore
+    controls: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    risks: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    audits: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    findings: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+    version: int = 0
+    reconciled_at: Optional[datetime] = None
+    lease_owner: Optional[str] = None
+    lease_until: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "dashboard_stats"
@@ -5,6 +5,7 @@ from enum import Enum
 from typing import Optional
 from beanie import Document, Indexed, Link
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from app.models.audit import Audit
 from app.models.control import Control
@@ -49,6 +50,12 @@ class NonConformity(Document):
             "severity",
             "status",
             "due_date",
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Findings of one audit, newest first
+            IndexModel([("audit.$id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Exports, across all audits or for one, ordered by last change
+            IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("audit.$id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)]),
         ]
 
     class Config:
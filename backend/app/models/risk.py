@@ -5,6 +5,7 @@ from enum import Enum
 from typing import Optional
 from beanie import Document, Indexed, Link
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from app.models.user import User
 
@@ -53,8 +54,14 @@ class Risk(Document):
         name = "risks"
         indexes = [
             "risk_id",
-            "risk_level",
-            "status",
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # List filters (equality) followed by the keyset sort
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("risk_level", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("treatment", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("owner.$id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Exports: ordered by last change, resumable with updated_since
+            IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)]),
         ]
 
     def calculate_risk_score(self) -> None:
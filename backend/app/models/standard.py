@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Optional
 from beanie import Document, Indexed
 from pydantic import Field
+from pymongo import DESCENDING, IndexModel
 
 
 class Standard(Document):
@@ -26,6 +27,7 @@ class Standard(Document):
             "code",
             "category",
             "is_active",
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
     class Config:
@@ -0,0 +1,22 @@
+"""Directory synchronization state model."""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from beanie import Document, Indexed
+from pydantic import Field
+
+
+class DirectorySyncState(Document):
+    """Watermark and lease for a background directory sync job."""
+
+    name: Indexed(str, unique=True)  # type: ignore
+    watermark: Optional[str] = None  # Highest modifyTimestamp/uSNChanged seen
+    lease_owner: Optional[str] = None
+    lease_until: Optional[datetime] = None
+    last_run_at: Optional[datetime] = None
+    last_stats: Dict[str, Any] = Field(default_factory=dict)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "directory_sync_state"
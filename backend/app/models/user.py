@@ -5,6 +5,7 @@ from enum import Enum
 from typing import Optional
 from beanie import Document, Indexed
 from pydantic import EmailStr, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class Role(str, Enum):
@@ -35,7 +36,9 @@ class User(Document):
         indexes = [
             "username",
             "email",
-            "role",
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("role", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("is_active", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
 
     class Config:
@@ -1,7 +1,7 @@
 """Control schemas."""
 
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 
 class ControlResponse(BaseModel):
@@ -22,7 +22,36 @@ class ControlResponse(BaseModel):
         from_attributes = True
 
 
+class ControlSearchResult(ControlResponse):
+    """Control search hit with its relevance score."""
+    score: float
+
+
 class ControlUpdate(BaseModel):
     """Control update schema."""
     implementation_status: Optional[str] = None
     implementation_notes: Optional[str] = None
+
+
+class ControlBulkItem(ControlUpdate):
+    """One control change in a bulk update."""
+    id: str
+
+
+class ControlBulkUpdate(BaseModel):
+    """Bulk control update request."""
+    updates: List[ControlBulkItem] = Field(..., min_length=1, max_length=1000)
+
+
+class ControlBulkResult(BaseModel):
+    """Outcome of one item of a bulk update."""
+    id: str
+    status: str  # updated, not_found, invalid, failed
+    detail: Optional[str] = None
+
+
+class ControlBulkResponse(BaseModel):
+    """Bulk control update response."""
+    updated: int
+    failed: int
+    results: List[ControlBulkResult]
@@ -1,6 +1,6 @@
 """Risk schemas."""
 
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -64,3 +64,20 @@ class RiskResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class RiskImportError(BaseModel):
+    """A rejected import row, by line number in the uploaded file."""
+    row: int
+    error: str
+
+
+class RiskImportReport(BaseModel):
+    """Bulk risk import outcome."""
+    total: int
+    imported: int
+    failed: int
+    errors: List[RiskImportError]
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,64 @@
+"""Import a risk register from a CSV or JSON Lines file."""
+
+import argparse
+import asyncio
+import logging
+from motor.motor_asyncio import AsyncIOMotorClient
+from beanie import init_beanie
+
+from app.config import settings
+from app.models import DOCUMENT_MODELS
+from app.services.risk_import import READ_SIZE, FORMATS, detect_format, import_risks, iter_lines, iter_records
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def file_chunks(path: str):
+    """Read a local file in blocks."""
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            yield chunk
+
+
+async def main():
+    """Import entry point."""
+    parser = argparse.ArgumentParser(description='Import risks from CSV or JSON Lines')
+    parser.add_argument('path', help='File with RiskCreate columns (owner_id is a user id)')
+    parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension')
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=settings.risk_import_chunk_size,
+        help='Rows per batch'
+    )
+
+    args = parser.parse_args()
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error('cannot tell the file format, pass --format')
+
+    # Connect to database
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    db = client[settings.mongodb_db_name]
+
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS)
+    logger.info("Connected to MongoDB")
+
+    try:
+        records = iter_records(iter_lines(file_chunks(args.path)), fmt)
+        report = await import_risks(records, args.chunk_size)
+
+        logger.info("\n=== Import Summary ===")
+        logger.info(f"{report.imported} imported, {report.failed} failed of {report.total} rows")
+        for error in report.errors:
+            logger.info(f"  line {error['row']}: {error['error']}")
+        if report.failed > len(report.errors):
+            logger.info(f"  ... {report.failed - len(report.errors)} more")
+    finally:
+        client.close()
+        logger.info("Disconnected from MongoDB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,8 @@ from app.config import settings
 from app.models import DOCUMENT_MODELS
 from app.models.standard import Standard
 from app.models.control import Control, ImplementationStatus
+from app.services.dashboard_stats import dashboard_counters
+from app.services.catalog import bump_catalog_version
 
 # Import seeder data
 from app.seeders import nca_ecc, nca_cscc, ndmo, sdaia
@@ -175,7 +177,12 @@ async def main():
             )
         else:
             parser.print_help()
-            
+
+        if args.reset or args.all or args.standard:
+            # Seeding bypasses the write paths that keep the dashboard counters current
+            await dashboard_counters.reconcile()
+            await bump_catalog_version()
+
     finally:
         client.close()
         logger.info("Disconnected from MongoDB")
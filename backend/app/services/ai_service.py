@@ -1,16 +1,106 @@
-"""AI service for vLLM integration."""
+"""AI service for vLLM integration.
 
+All requests to vLLM share one pooled ``httpx.AsyncClient``, opened and
+closed by the application lifespan, so analyses reuse keep-alive
+connections instead of paying connection setup on every call.
+
+Results are cached by a hash of the control text, the normalized evidence,
+the model, the sampling settings and the prompts (see ``assessment_key``),
+so editing a template, bumping ``PROMPT_VERSION`` or switching model
+misses the old entries without any explicit invalidation.
+"""
+
+import hashlib
+import importlib.util
+import json
 import logging
+import re
+import unicodedata
 from typing import Optional
 import httpx
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.config import settings
 from app.models.control import Control
 from app.core.exceptions import AIServiceError
+from app.services.assessment_cache import AssessmentCache, assessment_cache
 
 logger = logging.getLogger(__name__)
 
+# Bump when the meaning of a response changes without the templates changing
+PROMPT_VERSION = "1"
+
+SYSTEM_PROMPT = """
+        You are an expert GRC (Governance, Risk, and Compliance) auditor specializing in Saudi Arabian regulatory frameworks.
+        Your task is to analyze evidence documents to determine compliance with specific control requirements.
+
+        Control Information:
+        - ID: {control.control_id}
+        - Domain (English): {control.domain_en}
+        - Domain (Arabic): {control.domain_ar}
+        - Title (English): {control.title_en}
+        - Title (Arabic): {control.title_ar}
+        - Requirement (English): {control.description_en}
+        - Requirement (Arabic): {control.description_ar}
+
+        Instructions:
+        1. Carefully analyze the provided evidence against the control requirement
+        2. Determine if the evidence demonstrates compliance (COMPLIANT), partial compliance (PARTIAL), or non-compliance (NON_COMPLIANT)
+        3. Provide a confidence score (0.0-1.0) indicating how certain you are of your assessment
+        4. Explain your reasoning in both English and Arabic
+        5. Provide specific recommendations if the evidence is not fully compliant
+
+        Be objective, thorough, and cite specific elements from the evidence in your reasoning.
+        """
+
+USER_PROMPT = """
+            Analyze the following evidence against the control requirement:
+
+            Evidence:
+            {evidence_text}
+
+            Provide your analysis in JSON format with the following structure:
+            {{
+                "compliance_status": "COMPLIANT|PARTIAL|NON_COMPLIANT",
+                "confidence": 0.0-1.0,
+                "reasoning_en": "English explanation",
+                "reasoning_ar": "Arabic explanation",
+                "recommendations": ["recommendation1", "recommendation2"]
+            }}
+            """
+
+# Control fields rendered into the system prompt
+PROMPT_CONTROL_FIELDS = (
+    "control_id", "domain_en", "domain_ar", "title_en", "title_ar", "description_en", "description_ar",
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_evidence(text: str) -> str:
+    """Evidence text with Unicode forms unified and whitespace collapsed, for cache keys."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def assessment_key(control: Control, evidence_text: str, model: str, temperature: float, max_tokens: int) -> str:
+    """
+    Content hash of everything that determines an assessment.
+
+    The prompt templates are hashed in with ``PROMPT_VERSION``, so edits to
+    either one change every key.
+    """
+    payload = {
+        "control": {name: getattr(control, name, None) for name in PROMPT_CONTROL_FIELDS},
+        "evidence": normalize_evidence(evidence_text),
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "prompt_version": PROMPT_VERSION,
+        "prompts": [SYSTEM_PROMPT, USER_PROMPT],
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
 
 class ComplianceSuggestion(BaseModel):
     """AI compliance analysis result."""
@@ -19,21 +109,90 @@ class ComplianceSuggestion(BaseModel):
     reasoning_en: str
     reasoning_ar: str
     recommendations: list[str] = []
+    # Answered from the assessment cache; not part of the cached result
+    cached: bool = Field(False, exclude=True)
+
+
+def create_vllm_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Pooled client for the vLLM server with the configured limits and timeouts.
+
+    ``transport`` replaces the network, e.g. ``httpx.ASGITransport`` for a
+    stand-in vLLM app in tests.
+    """
+    http2 = settings.vllm_http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("VLLM_HTTP2 is set but the h2 package is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        base_url=settings.vllm_base_url,
+        transport=transport,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.vllm_max_connections,
+            max_keepalive_connections=settings.vllm_max_keepalive_connections,
+            keepalive_expiry=settings.vllm_keepalive_expiry_seconds,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.vllm_connect_timeout,
+            read=settings.vllm_read_timeout,
+            write=settings.vllm_write_timeout,
+            pool=settings.vllm_pool_timeout,
+        ),
+    )
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def open_vllm_client(client: Optional[httpx.AsyncClient] = None) -> httpx.AsyncClient:
+    """Install the process-wide vLLM client (a new pooled one unless ``client`` is given)."""
+    global _client
+    _client = client or create_vllm_client()
+    return _client
+
+
+def get_vllm_client() -> httpx.AsyncClient:
+    """Return the process-wide vLLM client, opening it on first use outside the app."""
+    if _client is None or _client.is_closed:
+        return open_vllm_client()
+    return _client
+
+
+async def close_vllm_client() -> None:
+    """Close the process-wide vLLM client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 class AIService:
     """AI service using vLLM OpenAI-compatible API."""
 
-    def __init__(self):
-        self.base_url = settings.vllm_base_url
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[AssessmentCache] = None,
+    ):
+        self.client = client or get_vllm_client()
+        self.cache = cache or assessment_cache
         self.model_name = settings.vllm_model_name
         self.max_tokens = settings.vllm_max_tokens
         self.temperature = settings.vllm_temperature
 
+    def cache_key(self, evidence_text: str, control: Control) -> str:
+        """Key of the assessment this service would produce for ``evidence_text``."""
+        return assessment_key(control, evidence_text, self.model_name, self.temperature, self.max_tokens)
+
     async def analyze_evidence(self, evidence_text: str, control: Control) -> ComplianceSuggestion:
         """
         Analyze evidence against a control requirement.
 
+        Identical inputs are answered from the assessment cache; ``cached``
+        on the result tells whether vLLM was called.
+
         Args:
             evidence_text: The evidence content to analyze
             control: The control to check compliance against
@@ -41,53 +200,47 @@ class AIService:
         Returns:
             ComplianceSuggestion with analysis results
         """
-        try:
-            # Build system prompt
-            system_prompt = self._build_system_prompt(control)
+        if not settings.ai_cache_enabled:
+            return await self._analyze(evidence_text, control)
 
-            # Build user prompt
-            user_prompt = f"""
-            Analyze the following evidence against the control requirement:
+        async def compute():
+            suggestion = await self._analyze(evidence_text, control)
+            return suggestion.model_dump()
 
-            Evidence:
-            {evidence_text}
+        result, cached = await self.cache.get_or_compute(
+            self.cache_key(evidence_text, control), compute, self.model_name, PROMPT_VERSION
+        )
+        return ComplianceSuggestion(**result, cached=cached)
 
-            Provide your analysis in JSON format with the following structure:
-            {{
-                "compliance_status": "COMPLIANT|PARTIAL|NON_COMPLIANT",
-                "confidence": 0.0-1.0,
-                "reasoning_en": "English explanation",
-                "reasoning_ar": "Arabic explanation",
-                "recommendations": ["recommendation1", "recommendation2"]
-            }}
-            """
+    async def _analyze(self, evidence_text: str, control: Control) -> ComplianceSuggestion:
+        """Call vLLM for one analysis, bypassing the cache."""
+        try:
+            # Call vLLM API over the shared connection pool
+            response = await self.client.post(
+                "/v1/chat/completions",
+                json={
+                    "model": self.model_name,
+                    "messages": [
+                        {"role": "system", "content": self._build_system_prompt(control)},
+                        {"role": "user", "content": USER_PROMPT.format(evidence_text=evidence_text)}
+                    ],
+                    "max_tokens": self.max_tokens,
+                    "temperature": self.temperature,
+                }
+            )
+
+            if response.status_code != 200:
+                raise AIServiceError(f"vLLM API error: {response.status_code}")
+
+            result = response.json()
+            content = result["choices"][0]["message"]["content"]
 
-            # Call vLLM API
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json={
-                        "model": self.model_name,
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        "max_tokens": self.max_tokens,
-                        "temperature": self.temperature,
-                    }
-                )
-
-                if response.status_code != 200:
-                    raise AIServiceError(f"vLLM API error: {response.status_code}")
-
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
-
-                # Parse JSON response
-                import json
-                suggestion_data = json.loads(content)
-                return ComplianceSuggestion(**suggestion_data)
+            # Parse JSON response
+            suggestion_data = json.loads(content)
+            return ComplianceSuggestion(**suggestion_data)
 
+        except AIServiceError:
+            raise
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling vLLM: {e}")
             raise AIServiceError(f"Failed to connect to AI service: {e}")
@@ -100,25 +253,4 @@ class AIService:
 
     def _build_system_prompt(self, control: Control) -> str:
         """Build system prompt with control context."""
-        return f"""
-        You are an expert GRC (Governance, Risk, and Compliance) auditor specializing in Saudi Arabian regulatory frameworks.
-        Your task is to analyze evidence documents to determine compliance with specific control requirements.
-
-        Control Information:
-        - ID: {control.control_id}
-        - Domain (English): {control.domain_en}
-        - Domain (Arabic): {control.domain_ar}
-        - Title (English): {control.title_en}
-        - Title (Arabic): {control.title_ar}
-        - Requirement (English): {control.description_en}
-        - Requirement (Arabic): {control.description_ar}
-
-        Instructions:
-        1. Carefully analyze the provided evidence against the control requirement
-        2. Determine if the evidence demonstrates compliance (COMPLIANT), partial compliance (PARTIAL), or non-compliance (NON_COMPLIANT)
-        3. Provide a confidence score (0.0-1.0) indicating how certain you are of your assessment
-        4. Explain your reasoning in both English and Arabic
-        5. Provide specific recommendations if the evidence is not fully compliant
-
-        Be objective, thorough, and cite specific elements from the evidence in your reasoning.
-        """
+        return SYSTEM_PROMPT.format(control=control)
@@ -0,0 +1,155 @@
+"""
+Content-addressed cache for AI compliance assessments.
+
+Results are stored under a hash of everything that determines them (see
+``ai_service.assessment_key``), in two tiers: a per-worker LRU for repeated
+requests and the ``ai_assessments`` collection, shared by all workers and
+expired by a TTL index. Concurrent requests for the same key wait for one
+vLLM call instead of each starting their own.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.ai_assessment import AIAssessment
+
+logger = logging.getLogger(__name__)
+
+
+class AssessmentCache:
+    """Two-tier (memory, MongoDB) cache of assessment results with hit-rate counters."""
+
+    def __init__(
+        self,
+        memory_size: int,
+        memory_ttl: float,
+        ttl_days: float,
+        persist: bool = True,
+    ):
+        self.memory = TTLCache(maxsize=memory_size, ttl=memory_ttl)
+        self.ttl = timedelta(days=ttl_days)
+        self.persist = persist
+        self.persistent_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for ``key``, from memory or MongoDB."""
+        result = self.memory.get(key)
+        if result is not None:
+            return result
+
+        if self.persist:
+            try:
+                doc = await AIAssessment.get_motor_collection().find_one(
+                    # The TTL monitor runs once a minute; skip entries it has not removed yet
+                    {"key": key, "expires_at": {"$gt": datetime.utcnow()}},
+                    {"result": 1},
+                )
+            except Exception as e:
+                logger.error(f"AI assessment cache read failed: {e}")
+                doc = None
+            if doc is not None:
+                self.persistent_hits += 1
+                self.memory.set(key, doc["result"])
+                return doc["result"]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any], model: str, prompt_version: str) -> None:
+        """Store a result in both tiers. MongoDB failures are logged, not raised."""
+        self.memory.set(key, result)
+        if not self.persist:
+            return
+
+        now = datetime.utcnow()
+        try:
+            await AIAssessment.get_motor_collection().update_one(
+                {"key": key},
+                {"$set": {
+                    "model": model,
+                    "prompt_version": prompt_version,
+                    "result": result,
+                    "created_at": now,
+                    "expires_at": now + self.ttl,
+                }},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.error(f"AI assessment cache write failed: {e}")
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        model: str,
+        prompt_version: str,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Cached result for ``key``, or the result of ``compute`` stored under it.
+
+        Returns:
+            ``(result, cached)``; ``cached`` is True when no new call was made
+        """
+        result = await self.get(key)
+        if result is not None:
+            return result, True
+
+        # The miss is counted once, however often this caller has to wait again
+        while (pending := self._inflight.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending), True
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    # This caller was cancelled, not the call it waited for
+                    raise
+            # The caller that was computing went away; compute (or wait) afresh
+            self.coalesced -= 1
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; nobody else needs to retrieve it
+            future.exception()
+            raise
+        except BaseException:
+            # Cancelled (e.g. the client disconnected): waiters must not inherit that
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(result)
+        await self.set(key, result, model, prompt_version)
+        return result, False
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for both tiers."""
+        memory = self.memory.stats()
+        hits = memory["hits"] + self.persistent_hits + self.coalesced
+        lookups = hits + self.misses - self.coalesced
+        return {
+            "memory": memory,
+            "persistent_hits": self.persistent_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global AI assessment cache instance
+assessment_cache = AssessmentCache(
+    memory_size=settings.ai_cache_memory_size,
+    memory_ttl=settings.ai_cache_memory_ttl_seconds,
+    ttl_days=settings.ai_cache_ttl_days,
+)
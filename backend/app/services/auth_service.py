@@ -2,17 +2,33 @@
 
 import logging
 from datetime import datetime
-from typing import Optional, Tuple
-from ldap3 import Server, Connection, ALL, SIMPLE
-from ldap3.core.exceptions import LDAPException
+from typing import List, Optional, Tuple
+from uuid import uuid4
 
 from app.config import settings
 from app.models.user import User, Role
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token
-from app.core.exceptions import AuthenticationError, LDAPConnectionError
+from app.core.security import password_hasher, create_access_token, create_refresh_token, decode_token
+from app.core.cache import TTLCache
+from app.core.exceptions import (
+    AuthenticationError,
+    LDAPConnectionError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
+from app.core.principals import invalidate_principal, revoke_principal
+from app.core.revocation import revocation_store
+from app.core.token_store import refresh_token_store
+from app.services.ldap_backend import get_ldap_backend
+from app.services.last_login import last_login_buffer
 
 logger = logging.getLogger(__name__)
 
+# User fields owned by the directory and refreshed on every LDAP login
+LDAP_SYNCED_FIELDS = ('email', 'full_name_en', 'full_name_ar', 'role')
+
+# Usernames the directory recently reported as nonexistent
+unknown_ldap_users = TTLCache(maxsize=10000, ttl=settings.ldap_negative_cache_seconds)
+
 
 class AuthService:
     """Authentication service handling LDAP and local auth."""
@@ -21,106 +37,148 @@ class AuthService:
         """
         Authenticate user via LDAP or local database.
 
+        The stored ``User.is_ldap_user`` flag routes known accounts straight to
+        the right backend, so local accounts never wait on the directory.
+        Unknown usernames go to LDAP (first login of a directory user) unless
+        the directory recently reported them as nonexistent.
+
         Returns:
             Tuple of (user, access_token, refresh_token)
         """
-        # Try LDAP authentication first
-        ldap_user = await self._authenticate_ldap(username, password)
-        if ldap_user:
-            user = await self._sync_ldap_user(ldap_user)
-            tokens = self._generate_tokens(user)
-            return user, tokens[0], tokens[1]
+        user = await User.find_one(User.username == username)
+
+        if user and not user.is_active:
+            raise AuthenticationError("Invalid username or password")
+
+        if user and not user.is_ldap_user:
+            user = await self._authenticate_local(user, password)
+        elif user or username not in unknown_ldap_users:
+            ldap_user = await self._authenticate_ldap(username, password)
+            user = await self._sync_ldap_user(ldap_user, user) if ldap_user else None
+        else:
+            user = None
 
-        # Fallback to local authentication
-        user = await self._authenticate_local(username, password)
         if user:
-            tokens = self._generate_tokens(user)
+            tokens = await self._issue_tokens(user)
             return user, tokens[0], tokens[1]
 
         raise AuthenticationError("Invalid username or password")
 
-    async def _authenticate_ldap(self, username: str, password: str) -> Optional[dict]:
-        """Authenticate against LDAP/Active Directory."""
-        try:
-            # Connect to LDAP server
-            server = Server(settings.ldap_server, get_info=ALL)
-
-            # Build user DN for binding
-            user_dn = f"uid={username},{settings.ldap_user_search_base}"
-
-            # Try to bind with user credentials
-            conn = Connection(
-                server,
-                user=user_dn,
-                password=password,
-                authentication=SIMPLE,
-                auto_bind=True
-            )
+    async def refresh_tokens(self, refresh_token: str) -> Tuple[User, str, str]:
+        """
+        Exchange a refresh token for a new token pair.
 
-            if not conn.bound:
-                return None
+        The presented token is consumed and a new one is issued in the same
+        family. Presenting a consumed token again revokes the whole family.
 
-            # Search for user attributes
-            search_filter = settings.ldap_user_search_filter.format(username=username)
-            conn.search(
-                settings.ldap_user_search_base,
-                search_filter,
-                attributes=['mail', 'cn', 'givenName', 'sn', 'memberOf']
-            )
+        Returns:
+            Tuple of (user, access_token, refresh_token)
+        """
+        payload = decode_token(refresh_token)
+        if not payload or payload.get("type") != "refresh" or not payload.get("jti"):
+            raise AuthenticationError("Invalid refresh token")
 
-            if not conn.entries:
-                return None
+        record = await refresh_token_store.consume(payload["jti"])
+        if record is None:
+            raise AuthenticationError("Refresh token has been revoked")
 
-            entry = conn.entries[0]
+        if record.reused:
+            logger.warning(f"Refresh token reuse detected for user {record.user_id}, revoking session")
+            await refresh_token_store.revoke_family(record.family_id)
+            raise AuthenticationError("Refresh token has been revoked")
 
-            # Extract user information
-            user_info = {
-                'username': username,
-                'email': str(entry.mail) if hasattr(entry, 'mail') else f"{username}@municipality.gov.sa",
-                'full_name_en': str(entry.cn) if hasattr(entry, 'cn') else username,
-                'full_name_ar': username,  # Would need to be stored in LDAP
-                'role': self._determine_role_from_ldap(entry),
-            }
+        if await revocation_store.is_revoked(record.user_id, payload.get("iat")):
+            await refresh_token_store.revoke_family(record.family_id)
+            raise AuthenticationError("Refresh token has been revoked")
+
+        user = await User.get(record.user_id)
+        if not user or not user.is_active:
+            await refresh_token_store.revoke_family(record.family_id)
+            raise AuthenticationError("User account is inactive")
 
-            conn.unbind()
-            logger.info(f"LDAP authentication successful for user: {username}")
-            return user_info
+        tokens = await self._issue_tokens(user, family_id=record.family_id)
+        return user, tokens[0], tokens[1]
 
-        except LDAPException as e:
-            logger.warning(f"LDAP authentication failed for {username}: {e}")
+    async def revoke_refresh_token(self, refresh_token: str) -> None:
+        """Revoke the session (token family) a refresh token belongs to."""
+        payload = decode_token(refresh_token)
+        if not payload or payload.get("type") != "refresh" or not payload.get("fam"):
+            raise AuthenticationError("Invalid refresh token")
+
+        await refresh_token_store.revoke_family(payload["fam"])
+
+    async def _authenticate_ldap(self, username: str, password: str) -> Optional[dict]:
+        """Authenticate against LDAP/Active Directory."""
+        try:
+            entry = await get_ldap_backend().authenticate(username, password)
+        except NotFoundError:
+            unknown_ldap_users.set(username, True)
             return None
-        except Exception as e:
-            logger.error(f"LDAP error: {e}")
+        except LDAPConnectionError as e:
+            logger.warning(f"LDAP authentication failed for {username}: {e.message}")
+            raise ServiceUnavailableError("Directory service is unavailable, please retry later")
+
+        if not entry:
             return None
 
-    def _determine_role_from_ldap(self, entry) -> Role:
+        logger.info(f"LDAP authentication successful for user: {username}")
+        return self.build_ldap_user_info(username, entry)
+
+    def build_ldap_user_info(self, username: str, entry: dict) -> dict:
+        """Map directory attributes to the user fields owned by LDAP."""
+        return {
+            'username': username,
+            'email': entry['mail'] or f"{username}@municipality.gov.sa",
+            'full_name_en': entry['cn'] or username,
+            'full_name_ar': username,  # Would need to be stored in LDAP
+            'role': self._determine_role_from_ldap(entry['memberOf']),
+        }
+
+    def _determine_role_from_ldap(self, member_of: List[str]) -> Role:
         """Determine user role based on LDAP group membership."""
-        # Check group memberships
-        if hasattr(entry, 'memberOf'):
-            groups = [str(g).lower() for g in entry.memberOf]
+        groups = [g.lower() for g in member_of]
 
-            if any('admin' in g for g in groups):
-                return Role.ADMIN
-            elif any('risk' in g for g in groups):
-                return Role.RISK_OFFICER
-            elif any('audit' in g for g in groups):
-                return Role.AUDITOR
+        if any('admin' in g for g in groups):
+            return Role.ADMIN
+        elif any('risk' in g for g in groups):
+            return Role.RISK_OFFICER
+        elif any('audit' in g for g in groups):
+            return Role.AUDITOR
 
         return Role.VIEWER
 
-    async def _sync_ldap_user(self, ldap_user: dict) -> User:
-        """Sync LDAP user to database."""
-        user = await User.find_one(User.username == ldap_user['username'])
+    async def _sync_ldap_user(self, ldap_user: dict, user: Optional[User] = None) -> User:
+        """
+        Sync LDAP user to database.
+
+        Only attributes that actually changed are written, with a targeted
+        ``$set``; the login timestamp goes through the write-behind buffer.
+        """
+        if user is None:
+            user = await User.find_one(User.username == ldap_user['username'])
 
         if user:
             # Update existing user
-            user.email = ldap_user['email']
-            user.full_name_en = ldap_user['full_name_en']
-            user.full_name_ar = ldap_user['full_name_ar']
-            user.role = ldap_user['role']
-            user.last_login = datetime.utcnow()
-            user.is_ldap_user = True
-            await user.save()
+            changes = {
+                field: ldap_user[field]
+                for field in LDAP_SYNCED_FIELDS
+                if getattr(user, field) != ldap_user[field]
+            }
+            if not user.is_ldap_user:
+                changes['is_ldap_user'] = True
+
+            if changes:
+                role_changed = 'role' in changes
+                changes['updated_at'] = datetime.utcnow()
+                await user.set(changes)
+
+                # Tokens carrying the old role must not outlive a directory change
+                if role_changed:
+                    await revoke_principal(str(user.id))
+                else:
+                    await invalidate_principal(str(user.id))
+
+            last_login_buffer.record(user)
         else:
             # Create new user from LDAP
             user = User(
@@ -137,24 +195,20 @@ class AuthService:
 
         return user
 
-    async def _authenticate_local(self, username: str, password: str) -> Optional[User]:
-        """Authenticate against local database."""
-        user = await User.find_one(User.username == username, User.is_active == True)
-
-        if not user or not user.hashed_password:
+    async def _authenticate_local(self, user: User, password: str) -> Optional[User]:
+        """Authenticate a local account by its stored password hash."""
+        if not user.hashed_password:
             return None
 
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return None
 
-        # Update last login
-        user.last_login = datetime.utcnow()
-        await user.save()
+        last_login_buffer.record(user)
 
-        logger.info(f"Local authentication successful for user: {username}")
+        logger.info(f"Local authentication successful for user: {user.username}")
         return user
 
-    def _generate_tokens(self, user: User) -> Tuple[str, str]:
+    def _generate_tokens(self, user: User, jti: str, family_id: str) -> Tuple[str, str]:
         """Generate access and refresh tokens."""
         token_data = {
             "sub": str(user.id),
@@ -163,10 +217,24 @@ class AuthService:
         }
 
         access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token(token_data)
+        refresh_token = create_refresh_token({**token_data, "jti": jti, "fam": family_id})
 
         return access_token, refresh_token
 
+    async def _issue_tokens(self, user: User, family_id: Optional[str] = None) -> Tuple[str, str]:
+        """Generate a token pair and register the refresh token server-side."""
+        jti = uuid4().hex
+        family_id = family_id or uuid4().hex
+        tokens = self._generate_tokens(user, jti=jti, family_id=family_id)
+
+        await refresh_token_store.add(
+            jti,
+            str(user.id),
+            family_id,
+            ttl=settings.jwt_refresh_token_expire_days * 24 * 3600,
+        )
+        return tokens
+
     async def create_local_user(self, username: str, email: str, password: str, **kwargs) -> User:
         """Create a local user account."""
         # Check if user exists
@@ -178,7 +246,7 @@ class AuthService:
         user = User(
             username=username,
             email=email,
-            hashed_password=get_password_hash(password),
+            hashed_password=await password_hasher.hash(password),
             is_ldap_user=False,
             is_active=True,
             **kwargs
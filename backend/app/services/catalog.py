@@ -0,0 +1,214 @@
+"""In-memory cache of the regulatory catalog (standards and controls).
+
+The catalog is loaded by ``run_seeders.py`` and only changes through
+``update_control`` or a re-seed, so every worker keeps a full copy in memory
+and serves catalog reads without touching MongoDB. Writers bump a shared
+version number (``app.services.versions``); each worker polls it and reloads
+when it moves.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models.control import Control
+from app.models.standard import Standard
+from app.services.search import ControlSearchIndex
+from app.services.versions import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+VERSION_SCOPE = "catalog"
+
+
+def _newest_first(docs: list) -> list:
+    return sorted(docs, key=lambda d: (d.created_at, d.id), reverse=True)
+
+
+async def bump_catalog_version() -> int:
+    """Record a catalog change so every worker reloads its copy."""
+    return await bump_version(VERSION_SCOPE)
+
+
+async def _current_version() -> int:
+    return await get_version(VERSION_SCOPE)
+
+
+class CatalogCache:
+    """
+    Standards and controls indexed for lookups by id, ``control_id``,
+    standard, priority and implementation status.
+
+    Index lists keep the newest-first order used by the list endpoints, so
+    filtered reads never need sorting. ``search`` is a full-text index over
+    the same controls.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self.version: Optional[int] = None
+        self.loaded_at: Optional[datetime] = None
+        self._standards: Dict[str, Standard] = {}
+        self._controls: Dict[str, Control] = {}
+        self._standards_sorted: List[Standard] = []
+        self._controls_sorted: List[Control] = []
+        self._by_control_id: Dict[str, List[Control]] = {}
+        self._by_standard: Dict[str, List[Control]] = {}
+        self._by_priority: Dict[str, List[Control]] = {}
+        self._by_status: Dict[str, List[Control]] = {}
+        self.search = ControlSearchIndex()
+        self._load_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.version is not None
+
+    async def load(self) -> None:
+        """Load the whole catalog from MongoDB and rebuild the indexes."""
+        async with self._load_lock:
+            # Read the version first: a change during the load triggers another reload
+            version = await _current_version()
+            standards = await Standard.find_all().to_list()
+            controls = await Control.find_all().to_list()
+
+            self._standards = {str(s.id): s for s in standards}
+            self._controls = {str(c.id): c for c in controls}
+            self._reindex()
+            self.search.sync(controls)
+            self.version = version
+            self.loaded_at = datetime.utcnow()
+
+        logger.info(f"Catalog loaded: {len(standards)} standards, {len(controls)} controls (v{version})")
+
+    async def ensure_loaded(self) -> None:
+        """Load the catalog on first use when the lifespan hook has not."""
+        if not self.loaded:
+            await self.load()
+
+    def _reindex(self) -> None:
+        self._standards_sorted = _newest_first(list(self._standards.values()))
+        self._controls_sorted = _newest_first(list(self._controls.values()))
+
+        by_control_id, by_standard = defaultdict(list), defaultdict(list)
+        by_priority, by_status = defaultdict(list), defaultdict(list)
+        for control in self._controls_sorted:
+            by_control_id[control.control_id].append(control)
+            by_standard[str(control.standard.ref.id)].append(control)
+            by_priority[control.priority].append(control)
+            by_status[control.implementation_status.value].append(control)
+
+        self._by_control_id = dict(by_control_id)
+        self._by_standard = dict(by_standard)
+        self._by_priority = dict(by_priority)
+        self._by_status = dict(by_status)
+
+    def get_standard(self, standard_id: str) -> Optional[Standard]:
+        return self._standards.get(standard_id)
+
+    def list_standards(self, category: Optional[str] = None, active_only: bool = True) -> List[Standard]:
+        """Standards, newest first."""
+        return [
+            s for s in self._standards_sorted
+            if (not active_only or s.is_active) and (category is None or s.category == category)
+        ]
+
+    def get_control(self, control_id: str) -> Optional[Control]:
+        return self._controls.get(control_id)
+
+    def controls_by_code(self, code: str) -> List[Control]:
+        """Controls with the given ``control_id`` (e.g. ``ECC-1-1-1``)."""
+        return self._by_control_id.get(code, [])
+
+    def list_controls(
+        self,
+        standard_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Control]:
+        """Controls matching all given filters, newest first."""
+        candidates = [self._controls_sorted]
+        if standard_id:
+            candidates.append(self._by_standard.get(standard_id, []))
+        if priority:
+            candidates.append(self._by_priority.get(priority, []))
+        if status:
+            candidates.append(self._by_status.get(status, []))
+
+        # Scan the most selective index and check the remaining filters
+        return [
+            c for c in min(candidates, key=len)
+            if (not standard_id or str(c.standard.ref.id) == standard_id)
+            and (not priority or c.priority == priority)
+            and (not status or c.implementation_status.value == status)
+        ]
+
+    def search_controls(
+        self,
+        query: str,
+        standard_id: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Tuple[Control, float]]:
+        """Controls ranked by relevance to ``query``, optionally within one standard."""
+        accept = None
+        if standard_id:
+            accept = lambda doc_id: str(self._controls[doc_id].standard.ref.id) == standard_id
+        return [(self._controls[doc_id], score) for doc_id, score in self.search.search(query, limit, accept)]
+
+    async def control_updated(self, control: Control) -> None:
+        """Apply a saved control locally and tell the other workers to reload."""
+        await self.controls_updated([control])
+
+    async def controls_updated(self, controls: List[Control]) -> None:
+        """Apply saved controls locally with a single version bump."""
+        if not self.loaded:
+            await bump_catalog_version()
+            return
+
+        for control in controls:
+            self._controls[str(control.id)] = control
+            self.search.index(control)
+        self._reindex()
+
+        previous = self.version
+        self.version = await bump_catalog_version()
+        if previous is not None and self.version != previous + 1:
+            # Someone else changed the catalog in the meantime
+            await self.load()
+
+    async def refresh_if_changed(self) -> bool:
+        """Reload if another worker or a re-seed changed the catalog. Returns True on reload."""
+        if await _current_version() == self.version:
+            return False
+        await self.load()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.refresh_if_changed()
+            except Exception as e:
+                logger.error(f"Catalog version check failed: {e}")
+
+    def start(self) -> None:
+        """Start polling the catalog version."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling the catalog version."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global catalog cache instance
+catalog = CatalogCache(check_interval=settings.catalog_version_check_seconds)
@@ -0,0 +1,153 @@
+"""
+Compliance rollup per standard and per domain.
+
+One grouped aggregation counts controls by standard, domain, priority and
+implementation status; the standard → domain → status matrix and the
+compliance percentages are derived from those counts. The result is cached
+per catalog version, so ``update_control`` (which bumps the version)
+invalidates it on every worker.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from app.models.control import Control, ImplementationStatus
+
+# Higher-priority controls count for more in the weighted percentage
+PRIORITY_WEIGHTS = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+# Credit per status; NOT_APPLICABLE controls are left out of the percentages
+STATUS_CREDIT = {
+    ImplementationStatus.IMPLEMENTED.value: 1.0,
+    ImplementationStatus.PARTIALLY_IMPLEMENTED.value: 0.5,
+    ImplementationStatus.NOT_IMPLEMENTED.value: 0.0,
+}
+STATUSES = [s.value for s in ImplementationStatus]
+
+ROLLUP_PIPELINE = [
+    {
+        "$group": {
+            "_id": {
+                # DBRef field names start with "$", so they need $getField
+                "standard": {"$getField": {"field": {"$literal": "$id"}, "input": "$standard"}},
+                "domain_en": "$domain_en",
+                "domain_ar": "$domain_ar",
+                "priority": "$priority",
+                "status": "$implementation_status",
+            },
+            "count": {"$sum": 1},
+        }
+    },
+]
+
+
+class _Tally:
+    """Control counts by priority and status for one standard or domain."""
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, priority: str, status: str, count: int) -> None:
+        self.counts[priority][status] += count
+
+    def score(self) -> Dict[str, Any]:
+        by_status = {status: 0 for status in STATUSES}
+        implemented = applicable = 0
+        earned = possible = 0.0
+        for priority, statuses in self.counts.items():
+            weight = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS["MEDIUM"])
+            for status, count in statuses.items():
+                by_status[status] = by_status.get(status, 0) + count
+                if status not in STATUS_CREDIT:
+                    continue
+                applicable += count
+                if status == ImplementationStatus.IMPLEMENTED.value:
+                    implemented += count
+                earned += weight * STATUS_CREDIT[status] * count
+                possible += weight * count
+
+        return {
+            "total_controls": sum(by_status.values()),
+            "applicable_controls": applicable,
+            "implemented_controls": implemented,
+            "compliance_percentage": round(implemented / applicable * 100, 1) if applicable else 0.0,
+            "weighted_compliance_percentage": round(earned / possible * 100, 1) if possible else 0.0,
+            "by_status": by_status,
+        }
+
+
+def build_rollup(groups: List[Dict[str, Any]], standards: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Assemble the rollup from ``ROLLUP_PIPELINE`` output.
+
+    ``standards`` maps standard ids to documents for their code and names;
+    standards missing from it are reported by id only.
+    """
+    overall = _Tally()
+    by_standard: Dict[str, _Tally] = defaultdict(_Tally)
+    by_domain: Dict[str, Dict[tuple, _Tally]] = defaultdict(lambda: defaultdict(_Tally))
+
+    for group in groups:
+        key, count = group["_id"], group["count"]
+        standard_id = str(key.get("standard"))
+        domain = (key.get("domain_en") or "", key.get("domain_ar") or "")
+        priority, status = key.get("priority"), key.get("status")
+        for tally in (overall, by_standard[standard_id], by_domain[standard_id][domain]):
+            tally.add(priority, status, count)
+
+    rows = []
+    for standard_id, tally in by_standard.items():
+        standard = standards.get(standard_id)
+        domains = [
+            {
+                "domain_en": domain_en,
+                "domain_ar": domain_ar,
+                **domain_tally.score(),
+                "by_priority": {
+                    priority: {status: statuses.get(status, 0) for status in STATUSES}
+                    for priority, statuses in sorted(
+                        domain_tally.counts.items(), key=lambda item: -PRIORITY_WEIGHTS.get(item[0], 0)
+                    )
+                },
+            }
+            for (domain_en, domain_ar), domain_tally in sorted(by_domain[standard_id].items())
+        ]
+        rows.append({
+            "standard_id": standard_id,
+            "code": getattr(standard, "code", None),
+            "name_en": getattr(standard, "name_en", None),
+            "name_ar": getattr(standard, "name_ar", None),
+            **tally.score(),
+            "domains": domains,
+        })
+
+    rows.sort(key=lambda row: row["code"] or row["standard_id"])
+    return {**overall.score(), "standards": rows}
+
+
+class ComplianceRollupCache:
+    """The last computed rollup, valid for one catalog version."""
+
+    def __init__(self):
+        self._rollup: Optional[Dict[str, Any]] = None
+        self._version: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._rollup = self._version = None
+
+    async def get(self, version: Optional[int], standards: Dict[str, Any]) -> Dict[str, Any]:
+        """Rollup for catalog ``version``, computed at most once per version."""
+        if self._rollup is not None and self._version == version:
+            return self._rollup
+
+        async with self._lock:
+            if self._rollup is None or self._version != version:
+                groups = await Control.get_motor_collection().aggregate(ROLLUP_PIPELINE).to_list(length=None)
+                self._rollup = build_rollup(groups, standards)
+                self._version = version
+        return self._rollup
+
+
+# Global compliance rollup cache
+compliance_rollup = ComplianceRollupCache()
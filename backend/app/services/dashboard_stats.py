@@ -0,0 +1,270 @@
+"""
+Dashboard statistics.
+
+``compute_stats`` recomputes the status breakdowns with one aggregation per
+collection. ``DashboardCounters`` keeps the same breakdowns materialized in
+one ``dashboard_stats`` document that write paths update with ``$inc``, so
+the dashboard is a single point read. Every ``$inc`` also bumps the
+document's ``version``; reconciliation replaces the counters only if the
+version did not move while it recounted, so concurrent writes are never
+overwritten.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from collections import Counter as Tally
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.models.audit import Audit, AuditStatus
+from app.models.control import Control, ImplementationStatus
+from app.models.dashboard_stats import DashboardStats
+from app.models.nonconformity import NonConformity, NonConformityStatus, Severity
+from app.models.risk import Risk, RiskLevel
+
+logger = logging.getLogger(__name__)
+
+RISK_STATUSES = ["OPEN", "MONITORING", "CLOSED"]
+CONTROL_PRIORITIES = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+# Breakdowns per collection: output key -> (grouped field, known values)
+BREAKDOWNS = {
+    Control: {
+        "by_status": ("implementation_status", [s.value for s in ImplementationStatus]),
+        "by_priority": ("priority", CONTROL_PRIORITIES),
+    },
+    Risk: {
+        "by_status": ("status", RISK_STATUSES),
+        "by_level": ("risk_level", [level.value for level in RiskLevel]),
+    },
+    Audit: {
+        "by_status": ("status", [s.value for s in AuditStatus]),
+    },
+    NonConformity: {
+        "by_status": ("status", [s.value for s in NonConformityStatus]),
+        "by_severity": ("severity", [s.value for s in Severity]),
+    },
+}
+
+
+# Section of the stats document per collection
+SECTIONS = {
+    Control: "controls",
+    Risk: "risks",
+    Audit: "audits",
+    NonConformity: "findings",
+}
+
+STATS_NAME = "global"
+
+# Recounts attempted before a reconciliation gives up on a busy collection
+RECONCILE_ATTEMPTS = 3
+
+
+def facet_pipeline(breakdowns: Dict[str, tuple]) -> List[Dict[str, Any]]:
+    """Build a ``$facet`` stage grouping the collection by every breakdown field in one pass."""
+    return [{
+        "$facet": {
+            key: [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+            for key, (field, _) in breakdowns.items()
+        }
+    }]
+
+
+def parse_facets(result: Dict[str, List[Dict[str, Any]]], breakdowns: Dict[str, tuple]) -> Dict[str, Dict[str, int]]:
+    """Turn ``$facet`` group output into ``{key: {value: count}}`` with zeros for absent values."""
+    parsed = {}
+    for key, (_, values) in breakdowns.items():
+        counts = {value: 0 for value in values}
+        for group in result.get(key, []):
+            if group["_id"] is not None:
+                counts[str(group["_id"])] = group["count"]
+        parsed[key] = counts
+    return parsed
+
+
+async def _collection_breakdowns(model) -> Dict[str, Dict[str, int]]:
+    breakdowns = BREAKDOWNS[model]
+    results = await model.get_motor_collection().aggregate(facet_pipeline(breakdowns)).to_list(length=1)
+    return parse_facets(results[0] if results else {}, breakdowns)
+
+
+async def compute_stats() -> Dict[str, Dict[str, Dict[str, int]]]:
+    """
+    Compute status breakdowns for controls, risks, audits and findings.
+
+    Each collection is scanned once and the four aggregations run concurrently.
+
+    Returns:
+        ``{"controls": {"by_status": {...}, ...}, "risks": ..., "audits": ..., "findings": ...}``
+    """
+    controls, risks, audits, findings = await asyncio.gather(
+        _collection_breakdowns(Control),
+        _collection_breakdowns(Risk),
+        _collection_breakdowns(Audit),
+        _collection_breakdowns(NonConformity),
+    )
+    return {"controls": controls, "risks": risks, "audits": audits, "findings": findings}
+
+
+def snapshot(doc) -> Dict[str, str]:
+    """Current value of every breakdown field of a document, keyed by breakdown."""
+    values = {}
+    for key, (field, _) in BREAKDOWNS[type(doc)].items():
+        value = getattr(doc, field)
+        values[key] = value.value if isinstance(value, Enum) else str(value)
+    return values
+
+
+def counter_changes(doc, before: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    ``$inc`` document moving ``doc`` from its ``before`` snapshot to its current values.
+
+    With no ``before`` the document is counted as new.
+    """
+    section = SECTIONS[type(doc)]
+    changes = Tally()
+    for key, value in snapshot(doc).items():
+        old = before.get(key) if before else None
+        if old == value:
+            continue
+        if old is not None:
+            changes[f"{section}.{key}.{old}"] -= 1
+        changes[f"{section}.{key}.{value}"] += 1
+    return {path: delta for path, delta in changes.items() if delta}
+
+
+class DashboardCounters:
+    """Materialized dashboard breakdowns with periodic reconciliation."""
+
+    def __init__(self, reconcile_interval: float):
+        self.reconcile_interval = reconcile_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    async def record(self, doc, before: Optional[Dict[str, str]] = None) -> None:
+        """
+        Apply a created or changed document to the counters.
+
+        Take ``before`` with ``snapshot(doc)`` prior to modifying an existing
+        document. Failures are logged, not raised: the write itself has
+        already succeeded and the next reconciliation corrects the counters.
+        """
+        changes = counter_changes(doc, before)
+        if not changes:
+            return
+        await self.apply(changes)
+
+    async def apply(self, changes: Dict[str, int]) -> None:
+        """Apply a raw ``$inc`` document, e.g. the combined changes of a bulk write."""
+        try:
+            # No upsert: a missing document is rebuilt in full on the next read
+            await DashboardStats.get_motor_collection().update_one(
+                {"name": STATS_NAME},
+                {"$inc": {**changes, "version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            )
+        except Exception as e:
+            logger.error(f"Failed to update dashboard counters: {e}")
+
+    async def read(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Read the materialized breakdowns, building them on first use."""
+        doc = await DashboardStats.get_motor_collection().find_one({"name": STATS_NAME})
+        if doc is None:
+            return await self.reconcile()
+
+        stats = {}
+        for model, section in SECTIONS.items():
+            stored = doc.get(section, {})
+            stats[section] = {
+                key: {value: 0 for value in values} | stored.get(key, {})
+                for key, (_, values) in BREAKDOWNS[model].items()
+            }
+        return stats
+
+    async def reconcile(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """
+        Recompute the breakdowns from the collections and store them.
+
+        The counters are replaced only if no ``$inc`` was applied while the
+        collections were recounted; otherwise the recount starts over, up to
+        ``RECONCILE_ATTEMPTS`` times, and the counters are left as they are.
+        """
+        collection = DashboardStats.get_motor_collection()
+        for _ in range(RECONCILE_ATTEMPTS):
+            doc = await collection.find_one({"name": STATS_NAME}, {"version": 1})
+            stats = await compute_stats()
+            now = datetime.utcnow()
+            if doc is None:
+                try:
+                    await collection.insert_one(
+                        {"name": STATS_NAME, **stats, "version": 0, "reconciled_at": now, "updated_at": now}
+                    )
+                    return stats
+                except DuplicateKeyError:
+                    # Another worker built the document first
+                    continue
+
+            result = await collection.update_one(
+                {"name": STATS_NAME, "version": doc.get("version")},
+                {"$set": {**stats, "reconciled_at": now, "updated_at": now}, "$inc": {"version": 1}},
+            )
+            if result.matched_count:
+                return stats
+
+        logger.warning("Dashboard counters kept changing during reconciliation, left as they are")
+        return stats
+
+    async def _acquire_lease(self) -> bool:
+        """Claim this interval's reconciliation so only one worker runs it."""
+        now = datetime.utcnow()
+        result = await DashboardStats.get_motor_collection().update_one(
+            {
+                "name": STATS_NAME,
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+            },
+            {"$set": {
+                "lease_owner": self.owner,
+                # Not released: the next reconciliation is due an interval from now
+                "lease_until": now + timedelta(seconds=self.reconcile_interval),
+            }},
+        )
+        return result.matched_count == 1
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                # No document yet: the first dashboard read builds it
+                if await self._acquire_lease():
+                    await self.reconcile()
+                else:
+                    logger.debug("Dashboard reconciliation lease held by another worker, skipping")
+            except Exception as e:
+                logger.error(f"Dashboard counter reconciliation failed: {e}")
+
+    def start(self) -> None:
+        """Start the periodic reconciliation task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic reconciliation task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global dashboard counters instance
+dashboard_counters = DashboardCounters(
+    reconcile_interval=settings.dashboard_reconcile_interval_seconds,
+)
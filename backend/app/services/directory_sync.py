@@ -0,0 +1,288 @@
+"""Background incremental LDAP directory sync.
+
+Pages through ``settings.ldap_user_search_base`` and upserts directory users
+in bulk, so risk owners and finding assignees exist before their first login
+and role changes in AD are picked up without waiting for one. Each run only
+asks for entries changed since the stored watermark (``modifyTimestamp`` or
+AD's ``uSNChanged``).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.config import settings
+from app.core.exceptions import LDAPConnectionError
+from app.core.principals import principal_cache, publish_principal_changes, revoke_principal
+from app.models.sync_state import DirectorySyncState
+from app.models.user import User
+from app.services.auth_service import AuthService, LDAP_SYNCED_FIELDS
+from app.services.ldap_backend import LDAPBackend, USER_ATTRIBUTES, get_ldap_backend
+
+logger = logging.getLogger(__name__)
+
+SYNC_NAME = "ldap-users"
+USN_ATTRIBUTE = "uSNChanged"
+
+
+class DirectorySyncService:
+    """Incremental, paged LDAP-to-MongoDB user sync."""
+
+    def __init__(
+        self,
+        backend: Optional[LDAPBackend] = None,
+        page_size: Optional[int] = None,
+        interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        base_filter: Optional[str] = None,
+        watermark_attribute: Optional[str] = None,
+        username_attribute: Optional[str] = None,
+    ):
+        self._backend = backend
+        self.page_size = page_size or settings.ldap_sync_page_size
+        self.interval = interval or settings.ldap_sync_interval_seconds
+        self.lease_seconds = lease_seconds or settings.ldap_sync_lease_seconds
+        self.base_filter = base_filter or settings.ldap_sync_filter
+        self.watermark_attribute = watermark_attribute or settings.ldap_sync_watermark_attribute
+        self.username_attribute = username_attribute or settings.ldap_username_attribute
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._auth_service = AuthService()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def backend(self) -> LDAPBackend:
+        return self._backend or get_ldap_backend()
+
+    @property
+    def attributes(self) -> List[str]:
+        return USER_ATTRIBUTES + [self.username_attribute, self.watermark_attribute]
+
+    def build_filter(self, watermark: Optional[str]) -> str:
+        """Directory filter for entries changed at or after the watermark."""
+        if not watermark:
+            return self.base_filter
+        return f"(&{self.base_filter}({self.watermark_attribute}>={watermark}))"
+
+    def watermark_of(self, entry: Dict[str, Any]) -> Optional[str]:
+        """Normalize an entry's watermark attribute to its LDAP filter form."""
+        value = entry.get(self.watermark_attribute)
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            value = value.astimezone(timezone.utc) if value.tzinfo else value
+            return value.strftime("%Y%m%d%H%M%S.0Z")
+        return str(value)
+
+    def _newer(self, candidate: Optional[str], current: Optional[str]) -> bool:
+        if candidate is None:
+            return False
+        if current is None:
+            return True
+        if self.watermark_attribute == USN_ATTRIBUTE:
+            return int(candidate) > int(current)
+        return candidate > current
+
+    async def sync_once(self, full: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Run one sync pass.
+
+        Returns:
+            Counters for the pass, or None if another worker holds the lease
+        """
+        state = await self._acquire_lease()
+        if state is None:
+            logger.debug("Directory sync lease held by another worker, skipping")
+            return None
+
+        stats = {"seen": 0, "created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "errors": 0}
+        watermark = None if full else state.get("watermark")
+        highest = watermark
+        completed = False
+
+        try:
+            async for page in self.backend.paged_search(
+                self.build_filter(watermark), self.attributes, self.page_size
+            ):
+                users = []
+                for entry in page:
+                    stats["seen"] += 1
+                    candidate = self.watermark_of(entry)
+                    if self._newer(candidate, highest):
+                        highest = candidate
+
+                    username = entry.get(self.username_attribute)
+                    if not username:
+                        stats["skipped"] += 1
+                        continue
+                    users.append(self._auth_service.build_ldap_user_info(str(username), entry))
+
+                if users:
+                    await self.upsert_users(users, stats)
+
+                if not await self._renew_lease():
+                    logger.warning("Directory sync lease expired mid-pass, leaving the rest to its new holder")
+                    break
+            else:
+                completed = True
+        finally:
+            # Pages are not ordered by the watermark, so only a complete pass may advance it
+            await self._release_lease(highest if completed else state.get("watermark"), stats)
+
+        logger.info(f"Directory sync finished: {stats}")
+        return stats
+
+    async def upsert_users(self, users: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+        """Insert new directory users and update changed ones in one bulk write."""
+        collection = User.get_motor_collection()
+        now = datetime.utcnow()
+        projection = {field: 1 for field in ("username", "is_ldap_user") + LDAP_SYNCED_FIELDS}
+
+        existing = {
+            doc["username"]: doc
+            async for doc in collection.find(
+                {"username": {"$in": [u["username"] for u in users]}}, projection
+            )
+        }
+
+        operations = []
+        role_changed = []
+        changed = []
+        for info in users:
+            fields = {field: info[field] for field in LDAP_SYNCED_FIELDS}
+            fields["role"] = fields["role"].value
+            doc = existing.get(info["username"])
+
+            if doc is None:
+                operations.append(UpdateOne(
+                    {"username": info["username"]},
+                    {"$setOnInsert": {
+                        "username": info["username"],
+                        **fields,
+                        "hashed_password": None,
+                        "is_active": True,
+                        "is_ldap_user": True,
+                        "last_login": None,
+                        "created_at": now,
+                        "updated_at": now,
+                    }},
+                    upsert=True,
+                ))
+                stats["created"] += 1
+                continue
+
+            if not doc.get("is_ldap_user"):
+                # Never take over a local account with the same username
+                stats["skipped"] += 1
+                continue
+
+            changes = {k: v for k, v in fields.items() if doc.get(k) != v}
+            if not changes:
+                stats["unchanged"] += 1
+                continue
+
+            changes["updated_at"] = now
+            operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": changes}))
+            stats["updated"] += 1
+            changed.append(str(doc["_id"]))
+            if "role" in changes:
+                role_changed.append(str(doc["_id"]))
+
+        if not operations:
+            return
+
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            stats["errors"] += len(errors)
+            logger.warning(f"Directory sync: {len(errors)} users could not be written")
+
+        for user_id in changed:
+            if user_id in role_changed:
+                await revoke_principal(user_id, publish=False)
+            else:
+                principal_cache.invalidate(user_id)
+        await publish_principal_changes()
+
+    async def _acquire_lease(self) -> Optional[Dict[str, Any]]:
+        """Take the job lease so only one worker syncs at a time."""
+        collection = DirectorySyncState.get_motor_collection()
+        now = datetime.utcnow()
+        try:
+            return await collection.find_one_and_update(
+                {
+                    "name": SYNC_NAME,
+                    "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+                },
+                {
+                    "$set": {
+                        "lease_owner": self.owner,
+                        "lease_until": now + timedelta(seconds=self.lease_seconds),
+                        "updated_at": now,
+                    },
+                    "$setOnInsert": {"created_at": now, "last_stats": {}},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # The state document exists and its lease is still held
+            return None
+
+    async def _renew_lease(self) -> bool:
+        """Extend the lease for another page; False if another worker has taken it over."""
+        now = datetime.utcnow()
+        result = await DirectorySyncState.get_motor_collection().update_one(
+            {"name": SYNC_NAME, "lease_owner": self.owner},
+            {"$set": {"lease_until": now + timedelta(seconds=self.lease_seconds), "updated_at": now}},
+        )
+        return result.matched_count == 1
+
+    async def _release_lease(self, watermark: Optional[str], stats: Dict[str, int]) -> None:
+        now = datetime.utcnow()
+        await DirectorySyncState.get_motor_collection().update_one(
+            {"name": SYNC_NAME, "lease_owner": self.owner},
+            {"$set": {
+                "watermark": watermark,
+                "lease_owner": None,
+                "lease_until": None,
+                "last_run_at": now,
+                "last_stats": stats,
+                "updated_at": now,
+            }},
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync_once()
+            except LDAPConnectionError as e:
+                logger.warning(f"Directory sync skipped, directory unavailable: {e.message}")
+            except Exception as e:
+                logger.error(f"Directory sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the periodic sync task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic sync task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global directory sync service instance
+directory_sync = DirectorySyncService()
@@ -0,0 +1,107 @@
+"""Write-behind buffer for ``User.last_login`` updates."""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Coalesces ``last_login`` timestamps and flushes them in one ``bulk_write``.
+
+    A login only records the timestamp in memory; a background task writes
+    everything recorded since the previous flush every ``flush_interval``
+    seconds. ``$max`` keeps the newest timestamp when several workers flush
+    updates for the same user.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[PydanticObjectId, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.flushed = 0
+
+    def record(self, user: User, when: Optional[datetime] = None) -> None:
+        """Record a login; the user document is updated locally right away."""
+        when = when or datetime.utcnow()
+        user.last_login = when
+        self._pending[user.id] = when
+
+        if self._wakeup is not None and len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write all pending timestamps. Returns the number of users updated."""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        operations = [
+            UpdateOne({"_id": user_id}, {"$max": {"last_login": when}})
+            for user_id, when in pending.items()
+        ]
+
+        try:
+            await User.get_motor_collection().bulk_write(operations, ordered=False)
+        except asyncio.CancelledError:
+            # Cancelled mid-write (e.g. by stop()): the next flush rewrites them, $max is idempotent
+            self._restore(pending)
+            raise
+        except Exception as e:
+            logger.error(f"Failed to flush {len(operations)} last_login updates: {e}")
+            self._restore(pending)
+            return 0
+
+        self.flushed += len(operations)
+        return len(operations)
+
+    def _restore(self, pending: Dict[PydanticObjectId, datetime]) -> None:
+        """Put unwritten timestamps back, keeping the newest per user."""
+        for user_id, when in pending.items():
+            if when > self._pending.get(user_id, datetime.min):
+                self._pending[user_id] = when
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Cancelling the shutdown must not abandon the final write halfway
+        await asyncio.shield(self.flush())
+
+
+# Global last-login buffer instance
+last_login_buffer = LastLoginBuffer(
+    flush_interval=settings.last_login_flush_seconds,
+    max_pending=settings.last_login_max_pending,
+)
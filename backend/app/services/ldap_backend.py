@@ -0,0 +1,373 @@
+"""Pooled LDAP/Active Directory backend.
+
+Directory calls are blocking, so they run on a small dedicated thread pool
+and never on the event loop. Service-account connections are kept in a pool
+and reused; the ``Server`` object (and the schema it downloads on first use)
+is created once per process.
+"""
+
+import asyncio
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from ldap3 import Server, Connection, ALL, SIMPLE, SYNC
+from ldap3.core.exceptions import LDAPException
+from ldap3.utils.conv import escape_filter_chars
+from ldap3.utils.dn import escape_rdn
+
+from app.config import settings
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.exceptions import LDAPConnectionError, NotFoundError
+
+logger = logging.getLogger(__name__)
+
+USER_ATTRIBUTES = ['mail', 'cn', 'givenName', 'sn', 'memberOf']
+
+# Simple Paged Results control (RFC 2696)
+PAGED_RESULTS_OID = '1.2.840.113556.1.4.319'
+
+
+class LDAPBackend:
+    """LDAP backend with a service-account search-then-bind flow."""
+
+    def __init__(
+        self,
+        server_url: Optional[str] = None,
+        bind_dn: Optional[str] = None,
+        bind_password: Optional[str] = None,
+        search_base: Optional[str] = None,
+        search_filter: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        receive_timeout: Optional[float] = None,
+        call_timeout: Optional[float] = None,
+        server: Optional[Server] = None,
+        client_strategy: str = SYNC,
+    ):
+        self.server_url = server_url or settings.ldap_server
+        self.bind_dn = settings.ldap_bind_dn if bind_dn is None else bind_dn
+        self.bind_password = settings.ldap_bind_password if bind_password is None else bind_password
+        self.search_base = search_base or settings.ldap_user_search_base
+        self.search_filter = search_filter or settings.ldap_user_search_filter
+        self.pool_size = pool_size or settings.ldap_pool_size
+        self.connect_timeout = connect_timeout or settings.ldap_connect_timeout
+        self.receive_timeout = receive_timeout or settings.ldap_receive_timeout
+        self.call_timeout = call_timeout or settings.ldap_call_timeout
+        self.client_strategy = client_strategy
+
+        self.breaker = CircuitBreaker(
+            "ldap",
+            failure_threshold=settings.ldap_circuit_failure_threshold,
+            reset_timeout=settings.ldap_circuit_reset_seconds,
+        )
+
+        self._server = server
+        self._pool: "queue.LifoQueue[Connection]" = queue.LifoQueue(maxsize=self.pool_size)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def server(self) -> Server:
+        """Shared server object; its schema/DSA info is read only once."""
+        if self._server is None:
+            self._server = Server(
+                self.server_url,
+                get_info=ALL,
+                connect_timeout=self.connect_timeout,
+            )
+        return self._server
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.pool_size,
+                thread_name_prefix="ldap",
+            )
+        return self._executor
+
+    async def authenticate(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify credentials against the directory.
+
+        Returns:
+            The user's directory attributes, or None if the credentials are invalid
+
+        Raises:
+            NotFoundError: if the service account search finds no such user
+            LDAPConnectionError: if the directory cannot be reached in time,
+                or the circuit breaker is open
+        """
+        if not username or not password:
+            # An empty password would be accepted as an unauthenticated bind
+            return None
+        return await self.run(self._authenticate_sync, username, password)
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a blocking directory call on the LDAP thread pool with a timeout.
+
+        Connection failures and timeouts feed the circuit breaker; while it is
+        open calls fail immediately instead of waiting for a dead directory.
+        """
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        if not self.breaker.allow_request():
+            raise LDAPConnectionError("LDAP directory unavailable (circuit open)")
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(self.executor, func, *args),
+                timeout=self.call_timeout,
+            )
+        except NotFoundError:
+            self.breaker.record_success()
+            raise
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise LDAPConnectionError(f"LDAP call timed out after {self.call_timeout}s")
+        except LDAPConnectionError:
+            self.breaker.record_failure()
+            raise
+        except LDAPException as e:
+            self.breaker.record_failure()
+            raise LDAPConnectionError(f"LDAP error: {e}")
+        finally:
+            # A trial that was cancelled or hit an unrelated error says nothing
+            # about the directory; without this the breaker would stay half-open
+            if trial:
+                self.breaker.release_trial()
+
+        self.breaker.record_success()
+        return result
+
+    async def paged_search(
+        self,
+        search_filter: str,
+        attributes: Sequence[str],
+        page_size: int,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Search the user base page by page with the paged-results control.
+
+        Yields one list of entries per page, so memory stays bounded by
+        ``page_size`` no matter how large the directory is. A single pooled
+        service connection is held for the whole search because paging
+        cookies are tied to the connection.
+        """
+        if not self.bind_dn:
+            raise LDAPConnectionError("Paged directory searches require a service account")
+
+        conn = await self.run(self._acquire)
+        completed = False
+        try:
+            cookie = None
+            while True:
+                entries, cookie = await self.run(
+                    self._search_page, conn, search_filter, list(attributes), page_size, cookie
+                )
+                if entries:
+                    yield entries
+                if not cookie:
+                    break
+            completed = True
+        finally:
+            if completed:
+                self._release(conn)
+            else:
+                conn.unbind()
+
+    def _search_page(
+        self,
+        conn: Connection,
+        search_filter: str,
+        attributes: List[str],
+        page_size: int,
+        cookie: Optional[bytes],
+    ) -> tuple:
+        conn.search(
+            self.search_base,
+            search_filter,
+            attributes=attributes,
+            paged_size=page_size,
+            paged_cookie=cookie,
+        )
+        entries = [entry_to_dict(entry, extra=attributes) for entry in conn.entries]
+        controls = conn.result.get('controls') or {}
+        next_cookie = controls.get(PAGED_RESULTS_OID, {}).get('value', {}).get('cookie')
+        return entries, next_cookie
+
+    def _authenticate_sync(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+        if self.bind_dn:
+            entry = self._find_user(username)
+            if entry is None:
+                raise NotFoundError(f"User {username} not found in directory")
+            if not self._bind_as(entry['dn'], password):
+                return None
+            return entry
+
+        # No service account configured: bind directly with the user's DN
+        user_dn = f"uid={escape_rdn(username)},{self.search_base}"
+        conn = self._connect(user_dn, password)
+        try:
+            if not conn.bound:
+                return None
+            return self._search_user(conn, username)
+        finally:
+            conn.unbind()
+
+    def _find_user(self, username: str) -> Optional[Dict[str, Any]]:
+        """
+        Look a user up with a pooled service-account connection.
+
+        A pooled connection the directory has dropped while idle (e.g. an AD
+        idle timeout) only fails when used; it is discarded and the search is
+        retried once on a newly bound connection before reporting an error.
+        """
+        conn = self._take_pooled()
+        if conn is not None:
+            try:
+                entry = self._search_user(conn, username)
+            except LDAPException as e:
+                logger.info(f"Discarding stale pooled LDAP connection: {e}")
+                self._discard(conn)
+            else:
+                self._release(conn)
+                return entry
+
+        conn = self._open_service_connection()
+        try:
+            entry = self._search_user(conn, username)
+        except LDAPException as e:
+            self._discard(conn)
+            raise LDAPConnectionError(f"LDAP search failed: {e}")
+
+        self._release(conn)
+        return entry
+
+    def _search_user(self, conn: Connection, username: str) -> Optional[Dict[str, Any]]:
+        search_filter = self.search_filter.format(username=escape_filter_chars(username))
+        conn.search(self.search_base, search_filter, attributes=USER_ATTRIBUTES, size_limit=1)
+        if not conn.entries:
+            return None
+        return entry_to_dict(conn.entries[0])
+
+    def _bind_as(self, user_dn: str, password: str) -> bool:
+        """Check a user's password with a short-lived bind."""
+        conn = self._connect(user_dn, password)
+        try:
+            return conn.bound
+        finally:
+            conn.unbind()
+
+    def _connect(self, user: str, password: str, read_server_info: bool = False) -> Connection:
+        conn = Connection(
+            self.server,
+            user=user,
+            password=password,
+            authentication=SIMPLE,
+            client_strategy=self.client_strategy,
+            receive_timeout=self.receive_timeout,
+        )
+        try:
+            conn.open(read_server_info=False)
+            conn.bind(read_server_info=read_server_info)
+        except LDAPException as e:
+            conn.unbind()
+            raise LDAPConnectionError(f"Failed to connect to LDAP server: {e}")
+        return conn
+
+    def _acquire(self) -> Connection:
+        """Take a bound service connection from the pool, or open a new one."""
+        return self._take_pooled() or self._open_service_connection()
+
+    def _take_pooled(self) -> Optional[Connection]:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _open_service_connection(self) -> Connection:
+        conn = self._connect(
+            self.bind_dn,
+            self.bind_password,
+            read_server_info=self.server.info is None,
+        )
+        if not conn.bound:
+            conn.unbind()
+            raise LDAPConnectionError("LDAP service account bind failed")
+        return conn
+
+    def _discard(self, conn: Connection) -> None:
+        try:
+            conn.unbind()
+        except LDAPException:
+            pass
+
+    def _release(self, conn: Connection) -> None:
+        if conn.closed or not conn.bound:
+            return
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.unbind()
+
+    def close(self) -> None:
+        """Unbind pooled connections and stop the worker threads."""
+        while True:
+            try:
+                self._pool.get_nowait().unbind()
+            except queue.Empty:
+                break
+            except LDAPException:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def entry_to_dict(entry, extra: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Convert an ldap3 entry into plain values that are safe to pass between threads.
+
+    Attributes listed in ``extra`` are copied with their first raw value
+    (e.g. a ``datetime`` for ``modifyTimestamp``).
+    """
+    attributes = entry.entry_attributes_as_dict
+    result = {
+        name: attributes[name][0]
+        for name in extra
+        if attributes.get(name)
+    }
+    result.update({
+        'dn': entry.entry_dn,
+        'mail': _first(attributes.get('mail')),
+        'cn': _first(attributes.get('cn')),
+        'givenName': _first(attributes.get('givenName')),
+        'sn': _first(attributes.get('sn')),
+        'memberOf': [str(g) for g in attributes.get('memberOf', [])],
+    })
+    return result
+
+
+def _first(values: Optional[List[Any]]) -> Optional[str]:
+    return str(values[0]) if values else None
+
+
+_backend: Optional[LDAPBackend] = None
+
+
+def get_ldap_backend() -> LDAPBackend:
+    """Return the process-wide LDAP backend."""
+    global _backend
+    if _backend is None:
+        _backend = LDAPBackend()
+    return _backend
+
+
+def close_ldap_backend() -> None:
+    """Release the process-wide LDAP backend, if it was created."""
+    global _backend
+    if _backend is not None:
+        _backend.close()
+        _backend = None
@@ -0,0 +1,332 @@
+"""
+Streaming bulk import of risk register rows from CSV or JSON Lines.
+
+The file is decoded and parsed incrementally and handled in chunks: each
+chunk is validated against ``RiskCreate``, resolves its owners with one
+``$in`` query, reserves its risk IDs with one counter update and is written
+with one unordered ``insert_many``. Only the current chunk is held in
+memory; failed rows are reported by their line number in the file.
+"""
+
+import codecs
+import csv
+import json
+import logging
+from collections import Counter as Tally, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from beanie.operators import In
+from bson.errors import InvalidId
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.models.risk import Risk, RiskTreatment
+from app.models.user import User
+from app.schemas.risk import RiskCreate
+from app.services.dashboard_stats import counter_changes, dashboard_counters
+from app.services.sequences import sequences
+from app.services.versions import bump_version
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl")
+READ_SIZE = 64 * 1024
+# Lines fetched ahead for the CSV reader per refill
+CSV_FETCH_LINES = 256
+# Row errors listed in the report; further failures are only counted
+MAX_REPORTED_ERRORS = 1000
+
+# (line number, parsed record, parse error)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import."""
+
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": error})
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Import format from a file name's extension."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+async def read_chunks(stream, size: int = READ_SIZE) -> AsyncIterator[bytes]:
+    """Read an async stream (e.g. an ``UploadFile``) in fixed-size blocks."""
+    while chunk := await stream.read(size):
+        yield chunk
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 (with or without BOM) incrementally and split it into lines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_records(lines: AsyncIterable[str], fmt: str) -> AsyncIterator[Record]:
+    """
+    Parse lines as CSV (header row first) or JSON Lines.
+
+    Raises:
+        ValueError: Unknown format or a CSV file without a header row
+    """
+    if fmt == "jsonl":
+        async for number, line in _numbered(lines):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if isinstance(record, dict):
+                yield number, record, None
+            else:
+                yield number, None, "Expected a JSON object"
+        return
+
+    if fmt != "csv":
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    # One reader for the whole file, so the csv module alone decides where
+    # quoted fields (and therefore records) end
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    source = lines.__aiter__()
+    header: Optional[List[str]] = None
+    while True:
+        try:
+            values = next(reader)
+        except _NeedMore:
+            # The record is still open: parse it again with at least twice
+            # the lines, so long records are re-read a logarithmic number of times
+            feed.rewind()
+            for _ in range(max(len(feed.lines), CSV_FETCH_LINES)):
+                try:
+                    feed.lines.append(await source.__anext__())
+                except StopAsyncIteration:
+                    feed.done = True
+                    break
+            continue
+        except StopIteration:
+            break
+        except csv.Error as e:
+            yield feed.commit(), None, f"Invalid CSV: {e}"
+            continue
+
+        row = feed.commit()
+        if feed.ended:
+            # Input ran out inside a quoted field
+            yield row, None, "Unterminated quoted field"
+            break
+        if len(values) <= 1 and not "".join(values).strip():
+            continue
+
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield row, dict(zip(header, values)), None
+
+    if header is None:
+        raise ValueError("CSV file has no header row")
+
+
+class _NeedMore(Exception):
+    """The line feed is empty but the async source has more lines."""
+
+
+class _LineFeed:
+    """
+    Line iterator for ``csv.reader`` refilled from an async source.
+
+    ``csv.reader`` drops a half-parsed record when its input raises, so the
+    lines handed out for the current record are kept and put back by
+    ``rewind``; ``commit`` ends the record and returns its first line number.
+    """
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+        self.taken: List[str] = []
+        self.line = 0
+        self.done = False
+        self.ended = False
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            if self.done:
+                self.ended = True
+                raise StopIteration
+            raise _NeedMore
+        line = self.lines.popleft()
+        self.taken.append(line)
+        # Keep the line break, which belongs to the field in multi-line quoted values
+        return line + "\n"
+
+    def rewind(self) -> None:
+        self.lines.extendleft(reversed(self.taken))
+        self.taken = []
+
+    def commit(self) -> int:
+        row = self.line + 1
+        self.line += len(self.taken)
+        self.taken = []
+        return row
+
+
+async def _numbered(lines: AsyncIterable[str]) -> AsyncIterator[Tuple[int, str]]:
+    number = 0
+    async for line in lines:
+        number += 1
+        yield number, line
+
+
+def parse_row(record: Dict[str, Any]) -> RiskCreate:
+    """
+    Validate one record against ``RiskCreate``.
+
+    Empty cells count as missing, so optional columns may be left blank.
+
+    Raises:
+        ValueError: The record is not a valid risk
+    """
+    values = {key: value for key, value in record.items() if value not in ("", None)}
+    try:
+        data = RiskCreate.model_validate(values)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        ))
+    RiskTreatment(data.treatment)
+    return data
+
+
+def build_risk(data: RiskCreate, owner: User) -> Risk:
+    """New risk from validated input, scored, with its ``risk_id`` still to be assigned."""
+    risk = Risk(
+        risk_id="",
+        title_en=data.title_en,
+        title_ar=data.title_ar,
+        description_en=data.description_en,
+        description_ar=data.description_ar,
+        asset=data.asset,
+        threat=data.threat,
+        vulnerability=data.vulnerability,
+        impact_score=data.impact_score,
+        likelihood_score=data.likelihood_score,
+        treatment=RiskTreatment(data.treatment),
+        treatment_plan=data.treatment_plan,
+        owner=owner,
+        review_date=data.review_date,
+    )
+    risk.calculate_risk_score()
+    return risk
+
+
+async def import_risks(records: AsyncIterable[Record], chunk_size: int) -> ImportReport:
+    """Validate and insert parsed records chunk by chunk."""
+    report = ImportReport()
+    year = datetime.now().year
+    # Imported IDs come from one reservation per chunk; make sure it starts past stored IDs
+    await sequences.catch_up(Risk, "risk_id", "RISK", year)
+
+    try:
+        chunk: List[Tuple[int, RiskCreate]] = []
+        async for row, record, error in records:
+            report.total += 1
+            if error:
+                report.add_error(row, error)
+                continue
+            try:
+                chunk.append((row, parse_row(record)))
+            except ValueError as e:
+                report.add_error(row, str(e))
+                continue
+
+            if len(chunk) >= chunk_size:
+                await _import_chunk(chunk, report, year)
+                chunk = []
+
+        if chunk:
+            await _import_chunk(chunk, report, year)
+    finally:
+        # Chunks are committed as they go; stale list ETags must not outlive a partial import
+        if report.imported:
+            await bump_version("risks")
+
+    logger.info(f"Risk import: {report.imported} imported, {report.failed} failed of {report.total} rows")
+    return report
+
+
+async def _import_chunk(chunk: List[Tuple[int, RiskCreate]], report: ImportReport, year: int) -> None:
+    resolved = []
+    for row, data in chunk:
+        try:
+            resolved.append((row, data, PydanticObjectId(data.owner_id)))
+        except InvalidId:
+            report.add_error(row, "owner_id: invalid id")
+
+    owner_ids = list({owner_id for _, _, owner_id in resolved})
+    owners = {user.id: user for user in await User.find(In(User.id, owner_ids)).to_list()} if owner_ids else {}
+
+    rows, risks = [], []
+    for row, data, owner_id in resolved:
+        owner = owners.get(owner_id)
+        if owner is None:
+            report.add_error(row, "Owner not found")
+            continue
+        rows.append(row)
+        risks.append(build_risk(data, owner))
+
+    if not risks:
+        return
+
+    for risk, risk_id in zip(risks, await sequences.reserve_ids("RISK", len(risks), year)):
+        risk.risk_id = risk_id
+
+    write_errors: Dict[int, str] = {}
+    try:
+        await Risk.insert_many(risks, ordered=False)
+    except BulkWriteError as e:
+        write_errors = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+
+    changes = Tally()
+    for index, (row, risk) in enumerate(zip(rows, risks)):
+        if index in write_errors:
+            report.add_error(row, write_errors[index])
+            continue
+        report.imported += 1
+        changes.update(counter_changes(risk))
+
+    if changes:
+        await dashboard_counters.apply(dict(changes))
@@ -0,0 +1,236 @@
+"""
+Bilingual full-text search over the control catalog.
+
+Controls are indexed in memory in an inverted index and ranked with BM25.
+Text is analyzed per token: Arabic words are normalized (diacritics and
+tatweel removed; alef, ya and ta marbuta folded) and light-stemmed, and
+English words are lowercased and suffix-stemmed. Queries go through the
+same analysis, so ``أمن`` finds ``الأمن`` and ``encrypt`` finds
+``Encryption``.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter as Tally, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Repeated field text counts as that many occurrences of its terms
+FIELD_WEIGHTS = {
+    "control_id": 3,
+    "title_en": 3,
+    "title_ar": 3,
+    "domain_en": 1,
+    "domain_ar": 1,
+    "description_en": 1,
+    "description_ar": 1,
+}
+
+TOKEN_RE = re.compile(r"\w+(?:-\w+)*")
+ARABIC_RE = re.compile(r"[؀-ۿ]")
+
+# Tashkeel (fathatan .. sukun), superscript alef and tatweel
+ARABIC_MARKS_RE = re.compile(r"[ً-ْٰـ]")
+ARABIC_FOLDING = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ة": "ه",
+})
+ARABIC_PREFIXES = ("وال", "بال", "كال", "فال", "لل", "ال")
+# Checked in order, each stripped at most once
+ARABIC_SUFFIXES = ("ها", "ان", "ات", "ون", "ين", "يه", "ه", "ي")
+ARABIC_STOPWORDS = {
+    "في", "من", "علي", "الي", "عن", "او", "ان", "التي", "الذي", "الذين",
+    "مع", "هذا", "هذه", "ذلك", "تلك", "كل", "بين", "يجب", "قد", "لا", "ما",
+}
+
+ENGLISH_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "its", "of", "on", "or", "shall", "that", "the", "their", "to", "with",
+}
+# Longest first; the first suffix that leaves a stem of at least 3 letters is removed
+ENGLISH_SUFFIXES = sorted(
+    [
+        ("ification", ""), ("ational", ""), ("ization", "ize"), ("iveness", "ive"),
+        ("fulness", "ful"), ("ousness", "ous"), ("ations", ""), ("ation", ""),
+        ("ements", ""), ("ement", ""), ("ments", ""), ("ment", ""), ("ities", ""),
+        ("ness", ""), ("ings", ""), ("ions", ""), ("ity", ""), ("ing", ""), ("ion", ""),
+        ("ies", "y"), ("ied", "y"), ("ify", ""), ("ate", ""), ("ed", ""), ("es", ""),
+        ("s", ""),
+    ],
+    key=lambda pair: -len(pair[0]),
+)
+
+
+def normalize_arabic(text: str) -> str:
+    """Remove diacritics and tatweel and fold letter variants."""
+    return ARABIC_MARKS_RE.sub("", text).translate(ARABIC_FOLDING)
+
+
+def stem_arabic(word: str) -> str:
+    """Light stemming: a conjunction, an article-style prefix and suffixes (each at most once)."""
+    if word.startswith("و") and len(word) > 3:
+        word = word[1:]
+    for prefix in ARABIC_PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) >= 2:
+            word = word[len(prefix):]
+            break
+    for suffix in ARABIC_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            word = word[:-len(suffix)]
+    return word
+
+
+def stem_english(word: str) -> str:
+    """Suffix-stripping stemmer mapping common inflections to one stem."""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    for suffix, replacement in ENGLISH_SUFFIXES:
+        if not word.endswith(suffix):
+            continue
+        if suffix == "s" and word.endswith(("ss", "us", "is")):
+            continue
+        stem = word[:-len(suffix)] + replacement
+        if len(stem) >= 3:
+            word = stem
+            break
+
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]
+    return word
+
+
+def analyze(text: str) -> List[str]:
+    """Terms of a text, Arabic and English mixed."""
+    terms = []
+    for token in TOKEN_RE.findall(normalize_arabic(text).lower()):
+        if "-" in token:
+            # Control codes like ecc-1-1: the whole code plus its words
+            terms.append(token)
+            terms.extend(stem_english(part) for part in token.split("-") if part.isalpha() and len(part) > 1)
+        elif ARABIC_RE.search(token):
+            if token not in ARABIC_STOPWORDS:
+                terms.append(stem_arabic(token))
+        elif token not in ENGLISH_STOPWORDS:
+            terms.append(stem_english(token))
+    return terms
+
+
+def control_terms(control) -> Tally:
+    """Weighted term frequencies of a control's searchable fields."""
+    terms = Tally()
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in analyze(getattr(control, field, None) or ""):
+            terms[term] += weight
+    return terms
+
+
+def _fingerprint(control) -> int:
+    return hash(tuple(getattr(control, field, None) for field in FIELD_WEIGHTS))
+
+
+class ControlSearchIndex:
+    """
+    BM25 inverted index over controls, keyed by document id.
+
+    ``index`` re-analyzes a control only when its searchable text changed,
+    so status and notes updates leave the index untouched.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)  # term -> {id: tf}
+        self._terms: Dict[str, Tally] = {}
+        self._lengths: Dict[str, int] = {}
+        self._fingerprints: Dict[str, int] = {}
+        self._total_length = 0
+        self._norms: Optional[Dict[str, float]] = None
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def index(self, control) -> bool:
+        """Add or re-index a control. Returns False if its text is unchanged."""
+        doc_id = str(control.id)
+        fingerprint = _fingerprint(control)
+        if self._fingerprints.get(doc_id) == fingerprint:
+            return False
+
+        self.remove(doc_id)
+        terms = control_terms(control)
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = length = sum(terms.values())
+        self._fingerprints[doc_id] = fingerprint
+        self._total_length += length
+        self._norms = None
+        return True
+
+    def remove(self, doc_id: str) -> None:
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._fingerprints[doc_id]
+        self._norms = None
+
+    def sync(self, controls: Iterable) -> int:
+        """Bring the index in line with a full catalog load. Returns the number of controls re-indexed."""
+        seen, changed = set(), 0
+        for control in controls:
+            seen.add(str(control.id))
+            changed += self.index(control)
+        for doc_id in [doc_id for doc_id in self._terms if doc_id not in seen]:
+            self.remove(doc_id)
+            changed += 1
+        return changed
+
+    def _length_norms(self) -> Dict[str, float]:
+        """Per-document BM25 length normalization, recomputed after the index changes."""
+        if self._norms is None:
+            k1, b = self.k1, self.b
+            # No indexed tokens at all (empty catalog or empty text fields)
+            average_length = self._total_length / len(self._terms) if self._total_length else 1.0
+            self._norms = {
+                doc_id: k1 * (1 - b + b * length / average_length)
+                for doc_id, length in self._lengths.items()
+            }
+        return self._norms
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Best matches for ``query`` as ``(id, score)``, highest first.
+
+        ``accept`` filters candidate ids (e.g. by standard) before ranking.
+        """
+        count = len(self._terms)
+        if not count:
+            return []
+
+        norms = self._length_norms()
+        scores: Dict[str, float] = {}
+
+        for term in set(analyze(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            weight = (self.k1 + 1) * math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf / (tf + norms[doc_id])
+
+        if accept is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if accept(doc_id)}
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
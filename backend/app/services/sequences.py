@@ -0,0 +1,144 @@
+"""Atomic sequence generator for human-readable IDs like ``RISK-2024-0001``."""
+
+import asyncio
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from beanie import Document
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.models.counter import Counter
+
+logger = logging.getLogger(__name__)
+
+
+def format_id(prefix: str, year: int, number: int) -> str:
+    """Format a sequence number as ``PREFIX-YYYY-NNNN``."""
+    return f"{prefix}-{year}-{number:04d}"
+
+
+class SequenceGenerator:
+    """
+    Hands out increasing numbers per ``prefix`` and year from the counters collection.
+
+    Every reservation is a single ``find_one_and_update`` with ``$inc``, so
+    concurrent workers never receive the same number. With ``block_size`` > 1
+    each worker reserves that many numbers at once and mints IDs locally until
+    the block runs out; unused numbers are lost when the worker stops, so IDs
+    may have gaps and are only ordered per worker.
+    """
+
+    def __init__(self, block_size: int = 1):
+        self.block_size = max(1, block_size)
+        self._blocks: Dict[str, Tuple[int, int]] = {}  # name -> (next, last)
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def counter_name(prefix: str, year: int) -> str:
+        return f"{prefix}-{year}"
+
+    async def reserve(self, prefix: str, count: int = 1, year: Optional[int] = None) -> range:
+        """
+        Reserve ``count`` consecutive numbers in one round-trip.
+
+        Returns:
+            The reserved numbers, e.g. ``range(41, 51)`` for ``count=10``
+        """
+        year = year or datetime.now().year
+        name = self.counter_name(prefix, year)
+        collection = Counter.get_motor_collection()
+        update = {"$inc": {"value": count}, "$set": {"updated_at": datetime.utcnow()}}
+
+        try:
+            doc = await collection.find_one_and_update(
+                {"name": name}, update, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another worker created the counter concurrently; it exists now
+            doc = await collection.find_one_and_update(
+                {"name": name}, update, return_document=ReturnDocument.AFTER
+            )
+
+        last = doc["value"]
+        return range(last - count + 1, last + 1)
+
+    async def reserve_ids(self, prefix: str, count: int, year: Optional[int] = None) -> List[str]:
+        """Reserve a range of formatted IDs, e.g. for a bulk import."""
+        year = year or datetime.now().year
+        return [format_id(prefix, year, n) for n in await self.reserve(prefix, count, year)]
+
+    async def next_id(self, prefix: str, year: Optional[int] = None) -> str:
+        """Mint the next formatted ID, from the local block when pre-allocating."""
+        year = year or datetime.now().year
+        if self.block_size == 1:
+            number = (await self.reserve(prefix, 1, year))[0]
+            return format_id(prefix, year, number)
+
+        name = self.counter_name(prefix, year)
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            current, last = self._blocks.get(name, (1, 0))
+            if current > last:
+                block = await self.reserve(prefix, self.block_size, year)
+                current, last = block.start, block[-1]
+            self._blocks[name] = (current + 1, last)
+
+        return format_id(prefix, year, current)
+
+    async def catch_up(self, document_model: type, field: str, prefix: str, year: int) -> None:
+        """
+        Move the counter past the highest ID already stored in ``field``.
+
+        Needed when documents were created before the counter existed or were
+        imported with explicit IDs. Only runs after a duplicate key error.
+        """
+        pattern = re.compile(rf"^{re.escape(prefix)}-{year}-(\d+)$")
+        highest = 0
+        async for doc in document_model.get_motor_collection().find(
+            {field: {"$regex": pattern.pattern}}, {field: 1}
+        ):
+            match = pattern.match(doc[field])
+            if match:
+                highest = max(highest, int(match.group(1)))
+
+        await Counter.get_motor_collection().update_one(
+            {"name": self.counter_name(prefix, year)},
+            {"$max": {"value": highest}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+        # Drop the local block so the next ID comes from the corrected counter
+        self._blocks.pop(self.counter_name(prefix, year), None)
+
+    async def insert_with_id(
+        self,
+        document: Document,
+        field: str,
+        prefix: str,
+        attempts: int = 5,
+    ) -> Document:
+        """
+        Assign the next ID to ``field`` and insert, retrying on duplicates.
+
+        A duplicate on ``field`` means the counter is behind the stored data;
+        the counter is caught up and a fresh ID is tried. Duplicates on any
+        other unique index are raised unchanged.
+        """
+        year = datetime.now().year
+        for attempt in range(attempts):
+            setattr(document, field, await self.next_id(prefix, year))
+            try:
+                return await document.insert()
+            except DuplicateKeyError as e:
+                key_pattern = (e.details or {}).get("keyPattern", {})
+                if field not in key_pattern or attempt == attempts - 1:
+                    raise
+                logger.warning(f"Duplicate {getattr(document, field)}, catching up the {prefix} counter")
+                await self.catch_up(type(document), field, prefix, year)
+
+
+# Global sequence generator instance
+sequences = SequenceGenerator(block_size=settings.sequence_block_size)
@@ -0,0 +1,28 @@
+"""Change version numbers shared by all workers, stored in the counters collection."""
+
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from app.models.counter import Counter
+
+
+def _counter_name(scope: str) -> str:
+    return f"version:{scope}"
+
+
+async def get_version(scope: str) -> int:
+    """Current change version of ``scope`` (0 if it never changed)."""
+    doc = await Counter.get_motor_collection().find_one({"name": _counter_name(scope)}, {"value": 1})
+    return doc["value"] if doc else 0
+
+
+async def bump_version(scope: str) -> int:
+    """Record a change to ``scope`` and return the new version."""
+    doc = await Counter.get_motor_collection().find_one_and_update(
+        {"name": _counter_name(scope)},
+        {"$inc": {"value": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["value"]
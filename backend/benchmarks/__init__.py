@@ -0,0 +1 @@
+"""Performance benchmarks, run manually against a scratch MongoDB database."""
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark for bilingual control search.
+
+Indexes the seeded NCA-ECC, NCA-CSCC, NDMO and SDAIA controls (repeated
+``--copies`` times to model the full catalogs) and times English and Arabic
+queries against the BM25 index. No database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.control_search --copies 10 --iterations 2000
+"""
+
+import argparse
+import statistics
+import time
+from types import SimpleNamespace
+from typing import List
+
+from bson import ObjectId
+
+from app.models.control import Control
+from app.seeders import nca_cscc, nca_ecc, ndmo, sdaia
+from app.services.search import ControlSearchIndex
+
+QUERIES = [
+    "encryption",
+    "incident response",
+    "data classification policy",
+    "ECC-2-3",
+    "التشفير",
+    "حماية البيانات الشخصية",
+    "الأمن السيبراني",
+]
+
+
+def make_controls(copies: int) -> List[Control]:
+    controls = []
+    for copy in range(copies):
+        for seeder in (nca_ecc, nca_cscc, ndmo, sdaia):
+            standard = SimpleNamespace(ref=SimpleNamespace(id=ObjectId()))
+            for data in seeder.CONTROLS:
+                controls.append(Control.model_construct(
+                    id=ObjectId(),
+                    standard=standard,
+                    **{**data, "control_id": f"{data['control_id']}-{copy}" if copy else data["control_id"]},
+                ))
+    return controls
+
+
+def main(copies: int, iterations: int) -> None:
+    controls = make_controls(copies)
+
+    start = time.perf_counter()
+    index = ControlSearchIndex()
+    index.sync(controls)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(controls)} controls indexed in {build_ms:.1f} ms, {iterations} iterations per query")
+
+    for query in QUERIES:
+        index.search(query)  # warm-up
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - start) * 1_000_000)
+        print(f"{query:>26}: median {statistics.median(timings):8.1f} µs  max {max(timings):8.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bilingual control search")
+    parser.add_argument("--copies", type=int, default=10, help="Times the seeded catalogs are repeated")
+    parser.add_argument("--iterations", type=int, default=2000, help="Timed runs per query")
+    args = parser.parse_args()
+    main(args.copies, args.iterations)
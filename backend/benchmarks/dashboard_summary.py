@@ -0,0 +1,126 @@
+"""
+Benchmark the dashboard summary queries.
+
+Seeds a scratch database and compares the original nine sequential count
+queries with the concurrent ``$facet`` aggregations.
+
+Usage (from backend/):
+    python -m benchmarks.dashboard_summary --risks 50000 --iterations 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime
+
+from beanie import init_beanie
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.models import DOCUMENT_MODELS
+from app.models.audit import Audit, AuditStatus
+from app.models.control import Control, ImplementationStatus
+from app.models.nonconformity import NonConformity, NonConformityStatus, Severity
+from app.models.risk import Risk, RiskLevel
+from app.services.dashboard_stats import CONTROL_PRIORITIES, RISK_STATUSES, compute_stats
+
+BENCH_DB = "amana_grc_bench"
+
+
+async def sequential_counts() -> dict:
+    """The summary as computed before: one count query per number, in sequence."""
+    return {
+        "total_controls": await Control.count(),
+        "implemented_controls": await Control.find(
+            Control.implementation_status == ImplementationStatus.IMPLEMENTED
+        ).count(),
+        "total_risks": await Risk.count(),
+        "open_risks": await Risk.find(Risk.status == "OPEN").count(),
+        "critical_risks": await Risk.find(Risk.risk_level == RiskLevel.CRITICAL).count(),
+        "total_audits": await Audit.count(),
+        "active_audits": await Audit.find(
+            Audit.status.in_([AuditStatus.PLANNED, AuditStatus.IN_PROGRESS])
+        ).count(),
+        "open_findings": await NonConformity.find(
+            NonConformity.status.in_([NonConformityStatus.OPEN, NonConformityStatus.IN_PROGRESS])
+        ).count(),
+    }
+
+
+async def seed(db, risks: int) -> None:
+    """Insert a synthetic dataset sized relative to the number of risks."""
+    now = datetime.utcnow()
+    rng = random.Random(42)
+    owner_id = ObjectId()
+
+    await db.controls.insert_many([
+        {
+            "control_id": f"BENCH-{i}",
+            "priority": rng.choice(CONTROL_PRIORITIES),
+            "implementation_status": rng.choice(list(ImplementationStatus)).value,
+            "created_at": now,
+        }
+        for i in range(max(1, risks // 5))
+    ])
+    await db.risks.insert_many([
+        {
+            "risk_id": f"RISK-BENCH-{i}",
+            "status": rng.choice(RISK_STATUSES),
+            "risk_level": rng.choice(list(RiskLevel)).value,
+            "owner": {"$ref": "users", "$id": owner_id},
+            "created_at": now,
+        }
+        for i in range(risks)
+    ])
+    await db.audits.insert_many([
+        {"audit_id": f"AUD-BENCH-{i}", "status": rng.choice(list(AuditStatus)).value, "created_at": now}
+        for i in range(max(1, risks // 50))
+    ])
+    await db.nonconformities.insert_many([
+        {
+            "status": rng.choice(list(NonConformityStatus)).value,
+            "severity": rng.choice(list(Severity)).value,
+            "created_at": now,
+        }
+        for _ in range(max(1, risks // 2))
+    ])
+
+
+async def measure(func, iterations: int) -> list:
+    await func()  # warm-up
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def main(risks: int, iterations: int) -> None:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    db = client[BENCH_DB]
+    await client.drop_database(BENCH_DB)
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS)
+
+    try:
+        await seed(db, risks)
+        for name, func in (("sequential counts", sequential_counts), ("$facet + gather", compute_stats)):
+            timings = await measure(func, iterations)
+            print(
+                f"{name:>18}: median {statistics.median(timings):8.2f} ms  "
+                f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms"
+            )
+    finally:
+        await client.drop_database(BENCH_DB)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard summary queries")
+    parser.add_argument("--risks", type=int, default=50000, help="Number of risks to seed")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per variant")
+    args = parser.parse_args()
+    asyncio.run(main(args.risks, args.iterations))
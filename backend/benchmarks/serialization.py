@@ -0,0 +1,135 @@
+"""
+Micro-benchmark for list response serialization.
+
+Compares the previous path (build a ``RiskResponse`` per row, then let
+FastAPI validate and encode the list through ``response_model``) with the
+precompiled ``ModelSerializer`` on Beanie documents and on raw BSON rows.
+No database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.serialization --rows 10000 --iterations 10
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+from bson import DBRef, ObjectId
+from pydantic import TypeAdapter
+
+from app.core.serialization import ModelSerializer
+from app.models.risk import Risk, RiskLevel, RiskTreatment
+from app.schemas.risk import RiskResponse
+
+serializer = ModelSerializer(RiskResponse, owner_id="owner.$id")
+adapter = TypeAdapter(List[RiskResponse])
+
+
+def make_rows(count: int) -> List[dict]:
+    now = datetime(2024, 1, 1)
+    owner = ObjectId()
+    return [
+        {
+            "_id": ObjectId(),
+            "risk_id": f"RISK-2024-{i:05d}",
+            "title_en": "Unauthorized access to the production database",
+            "title_ar": "وصول غير مصرح به إلى قاعدة بيانات الإنتاج",
+            "description_en": "Weak authentication could let an external attacker read citizen records. " * 3,
+            "description_ar": "قد تسمح المصادقة الضعيفة لمهاجم خارجي بقراءة سجلات المواطنين. " * 3,
+            "asset": "Production Database",
+            "threat": "External Attacker",
+            "vulnerability": "Weak Authentication",
+            "impact_score": 4,
+            "likelihood_score": 3,
+            "risk_score": 12,
+            "risk_level": RiskLevel.MEDIUM.value,
+            "treatment": RiskTreatment.MITIGATE.value,
+            "treatment_plan": None,
+            "status": "OPEN",
+            "owner": DBRef("users", owner),
+            "review_date": None,
+            "created_at": now + timedelta(seconds=i),
+            "updated_at": now + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def to_document(row: dict) -> Risk:
+    fields = {k: v for k, v in row.items() if k not in ("_id", "owner")}
+    return Risk.model_construct(
+        id=row["_id"],
+        owner=SimpleNamespace(ref=row["owner"]),
+        **{**fields, "risk_level": RiskLevel(row["risk_level"]), "treatment": RiskTreatment(row["treatment"])},
+    )
+
+
+def response_model_path(risks: List[Risk]) -> bytes:
+    """What handlers did before: hand-built models, re-validated and encoded by FastAPI."""
+    models = [
+        RiskResponse(
+            id=str(risk.id),
+            risk_id=risk.risk_id,
+            title_en=risk.title_en,
+            title_ar=risk.title_ar,
+            description_en=risk.description_en,
+            description_ar=risk.description_ar,
+            asset=risk.asset,
+            threat=risk.threat,
+            vulnerability=risk.vulnerability,
+            impact_score=risk.impact_score,
+            likelihood_score=risk.likelihood_score,
+            risk_score=risk.risk_score,
+            risk_level=risk.risk_level.value,
+            treatment=risk.treatment.value,
+            treatment_plan=risk.treatment_plan,
+            status=risk.status,
+            owner_id=str(risk.owner.ref.id),
+            review_date=risk.review_date,
+            created_at=risk.created_at,
+            updated_at=risk.updated_at,
+        )
+        for risk in risks
+    ]
+    content = adapter.dump_python(adapter.validate_python(models), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def measure(func, arg, iterations: int) -> List[float]:
+    func(arg)  # warm-up
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main(rows: int, iterations: int) -> None:
+    bson_rows = make_rows(rows)
+    documents = [to_document(row) for row in bson_rows]
+
+    assert json.loads(response_model_path(documents)) == json.loads(serializer.dumps_many(documents))
+    assert json.loads(serializer.dumps_many(documents)) == json.loads(serializer.dumps_many(bson_rows))
+
+    cases = (
+        ("response_model path", response_model_path, documents),
+        ("serializer, documents", serializer.dumps_many, documents),
+        ("serializer, raw BSON", serializer.dumps_many, bson_rows),
+    )
+    print(f"{rows} rows, {iterations} iterations")
+    for name, func, arg in cases:
+        timings = measure(func, arg, iterations)
+        print(f"{name:>22}: median {statistics.median(timings):8.2f} ms  min {min(timings):8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per response")
+    parser.add_argument("--iterations", type=int, default=10, help="Timed runs per variant")
+    args = parser.parse_args()
+    main(args.rows, args.iterations)
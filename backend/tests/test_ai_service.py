@@ -0,0 +1,208 @@
+"""AI service tests against a stand-in vLLM server."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.exceptions import AIServiceError
+from app.models.control import Control
+from app.services import ai_service
+from app.services.ai_service import AIService, close_vllm_client, create_vllm_client, get_vllm_client, open_vllm_client
+from app.services.assessment_cache import AssessmentCache
+
+SUGGESTION = {
+    "compliance_status": "PARTIAL",
+    "confidence": 0.7,
+    "reasoning_en": "Strategy exists but is not approved.",
+    "reasoning_ar": "الاستراتيجية موجودة لكنها غير معتمدة.",
+    "recommendations": ["Obtain approval"],
+}
+
+
+def make_vllm(status_code=200):
+    """Minimal OpenAI-compatible chat completions app recording its requests."""
+    app = FastAPI()
+    app.state.requests = []
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        app.state.requests.append(await request.json())
+        # Yield like a real model would, so concurrent callers overlap
+        await asyncio.sleep(0.01)
+        if status_code != 200:
+            return JSONResponse({"error": "unavailable"}, status_code=status_code)
+        return {"choices": [{"message": {"content": json.dumps(SUGGESTION)}}]}
+
+    return app
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    """Fresh memory-only assessment cache per test."""
+    cache = AssessmentCache(memory_size=100, memory_ttl=60, ttl_days=1, persist=False)
+    monkeypatch.setattr(ai_service, "assessment_cache", cache)
+    return cache
+
+
+def make_control():
+    return Control.model_construct(
+        control_id="ECC-1-1",
+        domain_en="Cybersecurity Governance",
+        domain_ar="حوكمة الأمن السيبراني",
+        title_en="Cybersecurity Strategy",
+        title_ar="استراتيجية الأمن السيبراني",
+        description_en="The organization shall define a cybersecurity strategy.",
+        description_ar="يجب على الجهة تحديد استراتيجية للأمن السيبراني.",
+    )
+
+
+@pytest.mark.asyncio
+async def test_analyze_evidence_over_injected_client():
+    """Test the service calls vLLM through the injected client and parses the answer."""
+    vllm = make_vllm()
+    client = create_vllm_client(transport=httpx.ASGITransport(app=vllm))
+
+    async with client:
+        suggestion = await AIService(client).analyze_evidence("Approved strategy document", make_control())
+
+    assert suggestion.compliance_status == "PARTIAL"
+    assert suggestion.recommendations == ["Obtain approval"]
+    request = vllm.state.requests[0]
+    assert request["messages"][0]["role"] == "system"
+    assert "ECC-1-1" in request["messages"][0]["content"]
+    assert "Approved strategy document" in request["messages"][1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_vllm_error_status_raises():
+    """Test a non-200 answer surfaces as AIServiceError with the status."""
+    client = create_vllm_client(transport=httpx.ASGITransport(app=make_vllm(status_code=503)))
+
+    async with client:
+        with pytest.raises(AIServiceError, match="503"):
+            await AIService(client).analyze_evidence("evidence", make_control())
+
+
+def test_client_configuration(monkeypatch):
+    """Test pool limits and separate timeouts come from settings, and HTTP/2 degrades without h2."""
+    monkeypatch.setattr(ai_service.settings, "vllm_http2", True)
+    monkeypatch.setattr(ai_service.importlib.util, "find_spec", lambda name: None)
+
+    client = create_vllm_client()
+
+    assert client.timeout.connect == ai_service.settings.vllm_connect_timeout
+    assert client.timeout.read == ai_service.settings.vllm_read_timeout
+    assert str(client.base_url).rstrip("/") == ai_service.settings.vllm_base_url.rstrip("/")
+    pool = client._transport._pool
+    assert pool._max_connections == ai_service.settings.vllm_max_connections
+    assert pool._http2 is False
+
+
+@pytest.mark.asyncio
+async def test_shared_client_lifecycle():
+    """Test one client is shared until closed, and a closed client is replaced."""
+    client = open_vllm_client()
+    assert get_vllm_client() is client
+    assert AIService().client is client
+
+    await close_vllm_client()
+    assert client.is_closed
+
+    reopened = get_vllm_client()
+    assert reopened is not client
+    await close_vllm_client()
+
+
+@pytest.mark.asyncio
+async def test_repeated_analysis_served_from_cache(cache):
+    """Test identical control and evidence, up to whitespace, reach vLLM once."""
+    vllm = make_vllm()
+    client = create_vllm_client(transport=httpx.ASGITransport(app=vllm))
+
+    async with client:
+        service = AIService(client)
+        first = await service.analyze_evidence("Approved  strategy\ndocument", make_control())
+        second = await service.analyze_evidence(" Approved strategy document ", make_control())
+
+    assert not first.cached
+    assert second.cached
+    assert second.model_dump() == first.model_dump()
+    assert len(vllm.state.requests) == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_inputs_and_prompt_changes_miss(monkeypatch):
+    """Test control text, temperature, model and prompt changes all produce new keys."""
+    service = AIService(httpx.AsyncClient())
+    control = make_control()
+    key = service.cache_key("evidence", control)
+
+    assert service.cache_key("other evidence", control) != key
+    assert service.cache_key("evidence", control.model_copy(update={"title_en": "Strategy"})) != key
+
+    service.temperature += 0.1
+    assert service.cache_key("evidence", control) != key
+    service.temperature -= 0.1
+    service.model_name = "another-model"
+    assert service.cache_key("evidence", control) != key
+    service.model_name = ai_service.settings.vllm_model_name
+
+    monkeypatch.setattr(ai_service, "PROMPT_VERSION", "2")
+    assert service.cache_key("evidence", control) != key
+    monkeypatch.undo()
+    monkeypatch.setattr(ai_service, "USER_PROMPT", ai_service.USER_PROMPT + "Answer briefly.")
+    assert service.cache_key("evidence", control) != key
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_coalesced(cache):
+    """Test concurrent requests for one key share a single vLLM call, and failures are not cached."""
+    vllm = make_vllm()
+    client = create_vllm_client(transport=httpx.ASGITransport(app=vllm))
+
+    async with client:
+        service = AIService(client)
+        results = await asyncio.gather(*(service.analyze_evidence("evidence", make_control()) for _ in range(5)))
+
+    assert len(vllm.state.requests) == 1
+    assert sum(not r.cached for r in results) == 1
+    assert cache.stats()["coalesced"] == 4
+
+    failing = create_vllm_client(transport=httpx.ASGITransport(app=make_vllm(status_code=503)))
+    async with failing:
+        with pytest.raises(AIServiceError):
+            await AIService(failing).analyze_evidence("new evidence", make_control())
+    assert cache.memory.stats()["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_waiters(cache):
+    """Test waiters recompute when the request they were coalesced onto is cancelled."""
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.Event().wait()
+
+    async def answer():
+        return SUGGESTION
+
+    leader = asyncio.create_task(cache.get_or_compute("k", hang, "model", "1"))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_compute("k", answer, "model", "1"))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert await waiter == (SUGGESTION, False)
+    # One miss each for the leader and the waiter, none for the waiter's retry
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["coalesced"] == 0
+    assert await cache.get_or_compute("k", hang, "model", "1") == (SUGGESTION, True)
@@ -1,6 +1,9 @@
 """Authentication tests."""
 
+import asyncio
+
 import pytest
+from beanie import PydanticObjectId
 from app.services.auth_service import AuthService
 from app.models.user import User, Role
 
@@ -49,3 +52,117 @@ async def test_authenticate_local_user(db):
     assert user is not None
     assert access_token is not None
     assert refresh_token is not None
+
+
+@pytest.mark.asyncio
+async def test_local_user_skips_ldap(db, monkeypatch):
+    """Test local accounts are authenticated without contacting LDAP."""
+    from app.services import auth_service as auth_module
+
+    def no_ldap():
+        raise AssertionError("LDAP must not be used for local accounts")
+
+    monkeypatch.setattr(auth_module, "get_ldap_backend", no_ldap)
+    auth_service = AuthService()
+
+    await auth_service.create_local_user(
+        username="localuser",
+        email="local@example.com",
+        password="testpass123",
+        full_name_en="Local User",
+        full_name_ar="مستخدم محلي",
+        role=Role.VIEWER,
+    )
+
+    user, access_token, refresh_token = await auth_service.authenticate_user(
+        "localuser",
+        "testpass123"
+    )
+
+    assert user.username == "localuser"
+    assert user.is_ldap_user is False
+
+
+@pytest.mark.asyncio
+async def test_ldap_sync_skips_unchanged_users(db):
+    """Test re-syncing an unchanged LDAP user does not rewrite the document."""
+    auth_service = AuthService()
+    ldap_user = {
+        "username": "ldapuser",
+        "email": "ldap@example.com",
+        "full_name_en": "LDAP User",
+        "full_name_ar": "ldapuser",
+        "role": Role.AUDITOR,
+    }
+
+    user = await auth_service._sync_ldap_user(ldap_user)
+    created_updated_at = user.updated_at
+
+    user = await auth_service._sync_ldap_user(ldap_user)
+    assert user.updated_at == created_updated_at
+
+    user = await auth_service._sync_ldap_user({**ldap_user, "role": Role.RISK_OFFICER})
+    stored = await User.get(user.id)
+    assert stored.role == Role.RISK_OFFICER
+    assert user.updated_at > created_updated_at
+
+
+@pytest.mark.asyncio
+async def test_last_login_updates_are_batched(db):
+    """Test buffered last_login timestamps are written in one flush."""
+    from app.services.last_login import LastLoginBuffer
+
+    buffer = LastLoginBuffer(flush_interval=60, max_pending=100)
+    users = []
+    for i in range(3):
+        user = User(
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            full_name_en="Test User",
+            full_name_ar="مستخدم تجريبي",
+        )
+        await user.insert()
+        users.append(user)
+
+    for user in users:
+        buffer.record(user)
+    buffer.record(users[0])
+
+    assert await buffer.flush() == 3
+    stored = await User.get(users[0].id)
+    assert stored.last_login is not None
+
+
+@pytest.mark.asyncio
+async def test_stop_finishes_final_last_login_flush(monkeypatch):
+    """Test a cancelled shutdown neither loses nor abandons buffered timestamps."""
+    from app.services.last_login import LastLoginBuffer
+
+    written = []
+
+    class SlowCollection:
+        async def bulk_write(self, operations, ordered):
+            await asyncio.sleep(0.05)
+            written.extend(operations)
+
+    monkeypatch.setattr(User, "get_motor_collection", classmethod(lambda cls: SlowCollection()))
+    buffer = LastLoginBuffer(flush_interval=60, max_pending=100)
+    buffer.record(User.model_construct(id=PydanticObjectId()))
+
+    # A flush cancelled mid-write keeps its timestamps for the next one
+    flush = asyncio.create_task(buffer.flush())
+    await asyncio.sleep(0.01)
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
+    assert len(buffer._pending) == 1
+
+    # The final flush of a cancelled stop() still completes
+    stop = asyncio.create_task(buffer.stop())
+    await asyncio.sleep(0.01)
+    stop.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await stop
+    await asyncio.sleep(0.1)
+    assert len(written) == 1
+    assert buffer.flushed == 1
@@ -0,0 +1,201 @@
+"""Token-based authorization tests."""
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api import deps
+from app.config import Settings, settings
+from app.core.principals import Principal, PrincipalCache
+from app.core.revocation import InMemoryRevocationStore, RevocationStore
+from app.core.exceptions import AuthenticationError
+from app.core.security import create_access_token, create_refresh_token
+from app.core.token_store import InMemoryRefreshTokenStore, RefreshTokenStore
+from app.services.auth_service import AuthService
+from app.models.user import Role, User
+
+
+def _credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    """Enable stateless role checks with a fresh revocation store."""
+    store = InMemoryRevocationStore(retention_seconds=3600)
+    monkeypatch.setattr(settings, "auth_stateless_roles", True)
+    monkeypatch.setattr(deps, "revocation_store", store)
+    return store
+
+
+def test_principal_from_claims():
+    """Test principals are built only from complete claims."""
+    principal = Principal.from_claims({"sub": "u1", "username": "jdoe", "role": "AUDITOR", "iat": 10.0})
+    assert principal.role == Role.AUDITOR
+    assert principal.issued_at == 10.0
+
+    assert Principal.from_claims({"sub": "u1", "role": "AUDITOR"}) is None
+    assert Principal.from_claims({"sub": "u1", "username": "jdoe", "role": "ROOT"}) is None
+
+
+@pytest.mark.asyncio
+async def test_revocation_store_rejects_older_tokens():
+    """Test tokens issued before a revocation are revoked, newer ones are not."""
+    store = InMemoryRevocationStore(retention_seconds=3600)
+    assert not await store.is_revoked("u1", 100.0)
+
+    revoked_at = await store.revoke_user("u1")
+    assert await store.is_revoked("u1", revoked_at - 1)
+    assert not await store.is_revoked("u1", revoked_at + 1)
+    assert not await store.is_revoked("u2", revoked_at - 1)
+
+
+def test_incomplete_revocation_store_rejected():
+    """Test a store missing a required method fails when created, not on first use."""
+    class Partial(RevocationStore):
+        async def revoke_user(self, user_id):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_incomplete_refresh_token_store_rejected():
+    """Test a refresh token store must implement every operation."""
+    class Partial(RefreshTokenStore):
+        async def add(self, jti, user_id, family_id, ttl):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+@pytest.mark.asyncio
+async def test_stateless_principal_from_token(stateless):
+    """Test role checks are served from claims without loading the user."""
+    token = create_access_token({"sub": "u1", "username": "jdoe", "role": "RISK_OFFICER"})
+
+    principal = await deps.get_current_principal(_credentials(token))
+    assert isinstance(principal, Principal)
+
+    checker = deps.require_role(Role.ADMIN, Role.RISK_OFFICER)
+    assert await checker(principal) is principal
+
+    with pytest.raises(HTTPException) as exc:
+        deps.require_admin(principal)
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_stateless_principal_revoked(stateless):
+    """Test revoked tokens are rejected in stateless mode."""
+    token = create_access_token({"sub": "u1", "username": "jdoe", "role": "ADMIN"})
+    await stateless.revoke_user("u1")
+
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_principal(_credentials(token))
+    assert exc.value.status_code == 401
+
+    fresh = create_access_token({"sub": "u1", "username": "jdoe", "role": "ADMIN"})
+    principal = await deps.get_current_principal(_credentials(fresh))
+    assert principal.id == "u1"
+
+
+async def fake_version(scope):
+    return 0
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_rejected_with_cached_user(monkeypatch):
+    """Test tokens issued before a revocation are rejected even once the user is cached again."""
+    store = InMemoryRevocationStore(retention_seconds=3600)
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(deps, "revocation_store", store)
+    monkeypatch.setattr(deps, "principal_cache", cache)
+    monkeypatch.setattr("app.core.principals.get_version", fake_version)
+    user = User.model_construct(id=PydanticObjectId(), username="jdoe", role=Role.ADMIN, is_active=True)
+    claims = {"sub": str(user.id), "username": "jdoe", "role": "ADMIN"}
+
+    token = create_access_token(claims)
+    await store.revoke_user(str(user.id))
+    # Re-cached by a request carrying a newer token
+    cache.put(user, cache.now())
+
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_principal(_credentials(token))
+    assert exc.value.status_code == 401
+
+    fresh = create_access_token(claims)
+    assert await deps.get_current_principal(_credentials(fresh)) is user
+
+
+@pytest.mark.asyncio
+async def test_stateless_mode_rejects_invalid_token(stateless):
+    """Test malformed tokens are rejected before any lookup."""
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_principal(_credentials("not-a-token"))
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_rotation_and_reuse():
+    """Test refresh tokens are single-use and reuse is reported."""
+    store = InMemoryRefreshTokenStore()
+    await store.add("jti-1", "u1", "fam-1", ttl=60)
+
+    first = await store.consume("jti-1")
+    assert first.family_id == "fam-1"
+    assert not first.reused
+
+    replay = await store.consume("jti-1")
+    assert replay.reused
+
+    await store.revoke_family("fam-1")
+    assert await store.consume("jti-1") is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_bulk_revocation():
+    """Test revoking a user drops every session family."""
+    store = InMemoryRefreshTokenStore()
+    await store.add("a", "u1", "fam-a", ttl=60)
+    await store.add("b", "u1", "fam-b", ttl=60)
+    await store.add("c", "u2", "fam-c", ttl=60)
+
+    await store.revoke_user("u1")
+
+    assert await store.consume("a") is None
+    assert await store.consume("b") is None
+    assert await store.consume("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_access_tokens():
+    """Test access tokens cannot be used to refresh."""
+    token = create_access_token({"sub": "u1", "username": "jdoe", "role": "VIEWER"})
+
+    with pytest.raises(AuthenticationError):
+        await AuthService().refresh_tokens(token)
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_not_accepted_as_bearer(stateless):
+    """Test refresh tokens are rejected on authenticated endpoints."""
+    token = create_refresh_token({"sub": "u1", "username": "jdoe", "role": "ADMIN", "jti": "x", "fam": "y"})
+
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_principal(_credentials(token))
+    assert exc.value.status_code == 401
+
+
+def test_auth_store_follows_redis_url(monkeypatch):
+    """Test ``auto`` shares token state through Redis whenever REDIS_URL is set."""
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("AUTH_STORE_BACKEND", raising=False)
+    redis_url = "redis://redis:6379/0"
+
+    assert Settings(_env_file=None, jwt_secret_key="x").auth_store == "memory"
+    assert Settings(_env_file=None, jwt_secret_key="x", redis_url=redis_url).auth_store == "redis"
+    pinned = Settings(_env_file=None, jwt_secret_key="x", redis_url=redis_url, auth_store_backend="memory")
+    assert pinned.auth_store == "memory"
@@ -0,0 +1,121 @@
+"""Cache tests."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.principals import PrincipalCache
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expiry_and_counters():
+    """Test entries expire after the TTL and hits/misses are counted."""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, timer=clock)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    clock.now = 6
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_ttl_cache_lru_eviction():
+    """Test the least recently used entry is evicted when full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_principal_cache_invalidation():
+    """Test invalidating a user hides every cached copy of it."""
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    user = SimpleNamespace(id="u1", is_active=True)
+
+    assert cache.get("u1") is None
+    cache.put(user, cache.now())
+    assert cache.get("u1") is user
+
+    cache.invalidate("u1")
+    assert cache.get("u1") is None
+
+    cache.put(user, cache.now())
+    assert cache.get("u1") is user
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_principal_cache_skips_inactive_users():
+    """Test inactive users are never cached."""
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.put(SimpleNamespace(id="u2", is_active=False), cache.now())
+
+    assert cache.get("u2") is None
+
+
+def test_principal_read_racing_invalidation_not_cached():
+    """Test a user read before an invalidation is dropped instead of cached under the new state."""
+    now = [100.0]
+    cache = PrincipalCache(maxsize=10, ttl=60, timer=lambda: now[0])
+    stale = SimpleNamespace(id="u1", is_active=True)
+
+    read_at = cache.now()
+    now[0] += 1
+    cache.invalidate("u1")
+    now[0] += 1
+    cache.put(stale, read_at)
+    assert cache.get("u1") is None
+
+    # Marks are forgotten once no racing read could still be cached
+    now[0] += 61
+    cache.invalidate("u2")
+    assert list(cache._invalidated) == ["u2"]
+    cache.put(stale, read_at)
+    assert cache.get("u1") is None
+
+
+@pytest.mark.asyncio
+async def test_principal_cache_follows_shared_version(monkeypatch):
+    """Test a change published by another worker clears this worker's cache."""
+    version = [1]
+
+    async def get_version(scope):
+        return version[0]
+
+    monkeypatch.setattr("app.core.principals.get_version", get_version)
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    user = SimpleNamespace(id="u1", is_active=True)
+
+    await cache.check_version()
+    read_at = cache.now()
+    cache.put(user, read_at)
+    await cache.check_version()
+    assert cache.get("u1") is user
+
+    version[0] = 2
+    await cache.check_version()
+    assert cache.get("u1") is None
+    cache.put(user, read_at)
+    assert cache.get("u1") is None
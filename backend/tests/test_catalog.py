@@ -0,0 +1,258 @@
+"""Catalog cache tests."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import Response
+from httpx import ASGITransport, AsyncClient
+from pymongo.errors import BulkWriteError
+
+from app.api import deps
+from app.api.pagination import NEXT_CURSOR_HEADER, PageParams, paginate_items
+from app.api.v1 import controls as controls_api
+from app.api.v1.controls import control_changes
+from app.config import settings
+from app.core.revocation import InMemoryRevocationStore
+from app.core.security import create_access_token
+from app.main import app
+from app.models.control import Control, ImplementationStatus
+from app.models.standard import Standard
+from app.schemas.control import ControlUpdate
+from app.services.catalog import CatalogCache, catalog
+from app.services.dashboard_stats import dashboard_counters
+
+
+def make_control(standard_id, minutes, priority="HIGH", status=ImplementationStatus.NOT_IMPLEMENTED):
+    return Control.model_construct(
+        id=PydanticObjectId(),
+        standard=SimpleNamespace(ref=SimpleNamespace(id=standard_id)),
+        control_id=f"CTRL-{minutes}",
+        priority=priority,
+        implementation_status=status,
+        created_at=datetime(2024, 1, 1) + timedelta(minutes=minutes),
+    )
+
+
+@pytest.fixture
+def loaded_catalog():
+    cache = CatalogCache(check_interval=60)
+    ecc, ndmo = PydanticObjectId(), PydanticObjectId()
+    controls = [
+        make_control(ecc, 1),
+        make_control(ecc, 2, priority="LOW"),
+        make_control(ecc, 3, status=ImplementationStatus.IMPLEMENTED),
+        make_control(ndmo, 4),
+    ]
+    cache._standards = {
+        str(ecc): Standard.model_construct(id=ecc, category="cybersecurity", is_active=True, created_at=datetime(2024, 1, 1)),
+        str(ndmo): Standard.model_construct(id=ndmo, category="data_management", is_active=False, created_at=datetime(2024, 1, 2)),
+    }
+    cache._controls = {str(c.id): c for c in controls}
+    cache._reindex()
+    cache.version = 1
+    return cache, str(ecc), controls
+
+
+def test_filtered_controls_keep_newest_first_order(loaded_catalog):
+    """Test index lookups combine filters and keep the list order."""
+    cache, ecc, controls = loaded_catalog
+
+    assert cache.list_controls() == controls[::-1]
+    assert cache.list_controls(standard_id=ecc, priority="HIGH") == [controls[2], controls[0]]
+    assert cache.list_controls(status="IMPLEMENTED") == [controls[2]]
+    assert cache.list_controls(standard_id=str(PydanticObjectId())) == []
+    assert cache.controls_by_code("CTRL-2") == [controls[1]]
+    assert cache.get_control(str(controls[3].id)) is controls[3]
+
+
+def test_inactive_standards_hidden(loaded_catalog):
+    """Test only active standards are listed by default."""
+    cache, ecc, _ = loaded_catalog
+
+    assert [str(s.id) for s in cache.list_standards()] == [ecc]
+    assert cache.list_standards(category="data_management") == []
+
+
+def test_paginate_items_matches_cursor_semantics(loaded_catalog):
+    """Test in-memory pages follow X-Next-Cursor like database pages."""
+    cache, _, controls = loaded_catalog
+
+    first = Response()
+    page = paginate_items(cache.list_controls(), PageParams(cursor=None, limit=3, skip=0), first)
+    second = Response()
+    rest = paginate_items(
+        cache.list_controls(), PageParams(cursor=first.headers[NEXT_CURSOR_HEADER], limit=3, skip=0), second
+    )
+
+    assert page + rest == controls[::-1]
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_update_reindexes_control(loaded_catalog, monkeypatch):
+    """Test a saved control moves between status indexes and bumps the version."""
+    cache, _, controls = loaded_catalog
+
+    async def bump():
+        return 2
+
+    monkeypatch.setattr("app.services.catalog.bump_catalog_version", bump)
+
+    updated = controls[0].model_copy(update={"implementation_status": ImplementationStatus.IMPLEMENTED})
+    await cache.control_updated(updated)
+
+    assert cache.list_controls(status="IMPLEMENTED") == [controls[2], updated]
+    assert cache.version == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_bumps_version_once(loaded_catalog, monkeypatch):
+    """Test a bulk update reindexes every control with a single version bump."""
+    cache, _, controls = loaded_catalog
+    bumps = []
+
+    async def bump():
+        bumps.append(1)
+        return 2
+
+    monkeypatch.setattr("app.services.catalog.bump_catalog_version", bump)
+
+    updated = [
+        c.model_copy(update={"implementation_status": ImplementationStatus.IMPLEMENTED})
+        for c in controls[:2]
+    ]
+    await cache.controls_updated(updated)
+
+    assert cache.list_controls(status="IMPLEMENTED") == [controls[2], updated[1], updated[0]]
+    assert bumps == [1]
+    assert cache.version == 2
+
+
+def test_control_changes():
+    """Test only the requested fields are set and unknown statuses are rejected."""
+    assert control_changes(ControlUpdate(implementation_status="IMPLEMENTED")) == {
+        "implementation_status": ImplementationStatus.IMPLEMENTED
+    }
+    assert control_changes(ControlUpdate(implementation_notes="")) == {"implementation_notes": ""}
+    with pytest.raises(ValueError):
+        control_changes(ControlUpdate(implementation_status="DONE"))
+
+
+class FakeControls:
+    """Stand-in for the ``Control`` queries of the controls router."""
+
+    id = "_id"
+
+    def __init__(self, controls, failing=()):
+        self.controls = {c.id: c for c in controls}
+        self.failing = set(failing)
+        self.operations = []
+        self.found = []
+
+    def find(self, query):
+        self.found = [self.controls[i] for i in query["_id"]["$in"] if i in self.controls]
+        return self
+
+    async def to_list(self):
+        return self.found
+
+    def get_motor_collection(self):
+        return self
+
+    async def bulk_write(self, operations, ordered):
+        self.operations = operations
+        errors = [
+            {"index": index, "errmsg": "write failed"}
+            for index, op in enumerate(operations) if op._filter["_id"] in self.failing
+        ]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+@pytest.fixture
+def bulk_api(monkeypatch):
+    """Controls router on fake storage, with an ADMIN token checked from its claims."""
+    controls = [make_control(PydanticObjectId(), minutes) for minutes in range(4)]
+    storage = FakeControls(controls, failing=[controls[2].id])
+    applied, reindexed = [], []
+
+    async def apply(changes):
+        applied.append(changes)
+
+    async def controls_updated(updated):
+        reindexed.extend(updated)
+
+    monkeypatch.setattr(controls_api, "Control", storage)
+    monkeypatch.setattr(dashboard_counters, "apply", apply)
+    monkeypatch.setattr(catalog, "controls_updated", controls_updated)
+    monkeypatch.setattr(settings, "auth_stateless_roles", True)
+    monkeypatch.setattr(deps, "revocation_store", InMemoryRevocationStore(retention_seconds=3600))
+
+    token = create_access_token({"sub": "u1", "username": "admin", "role": "ADMIN"})
+    client = AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return client, controls, storage, applied, reindexed
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_reports_each_item(bulk_api):
+    """Test per-item results, one write per valid control, updated_at and counter deltas."""
+    client, controls, storage, applied, reindexed = bulk_api
+    c0, c1, c2, c3 = (str(c.id) for c in controls)
+    missing = str(PydanticObjectId())
+
+    async with client:
+        response = await client.patch("/api/v1/controls/bulk", json={"updates": [
+            {"id": c0, "implementation_status": "IMPLEMENTED"},
+            {"id": "not-an-id", "implementation_status": "IMPLEMENTED"},
+            {"id": c0, "implementation_notes": "again"},
+            {"id": c1, "implementation_status": "DONE"},
+            {"id": missing, "implementation_status": "IMPLEMENTED"},
+            {"id": c2, "implementation_status": "PARTIALLY_IMPLEMENTED"},
+            {"id": c3, "implementation_notes": "Reviewed"},
+        ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == [
+        "updated", "invalid", "invalid", "invalid", "not_found", "failed", "updated",
+    ]
+    assert body["results"][2]["detail"] == "Duplicate control id in request"
+    assert body["results"][5]["detail"] == "write failed"
+    assert (body["updated"], body["failed"]) == (2, 5)
+
+    # c0, c2 and c3 were written; every $set carries the same updated_at
+    updates = [op._doc["$set"] for op in storage.operations]
+    assert [op._filter["_id"] for op in storage.operations] == [controls[0].id, controls[2].id, controls[3].id]
+    assert updates[0]["implementation_status"] == "IMPLEMENTED"
+    assert updates[2] == {"implementation_notes": "Reviewed", "updated_at": updates[0]["updated_at"]}
+
+    assert reindexed == [controls[0], controls[3]]
+    assert all(c.updated_at == updates[0]["updated_at"] for c in reindexed)
+    assert controls[2].implementation_status == ImplementationStatus.NOT_IMPLEMENTED
+
+    # The failed and notes-only changes leave the counters alone
+    assert applied == [{
+        "controls.by_status.NOT_IMPLEMENTED": -1,
+        "controls.by_status.IMPLEMENTED": 1,
+    }]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_without_valid_items_writes_nothing(bulk_api):
+    """Test a request with only invalid items skips the write, counters and catalog."""
+    client, _, storage, applied, reindexed = bulk_api
+
+    async with client:
+        response = await client.patch("/api/v1/controls/bulk", json={"updates": [
+            {"id": "bad", "implementation_status": "IMPLEMENTED"},
+        ]})
+
+    assert response.json()["updated"] == 0
+    assert storage.operations == []
+    assert applied == [] and reindexed == []
@@ -0,0 +1,93 @@
+"""Compliance rollup tests."""
+
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+from app.api.v1.dashboard import ComplianceRollup
+from app.services.compliance import ComplianceRollupCache, build_rollup
+
+ECC, NDMO = ObjectId(), ObjectId()
+
+
+def group(standard, domain, priority, status, count):
+    return {
+        "_id": {"standard": standard, "domain_en": domain, "domain_ar": f"{domain} (ar)",
+                "priority": priority, "status": status},
+        "count": count,
+    }
+
+
+GROUPS = [
+    group(ECC, "Governance", "CRITICAL", "IMPLEMENTED", 2),
+    group(ECC, "Governance", "LOW", "NOT_IMPLEMENTED", 2),
+    group(ECC, "Defense", "HIGH", "PARTIALLY_IMPLEMENTED", 1),
+    group(ECC, "Defense", "HIGH", "NOT_APPLICABLE", 3),
+    group(NDMO, "Privacy", "MEDIUM", "IMPLEMENTED", 1),
+]
+STANDARDS = {
+    str(ECC): SimpleNamespace(code="NCA-ECC", name_en="Essential Cybersecurity Controls", name_ar="الضوابط"),
+    str(NDMO): SimpleNamespace(code="NDMO", name_en="Data Management", name_ar="إدارة البيانات"),
+}
+
+
+def test_rollup_matrix_and_weighting():
+    """Test counts roll up per domain and standard with priority weights."""
+    rollup = build_rollup(GROUPS, STANDARDS)
+    ecc = rollup["standards"][0]
+
+    assert [s["code"] for s in rollup["standards"]] == ["NCA-ECC", "NDMO"]
+    assert rollup["total_controls"] == 9
+    assert rollup["applicable_controls"] == 6
+    assert rollup["implemented_controls"] == 3
+
+    # 2 of 5 applicable ECC controls implemented; weighted (2*4 + 0.5*3) / (2*4 + 2*1 + 3)
+    assert ecc["compliance_percentage"] == 40.0
+    assert ecc["weighted_compliance_percentage"] == round(9.5 / 13 * 100, 1)
+
+    defense, governance = ecc["domains"]
+    assert defense["domain_en"] == "Defense"
+    assert defense["by_status"]["NOT_APPLICABLE"] == 3
+    assert defense["applicable_controls"] == 1
+    assert list(governance["by_priority"]) == ["CRITICAL", "LOW"]
+    assert governance["by_priority"]["LOW"]["NOT_IMPLEMENTED"] == 2
+
+    ComplianceRollup.model_validate(rollup)
+
+
+def test_unknown_standard_reported_by_id():
+    """Test groups of standards missing from the catalog are still counted."""
+    orphan = ObjectId()
+    rollup = build_rollup([group(orphan, "X", "HIGH", "IMPLEMENTED", 1)], {})
+
+    assert rollup["standards"][0]["standard_id"] == str(orphan)
+    assert rollup["standards"][0]["code"] is None
+
+
+@pytest.mark.asyncio
+async def test_cache_recomputes_per_version(monkeypatch):
+    """Test the aggregation runs once per catalog version and after invalidation."""
+    runs = []
+
+    class FakeCollection:
+        def aggregate(self, pipeline):
+            runs.append(pipeline)
+            return self
+
+        async def to_list(self, length=None):
+            return GROUPS
+
+    monkeypatch.setattr(
+        "app.services.compliance.Control.get_motor_collection", classmethod(lambda cls: FakeCollection())
+    )
+    cache = ComplianceRollupCache()
+
+    first = await cache.get(1, STANDARDS)
+    assert await cache.get(1, STANDARDS) is first
+    assert len(runs) == 1
+
+    await cache.get(2, STANDARDS)
+    cache.invalidate()
+    await cache.get(2, STANDARDS)
+    assert len(runs) == 3
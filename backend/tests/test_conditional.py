@@ -0,0 +1,72 @@
+"""Conditional GET tests."""
+
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+from httpx import ASGITransport, AsyncClient
+
+from app.api.conditional import etag_matches
+from app.api.deps import get_current_principal
+from app.main import app
+from app.models.standard import Standard
+from app.services.catalog import catalog
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('"xyz"', False),
+        ("*", True),
+    ],
+)
+def test_etag_matching(header, expected):
+    """Test If-None-Match lists, weak tags and wildcards."""
+    assert etag_matches(header, '"abc"') is expected
+
+
+@pytest.fixture
+def catalog_client(monkeypatch):
+    standard = Standard.model_construct(
+        id=PydanticObjectId(),
+        code="NCA-ECC",
+        name_en="Essential Cybersecurity Controls",
+        name_ar="الضوابط الأساسية للأمن السيبراني",
+        version="2.0",
+        category="cybersecurity",
+        is_active=True,
+        created_at=datetime(2024, 1, 1),
+    )
+    monkeypatch.setattr(catalog, "_standards", {str(standard.id): standard})
+    monkeypatch.setattr(catalog, "_standards_sorted", [standard])
+    monkeypatch.setattr(catalog, "version", 7)
+    app.dependency_overrides[get_current_principal] = lambda: None
+    yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_catalog_returns_304(catalog_client):
+    """Test a matching ETag gets 304 until the catalog version changes."""
+    async with catalog_client as client:
+        first = await client.get("/api/v1/standards/")
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "private, no-cache"
+        etag = first.headers["etag"]
+
+        cached = await client.get("/api/v1/standards/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        other_query = await client.get("/api/v1/standards/?limit=5", headers={"If-None-Match": etag})
+        assert other_query.status_code == 200
+
+        catalog.version = 8
+        changed = await client.get("/api/v1/standards/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
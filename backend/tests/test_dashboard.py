@@ -0,0 +1,144 @@
+"""Dashboard statistics tests."""
+
+import pytest
+
+from app.api.v1.dashboard import build_summary
+from app.models.control import Control, ImplementationStatus
+from app.models.dashboard_stats import DashboardStats
+from app.models.risk import Risk, RiskLevel
+from app.services.dashboard_stats import (
+    BREAKDOWNS,
+    STATS_NAME,
+    DashboardCounters,
+    counter_changes,
+    facet_pipeline,
+    parse_facets,
+    snapshot,
+)
+
+
+def test_facet_pipeline_groups_every_breakdown():
+    """Test one $facet stage covers all breakdowns of a collection."""
+    pipeline = facet_pipeline(BREAKDOWNS[Control])
+
+    assert len(pipeline) == 1
+    assert pipeline[0]["$facet"]["by_status"] == [
+        {"$group": {"_id": "$implementation_status", "count": {"$sum": 1}}}
+    ]
+    assert set(pipeline[0]["$facet"]) == {"by_status", "by_priority"}
+
+
+def test_summary_from_breakdowns():
+    """Test headline numbers are derived from the breakdowns, with zeros filled in."""
+    stats = {
+        "controls": parse_facets(
+            {
+                "by_status": [{"_id": "IMPLEMENTED", "count": 3}, {"_id": "NOT_IMPLEMENTED", "count": 5}],
+                "by_priority": [{"_id": "HIGH", "count": 8}],
+            },
+            BREAKDOWNS[Control],
+        ),
+        "risks": {
+            "by_status": {"OPEN": 4, "MONITORING": 1, "CLOSED": 2},
+            "by_level": {"VERY_LOW": 0, "LOW": 2, "MEDIUM": 2, "HIGH": 1, "CRITICAL": 2},
+        },
+        "audits": {"by_status": {"PLANNED": 1, "IN_PROGRESS": 2, "COMPLETED": 3, "CLOSED": 0}},
+        "findings": {
+            "by_status": {"OPEN": 2, "IN_PROGRESS": 1, "RESOLVED": 5, "CLOSED": 0},
+            "by_severity": {"OBSERVATION": 3, "MINOR": 3, "MAJOR": 2, "CRITICAL": 0},
+        },
+    }
+
+    summary = build_summary(stats)
+
+    assert summary.total_controls == 8
+    assert summary.implemented_controls == 3
+    assert summary.compliance_percentage == 37.5
+    assert summary.controls_by_status["NOT_APPLICABLE"] == 0
+    assert summary.controls_by_priority == {"LOW": 0, "MEDIUM": 0, "HIGH": 8, "CRITICAL": 0}
+    assert summary.total_risks == 7
+    assert summary.open_risks == 4
+    assert summary.critical_risks == 2
+    assert summary.total_audits == 6
+    assert summary.active_audits == 3
+    assert summary.open_findings == 3
+
+
+def test_counter_changes_for_new_and_updated_documents():
+    """Test creates increment every breakdown and updates move only changed values."""
+    risk = Risk.model_construct(status="OPEN", risk_level=RiskLevel.HIGH)
+
+    assert counter_changes(risk) == {"risks.by_status.OPEN": 1, "risks.by_level.HIGH": 1}
+
+    before = snapshot(risk)
+    risk.status = "CLOSED"
+
+    assert counter_changes(risk, before) == {
+        "risks.by_status.OPEN": -1,
+        "risks.by_status.CLOSED": 1,
+    }
+    assert counter_changes(risk, snapshot(risk)) == {}
+
+
+@pytest.mark.asyncio
+async def test_counters_track_writes_and_reconcile_drift(db):
+    """Test $inc updates keep the counters current and reconciliation fixes drift."""
+    counters = DashboardCounters(reconcile_interval=60)
+    assert (await counters.read())["controls"]["by_status"]["IMPLEMENTED"] == 0
+
+    control = Control.model_construct(
+        implementation_status=ImplementationStatus.NOT_IMPLEMENTED, priority="HIGH"
+    )
+    await counters.record(control)
+    before = snapshot(control)
+    control.implementation_status = ImplementationStatus.IMPLEMENTED
+    await counters.record(control, before)
+
+    stats = await counters.read()
+    assert stats["controls"]["by_status"]["IMPLEMENTED"] == 1
+    assert stats["controls"]["by_status"]["NOT_IMPLEMENTED"] == 0
+    assert stats["controls"]["by_priority"]["HIGH"] == 1
+
+    # Nothing was actually stored, so a recount brings the counters back to zero
+    await counters.reconcile()
+    stored = await DashboardStats.find_one(DashboardStats.name == STATS_NAME)
+    assert stored.controls["by_status"]["IMPLEMENTED"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reconcile_keeps_concurrent_increments(db, monkeypatch):
+    """Test a recount that raced a write is discarded and taken again."""
+    from app.services import dashboard_stats
+
+    counters = DashboardCounters(reconcile_interval=60)
+    await counters.reconcile()
+    recount = dashboard_stats.compute_stats
+    calls = 0
+
+    async def compute_with_write():
+        nonlocal calls
+        calls += 1
+        stats = await recount()
+        if calls == 1:
+            # A write path updates the counters while the collections are recounted
+            await counters.apply({"risks.by_level.HIGH": 1})
+        return stats
+
+    monkeypatch.setattr(dashboard_stats, "compute_stats", compute_with_write)
+    await counters.reconcile()
+
+    assert calls == 2
+    stored = await DashboardStats.find_one(DashboardStats.name == STATS_NAME)
+    assert stored.version == 2
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_lease_is_taken_once_per_interval(db):
+    """Test only one worker reconciles per interval."""
+    first = DashboardCounters(reconcile_interval=60)
+    second = DashboardCounters(reconcile_interval=60)
+    second.owner = "other-worker"
+    await first.read()
+
+    assert await first._acquire_lease()
+    assert not await second._acquire_lease()
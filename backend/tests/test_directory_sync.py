@@ -0,0 +1,139 @@
+"""Directory sync tests against ldap3's mock strategy."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from ldap3 import Server, Connection, MOCK_SYNC, OFFLINE_AD_2012_R2
+
+from app.models.user import User, Role
+from app.services.directory_sync import DirectorySyncService
+from app.services.ldap_backend import LDAPBackend
+
+SERVICE_DN = "cn=svc,dc=example,dc=com"
+USERS_BASE = "ou=users,dc=example,dc=com"
+
+
+@pytest.fixture
+def backend():
+    """Mock directory with a service account and seven users."""
+    server = Server("mock-ad", get_info=OFFLINE_AD_2012_R2)
+    seed = Connection(server, user=SERVICE_DN, password="svc-pass", client_strategy=MOCK_SYNC)
+    seed.strategy.add_entry(SERVICE_DN, {"userPassword": "svc-pass"})
+    for i in range(7):
+        seed.strategy.add_entry(f"cn=user{i},{USERS_BASE}", {
+            "sAMAccountName": f"user{i}",
+            "cn": f"User {i}",
+            "mail": f"user{i}@example.com",
+            "memberOf": ["cn=Auditors,ou=groups,dc=example,dc=com"] if i % 2 else [],
+            "uSNChanged": 100 + i,
+            "objectClass": "person",
+        })
+
+    backend = LDAPBackend(
+        bind_dn=SERVICE_DN,
+        bind_password="svc-pass",
+        search_base=USERS_BASE,
+        pool_size=1,
+        server=server,
+        client_strategy=MOCK_SYNC,
+    )
+    yield backend
+    backend.close()
+
+
+def _service(backend, page_size=3):
+    return DirectorySyncService(
+        backend=backend,
+        page_size=page_size,
+        interval=60,
+        watermark_attribute="uSNChanged",
+        username_attribute="sAMAccountName",
+    )
+
+
+@pytest.mark.asyncio
+async def test_paged_search_yields_bounded_pages(backend):
+    """Test the directory is read in pages no larger than the page size."""
+    service = _service(backend)
+    pages = [
+        page async for page in backend.paged_search(
+            service.build_filter(None), service.attributes, page_size=3
+        )
+    ]
+
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert backend._pool.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_filter(backend):
+    """Test only entries at or after the watermark are returned."""
+    service = _service(backend)
+    entries = [
+        entry
+        async for page in backend.paged_search(service.build_filter("104"), service.attributes, 10)
+        for entry in page
+    ]
+
+    assert sorted(e["sAMAccountName"] for e in entries) == ["user4", "user5", "user6"]
+    assert max(int(service.watermark_of(e)) for e in entries) == 106
+
+
+def test_timestamp_watermark_format():
+    """Test modifyTimestamp values are rendered as LDAP generalized time."""
+    service = DirectorySyncService(watermark_attribute="modifyTimestamp")
+    entry = {"modifyTimestamp": datetime(2024, 3, 1, 8, 30, 0, tzinfo=timezone.utc)}
+
+    assert service.watermark_of(entry) == "20240301083000.0Z"
+    assert service.build_filter("20240301083000.0Z") == (
+        "(&(objectClass=person)(modifyTimestamp>=20240301083000.0Z))"
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_upserts_users(db, backend):
+    """Test a full pass creates users and a second pass changes nothing."""
+    service = _service(backend)
+
+    stats = await service.sync_once()
+    assert stats["created"] == 7
+    assert await User.find(User.is_ldap_user == True).count() == 7
+    auditor = await User.find_one(User.username == "user1")
+    assert auditor.role == Role.AUDITOR
+
+    stats = await service.sync_once()
+    assert stats["seen"] == 1  # Only the watermark entry itself is re-read
+    assert stats["unchanged"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pass_stops_when_lease_is_lost(backend, monkeypatch):
+    """Test a pass whose lease was taken over stops and keeps the old watermark."""
+    from app.models.sync_state import DirectorySyncState
+
+    class StateCollection:
+        def __init__(self):
+            self.released = None
+
+        async def find_one_and_update(self, *args, **kwargs):
+            return {"name": "ldap-users", "watermark": None}
+
+        async def update_one(self, criteria, update):
+            if "watermark" in update["$set"]:
+                self.released = update["$set"]
+            # Renewals fail: another worker took the lease over
+            return SimpleNamespace(matched_count=0)
+
+    state = StateCollection()
+    monkeypatch.setattr(DirectorySyncState, "get_motor_collection", classmethod(lambda cls: state))
+    service = _service(backend)
+
+    async def upsert_users(users, stats):
+        stats["created"] += len(users)
+
+    monkeypatch.setattr(service, "upsert_users", upsert_users)
+
+    stats = await service.sync_once()
+    assert stats["seen"] == 3
+    assert state.released["watermark"] is None
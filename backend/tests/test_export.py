@@ -0,0 +1,156 @@
+"""Streaming export tests."""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+from bson import DBRef
+
+from app.api.export import EXPORT_SORT, csv_value, export_rows, stream_export
+from app.api.v1 import risks as risks_api
+from app.api.v1.risks import risk_serializer
+from app.models.risk import Risk, RiskLevel
+
+
+class FakeCursor:
+    """Async cursor over an in-memory list that records how it was built."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.closed = False
+        self.calls = {}
+
+    def find(self, criteria, projection):
+        self.calls["find"] = (criteria, projection)
+        since = criteria.get("updated_at", {}).get("$gte")
+        if since is not None:
+            self.docs = [doc for doc in self.docs if doc["updated_at"] >= since]
+        return self
+
+    def sort(self, key):
+        self.calls["sort"] = key
+        return self
+
+    def batch_size(self, n):
+        self.calls["batch_size"] = n
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+    async def close(self):
+        self.closed = True
+
+
+def make_risk_bson(n):
+    return {
+        "_id": PydanticObjectId(),
+        "risk_id": f"RISK-2024-{n:04d}",
+        "title_en": f"Risk {n}, with comma",
+        "title_ar": "مخاطرة",
+        "risk_level": "HIGH",
+        "owner": DBRef("users", PydanticObjectId()),
+        "treatment_plan": None,
+        "updated_at": datetime(2024, 1, n),
+    }
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_writes_one_chunk_per_batch():
+    """Test documents are written as JSON lines, batch by batch, and the cursor is closed."""
+    cursor = FakeCursor([make_risk_bson(n) for n in range(1, 6)])
+    serializer = risk_serializer.select(["risk_id", "owner_id"]).extend("updated_at")
+
+    chunks = await collect(export_rows(cursor, serializer, "ndjson", batch_size=2))
+    lines = b"".join(chunks).decode().splitlines()
+
+    assert len(chunks) == 3
+    assert [json.loads(line)["risk_id"] for line in lines] == [f"RISK-2024-000{n}" for n in range(1, 6)]
+    assert json.loads(lines[0])["owner_id"] == str(cursor.docs[0]["owner"].id)
+    assert json.loads(lines[0])["updated_at"] == "2024-01-01T00:00:00"
+    assert cursor.closed
+
+
+@pytest.mark.asyncio
+async def test_csv_export_has_header_and_quoting():
+    """Test CSV output starts with a BOM and header and quotes cells as needed."""
+    cursor = FakeCursor([make_risk_bson(1)])
+    serializer = risk_serializer.select(["risk_id", "title_en", "title_ar", "treatment_plan"])
+
+    text = b"".join(await collect(export_rows(cursor, serializer, "csv", batch_size=10))).decode("utf-8")
+
+    assert text.startswith("﻿")
+    rows = list(csv.reader(io.StringIO(text.lstrip("﻿"))))
+    assert rows[0] == ["id", "risk_id", "title_en", "title_ar", "treatment_plan"]
+    assert rows[1][1:] == ["RISK-2024-0001", "Risk 1, with comma", "مخاطرة", ""]
+
+
+def test_stream_export_filters_and_sorts_for_resume():
+    """Test updated_since narrows the query and the export is ordered for resuming."""
+    collection = FakeCursor([])
+    since = datetime(2024, 6, 1)
+
+    response = stream_export(collection, {"status": "OPEN"}, risk_serializer, "csv", "risks", since)
+
+    criteria, projection = collection.calls["find"]
+    assert criteria == {"status": "OPEN", "updated_at": {"$gte": since}}
+    assert projection["updated_at"] == 1 and projection["owner"] == 1
+    assert collection.calls["sort"] == EXPORT_SORT
+    assert response.media_type.startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="risks-')
+
+
+def test_csv_cells_cannot_start_formulas():
+    """Test text cells that a spreadsheet would evaluate are prefixed with a quote."""
+    for text in ("=HYPERLINK(\"http://x\")", "+1", "-2+3", "@SUM(A1)", "\tcmd", "\rcmd"):
+        assert csv_value(text) == "'" + text
+    assert csv_value("Phishing - email") == "Phishing - email"
+    assert csv_value(-5) == "-5"
+    assert csv_value(["=a", "b"]) == "'=a; b"
+
+
+@pytest.mark.asyncio
+async def test_incremental_export_sees_soft_delete(monkeypatch):
+    """Test closing a risk moves its updated_at, so an export resumed after that includes it."""
+    risk = Risk.model_construct(
+        id=PydanticObjectId(),
+        risk_id="RISK-2024-0001",
+        status="OPEN",
+        risk_level=RiskLevel.HIGH,
+        updated_at=datetime(2024, 1, 1),
+    )
+    saved = []
+
+    async def get(cls, risk_id):
+        return risk
+
+    async def save(self):
+        saved.append({"_id": self.id, "risk_id": self.risk_id, "status": self.status, "updated_at": self.updated_at})
+
+    async def noop(*args):
+        return None
+
+    monkeypatch.setattr(Risk, "get", classmethod(get))
+    monkeypatch.setattr(Risk, "save", save)
+    monkeypatch.setattr(risks_api.dashboard_counters, "record", noop)
+    monkeypatch.setattr(risks_api, "bump_version", noop)
+
+    since = datetime.utcnow()
+    await risks_api.delete_risk(str(risk.id))
+
+    serializer = risk_serializer.select(["risk_id", "status"])
+    response = stream_export(FakeCursor(saved), {}, serializer, "ndjson", "risks", since)
+    lines = b"".join([chunk async for chunk in response.body_iterator]).decode().splitlines()
+
+    assert [json.loads(line)["status"] for line in lines] == ["CLOSED"]
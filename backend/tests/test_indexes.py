@@ -0,0 +1,150 @@
+"""Index coverage tests: every query the API runs must be served by an index.
+
+Each entry mirrors the filter and sort of a query in ``app/api/v1`` or
+``app/services``. The test seeds documents of which only some match each
+filter, runs ``explain()`` and fails on a collection scan, on an in-memory
+sort for sorted queries, or when more index keys are examined than
+documents returned (an index walked end to end with a filter).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from bson import DBRef, ObjectId
+
+from app.api.export import EXPORT_SORT
+from app.api.pagination import SORT_KEY, encode_cursor, keyset_filter
+from app.models.audit import Audit
+from app.models.control import Control
+from app.models.counter import Counter
+from app.models.dashboard_stats import DashboardStats
+from app.models.nonconformity import NonConformity
+from app.models.risk import Risk
+from app.models.user import User
+
+USER = ObjectId()
+STANDARD = ObjectId()
+AUDIT = ObjectId()
+OTHER = ObjectId()
+# Index keys examined beyond the documents returned (range ends, $in values)
+KEY_SLACK = 2
+SINCE = datetime(2024, 1, 1)
+CURSOR = encode_cursor(datetime(2024, 6, 1), ObjectId())
+
+# (name, model, filter, sort)
+QUERIES = [
+    ("list_risks", Risk, {}, SORT_KEY),
+    ("list_risks next page", Risk, keyset_filter(CURSOR), SORT_KEY),
+    ("list_risks?status", Risk, {"status": "OPEN"}, SORT_KEY),
+    ("list_risks?risk_level", Risk, {"risk_level": "HIGH"}, SORT_KEY),
+    ("list_risks?treatment", Risk, {"treatment": "MITIGATE"}, SORT_KEY),
+    ("list_risks?owner_id", Risk, {"owner.$id": USER}, SORT_KEY),
+    ("export_risks", Risk, {"updated_at": {"$gte": SINCE}}, EXPORT_SORT),
+    ("risk id catch-up", Risk, {"risk_id": {"$regex": r"^RISK\-2024\-(\d+)$"}}, None),
+    ("export_controls", Control, {"standard.$id": STANDARD, "updated_at": {"$gte": SINCE}}, EXPORT_SORT),
+    (
+        "controls by standard, priority and status",
+        Control,
+        {"standard.$id": STANDARD, "priority": "HIGH", "implementation_status": "IMPLEMENTED"},
+        SORT_KEY,
+    ),
+    ("bulk_update_controls", Control, {"_id": {"$in": [ObjectId()]}}, None),
+    ("list_audits?status", Audit, {"status": "PLANNED"}, SORT_KEY),
+    ("list_audits?lead_auditor_id", Audit, {"lead_auditor.$id": USER}, SORT_KEY),
+    ("list_audit_findings", NonConformity, {"audit.$id": AUDIT}, SORT_KEY),
+    ("list_audit_findings?severity", NonConformity, {"audit.$id": AUDIT, "severity": "MAJOR"}, SORT_KEY),
+    ("export_findings", NonConformity, {"updated_at": {"$gte": SINCE}}, EXPORT_SORT),
+    ("export_findings?audit_id", NonConformity, {"audit.$id": AUDIT}, EXPORT_SORT),
+    ("list_users?role", User, {"role": "ADMIN"}, SORT_KEY),
+    ("list_users?is_active", User, {"is_active": True}, SORT_KEY),
+    ("login", User, {"username": "user-1"}, None),
+    ("directory sync", User, {"username": {"$in": ["user-1", "user-2"]}}, None),
+    ("import owner lookup", User, {"_id": {"$in": [USER]}}, None),
+    ("version counters", Counter, {"name": "version:risks"}, None),
+    ("dashboard counters", DashboardStats, {"name": "global"}, None),
+]
+
+
+def plan_stages(plan) -> list:
+    """All stage names in an explain plan, at any depth."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+def seed_docs(n: int = 20) -> dict:
+    """Documents alternating between the values the queries filter on and others."""
+    now = datetime(2024, 1, 1)
+    rows = [
+        {"created_at": now + timedelta(hours=i), "updated_at": now + timedelta(hours=i), "match": i % 2 == 0}
+        for i in range(n)
+    ]
+
+    def pick(row, matching, other):
+        return matching if row["match"] else other
+
+    docs = {
+        Risk: [
+            {**row, "risk_id": f"RISK-2024-{i:04d}", "status": pick(row, "OPEN", "CLOSED"),
+             "risk_level": pick(row, "HIGH", "LOW"), "treatment": pick(row, "MITIGATE", "ACCEPT"),
+             "owner": DBRef("users", pick(row, USER, OTHER))}
+            for i, row in enumerate(rows)
+        ],
+        Control: [
+            {**row, "control_id": f"CTRL-{i}", "standard": DBRef("standards", pick(row, STANDARD, OTHER)),
+             "priority": pick(row, "HIGH", "LOW"),
+             "implementation_status": pick(row, "IMPLEMENTED", "NOT_IMPLEMENTED")}
+            for i, row in enumerate(rows)
+        ],
+        Audit: [
+            {**row, "audit_id": f"AUD-2024-{i:04d}", "status": pick(row, "PLANNED", "COMPLETED"),
+             "lead_auditor": DBRef("users", pick(row, USER, OTHER))}
+            for i, row in enumerate(rows)
+        ],
+        NonConformity: [
+            {**row, "audit": DBRef("audits", pick(row, AUDIT, OTHER)), "status": "OPEN",
+             "severity": pick(row, "MAJOR", "MINOR")}
+            for row in rows
+        ],
+        User: [
+            {**row, "username": f"user-{i}", "email": f"user-{i}@example.com",
+             "role": pick(row, "ADMIN", "VIEWER"), "is_active": row["match"]}
+            for i, row in enumerate(rows)
+        ],
+        Counter: [{"name": f"version:scope-{i}", "value": i} for i in range(n)],
+        DashboardStats: [{"name": "global"}],
+    }
+    for model_docs in docs.values():
+        for doc in model_docs:
+            doc.pop("match", None)
+    return docs
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name,model,criteria,sort", QUERIES, ids=[q[0] for q in QUERIES])
+async def test_query_uses_index(db, name, model, criteria, sort):
+    """Test the query is answered from an index, including its sort order."""
+    for seeded_model, docs in seed_docs().items():
+        await seeded_model.get_motor_collection().insert_many(docs)
+
+    cursor = model.get_motor_collection().find(criteria)
+    if sort:
+        cursor = cursor.sort(sort).limit(51)
+    explain = await cursor.explain()
+    stages = plan_stages(explain["queryPlanner"]["winningPlan"])
+    stats = explain["executionStats"]
+
+    assert "COLLSCAN" not in stages, f"{name} scans {model.Settings.name}: {stages}"
+    if sort:
+        assert "SORT" not in stages, f"{name} sorts {model.Settings.name} in memory: {stages}"
+    assert stats["totalKeysExamined"] <= stats["nReturned"] + KEY_SLACK, (
+        f"{name} examines {stats['totalKeysExamined']} index keys for {stats['nReturned']} "
+        f"{model.Settings.name}: no index leads with its filter"
+    )
@@ -0,0 +1,202 @@
+"""LDAP backend tests against ldap3's mock strategy."""
+
+import asyncio
+import time
+
+import pytest
+from ldap3 import Server, Connection, MOCK_SYNC, OFFLINE_AD_2012_R2
+from ldap3.core.exceptions import LDAPSessionTerminatedByServerError
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.exceptions import LDAPConnectionError, NotFoundError
+from app.services.auth_service import AuthService
+from app.services.ldap_backend import LDAPBackend
+from app.models.user import Role
+
+SERVICE_DN = "cn=svc,dc=example,dc=com"
+USERS_BASE = "ou=users,dc=example,dc=com"
+
+
+@pytest.fixture
+def ldap_server():
+    """Mock directory with a service account and one user."""
+    server = Server("mock-ad", get_info=OFFLINE_AD_2012_R2)
+    seed = Connection(server, user=SERVICE_DN, password="svc-pass", client_strategy=MOCK_SYNC)
+    seed.strategy.add_entry(SERVICE_DN, {"userPassword": "svc-pass", "objectClass": "person"})
+    seed.strategy.add_entry(f"cn=jdoe,{USERS_BASE}", {
+        "userPassword": "user-pass",
+        "sAMAccountName": "jdoe",
+        "cn": "John Doe",
+        "mail": "jdoe@example.com",
+        "memberOf": ["cn=Risk Officers,ou=groups,dc=example,dc=com"],
+        "objectClass": "person",
+    })
+    return server
+
+
+@pytest.fixture
+def backend(ldap_server):
+    backend = LDAPBackend(
+        bind_dn=SERVICE_DN,
+        bind_password="svc-pass",
+        search_base=USERS_BASE,
+        search_filter="(sAMAccountName={username})",
+        pool_size=2,
+        call_timeout=5,
+        server=ldap_server,
+        client_strategy=MOCK_SYNC,
+    )
+    yield backend
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_search_then_bind(backend):
+    """Test a valid user is found by the service account and then bound."""
+    entry = await backend.authenticate("jdoe", "user-pass")
+
+    assert entry["dn"] == f"cn=jdoe,{USERS_BASE}"
+    assert entry["mail"] == "jdoe@example.com"
+    assert entry["memberOf"] == ["cn=Risk Officers,ou=groups,dc=example,dc=com"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_credentials(backend):
+    """Test wrong and empty passwords are rejected."""
+    assert await backend.authenticate("jdoe", "wrong") is None
+    assert await backend.authenticate("jdoe", "") is None
+
+
+@pytest.mark.asyncio
+async def test_service_connection_is_reused(backend):
+    """Test the service-account connection goes back to the pool."""
+    await backend.authenticate("jdoe", "user-pass")
+    pooled = backend._pool.queue[0]
+
+    await backend.authenticate("jdoe", "user-pass")
+
+    assert backend._pool.qsize() == 1
+    assert backend._pool.queue[0] is pooled
+
+
+@pytest.mark.asyncio
+async def test_stale_pooled_connection_replaced(backend):
+    """Test a pooled connection dropped by the directory is replaced without failing the login."""
+    await backend.authenticate("jdoe", "user-pass")
+    stale = backend._pool.queue[0]
+
+    def dropped(*args, **kwargs):
+        raise LDAPSessionTerminatedByServerError("session terminated by server")
+
+    stale.search = dropped
+
+    entry = await backend.authenticate("jdoe", "user-pass")
+
+    assert entry["mail"] == "jdoe@example.com"
+    assert backend._pool.qsize() == 1
+    assert backend._pool.queue[0] is not stale
+    assert backend.breaker.stats()["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_service_account_bind_failure(ldap_server):
+    """Test a broken service account surfaces as a connection error."""
+    backend = LDAPBackend(
+        bind_dn=SERVICE_DN,
+        bind_password="wrong",
+        search_base=USERS_BASE,
+        search_filter="(sAMAccountName={username})",
+        pool_size=1,
+        server=ldap_server,
+        client_strategy=MOCK_SYNC,
+    )
+    try:
+        with pytest.raises(LDAPConnectionError):
+            await backend.authenticate("jdoe", "user-pass")
+    finally:
+        backend.close()
+
+
+def test_role_from_group_membership():
+    """Test roles are mapped from memberOf groups."""
+    service = AuthService()
+
+    assert service._determine_role_from_ldap(["CN=GRC Admins,DC=x"]) == Role.ADMIN
+    assert service._determine_role_from_ldap(["cn=Risk Officers,dc=x"]) == Role.RISK_OFFICER
+    assert service._determine_role_from_ldap(["cn=Internal Audit,dc=x"]) == Role.AUDITOR
+    assert service._determine_role_from_ldap([]) == Role.VIEWER
+
+
+@pytest.mark.asyncio
+async def test_unknown_user_raises_not_found(backend):
+    """Test the service-account search distinguishes unknown users."""
+    with pytest.raises(NotFoundError):
+        await backend.authenticate("nobody", "user-pass")
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_when_directory_is_down():
+    """Test repeated connection failures short-circuit further LDAP calls."""
+    backend = LDAPBackend(
+        server_url="ldap://127.0.0.1:1",
+        bind_dn=SERVICE_DN,
+        bind_password="svc-pass",
+        pool_size=1,
+        connect_timeout=0.5,
+        call_timeout=5,
+    )
+    backend.breaker.failure_threshold = 2
+    try:
+        for _ in range(2):
+            with pytest.raises(LDAPConnectionError):
+                await backend.authenticate("jdoe", "user-pass")
+
+        assert backend.breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(LDAPConnectionError, match="circuit open"):
+            await backend.authenticate("jdoe", "user-pass")
+        assert backend.breaker.stats()["rejected"] == 1
+    finally:
+        backend.close()
+
+
+def test_circuit_breaker_half_open_trial():
+    """Test the breaker lets one trial call through after the reset timeout."""
+    now = [0.0]
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, timer=lambda: now[0])
+
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    now[0] = 11
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_releases_half_open_breaker(backend):
+    """Test a trial call that is cancelled or fails unrelated to LDAP does not wedge the breaker."""
+    backend.breaker.failure_threshold = 1
+    backend.breaker.reset_timeout = 0
+    backend.breaker.record_failure()
+    assert backend.breaker.state == CircuitBreaker.HALF_OPEN
+
+    trial = asyncio.create_task(backend.run(time.sleep, 0.2))
+    await asyncio.sleep(0.05)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    def broken():
+        raise ValueError("bug")
+
+    with pytest.raises(ValueError):
+        await backend.run(broken)
+
+    entry = await backend.authenticate("jdoe", "user-pass")
+    assert entry["mail"] == "jdoe@example.com"
+    assert backend.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,169 @@
+"""Keyset pagination tests."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+from fastapi import HTTPException, Response
+
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    DEPRECATION_HEADER,
+    PageParams,
+    paginate,
+    paginate_items,
+    paginate_raw,
+)
+
+
+class FakeQuery:
+    """Stand-in for a Beanie FindMany query over an in-memory list."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.filters = []
+        self._limit = None
+
+    def find(self, criteria):
+        self.filters.append(criteria)
+        return self
+
+    def sort(self, key):
+        self.docs = sorted(self.docs, key=lambda d: (d.created_at, d.id), reverse=True)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    async def to_list(self):
+        docs = self.docs
+        for criteria in self.filters:
+            older, same_time = criteria["$or"]
+            created_at, doc_id = older["created_at"]["$lt"], same_time["_id"]["$lt"]
+            docs = [
+                d for d in docs
+                if d.created_at < created_at or (d.created_at == created_at and d.id < doc_id)
+            ]
+        return docs[:self._limit]
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes to the sort key it was built from."""
+    created_at = datetime(2024, 5, 1, 12, 30, 0, 123000)
+    doc_id = PydanticObjectId()
+
+    assert decode_cursor(encode_cursor(created_at, doc_id)) == (created_at, doc_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WyJ4IiwgInkiXQ", ""])
+def test_invalid_cursor_rejected(cursor):
+    """Test malformed cursors are rejected with 400."""
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_filter_breaks_ties_on_id():
+    """Test the range filter continues after the cursor's exact position."""
+    created_at = datetime(2024, 5, 1)
+    doc_id = PydanticObjectId()
+
+    assert keyset_filter(None) == {}
+    assert keyset_filter(encode_cursor(created_at, doc_id)) == {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}},
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_paginate_walks_all_pages():
+    """Test following X-Next-Cursor visits every document exactly once."""
+    base = datetime(2024, 1, 1)
+    # Pairs of documents share a timestamp to exercise the _id tie-break
+    docs = [
+        SimpleNamespace(id=PydanticObjectId(), created_at=base + timedelta(minutes=i // 2))
+        for i in range(7)
+    ]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = Response()
+        page = SimpleNamespace(cursor=cursor, limit=3, skip=0)
+        seen.extend(await paginate(FakeQuery(docs), page, response))
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert len(seen) == 7
+    assert {d.id for d in seen} == {d.id for d in docs}
+    assert [d.created_at for d in seen] == sorted((d.created_at for d in docs), reverse=True)
+
+
+class FakeCollection:
+    """Records the raw find() call and returns a fixed result."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def find(self, criteria, projection):
+        self.calls.append((criteria, projection))
+        return self
+
+    def sort(self, key):
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs[:self._limit]
+
+
+@pytest.mark.asyncio
+async def test_paginate_raw_combines_filters_and_projects_sort_key():
+    """Test raw pages keep the caller's filter, add the keyset range and the sort key."""
+    docs = [
+        {"_id": PydanticObjectId(), "created_at": datetime(2024, 1, 1) - timedelta(minutes=i)}
+        for i in range(3)
+    ]
+    collection = FakeCollection(docs)
+    response = Response()
+    cursor = encode_cursor(datetime(2024, 2, 1), PydanticObjectId())
+
+    page = await paginate_raw(
+        collection, {"status": "OPEN"}, {"_id": 1, "title_en": 1}, SimpleNamespace(cursor=cursor, limit=2, skip=0), response
+    )
+
+    criteria, projection = collection.calls[0]
+    assert criteria == {"$and": [{"status": "OPEN"}, keyset_filter(cursor)]}
+    assert projection == {"_id": 1, "title_en": 1, "created_at": 1}
+    assert page == docs[:2]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (docs[1]["created_at"], docs[1]["_id"])
+
+
+def test_deprecated_skip_offsets_first_page():
+    """Test the old skip offset still works, is flagged deprecated and excludes cursors."""
+    base = datetime(2024, 1, 1)
+    docs = [SimpleNamespace(id=PydanticObjectId(), created_at=base - timedelta(minutes=i)) for i in range(5)]
+    response = Response()
+
+    page = paginate_items(docs, PageParams(cursor=None, limit=2, skip=2), response)
+
+    assert page == docs[2:4]
+    assert response.headers[DEPRECATION_HEADER] == "true"
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (docs[3].created_at, docs[3].id)
+
+    with pytest.raises(HTTPException) as exc:
+        PageParams(cursor=response.headers[NEXT_CURSOR_HEADER], limit=2, skip=2)
+    assert exc.value.status_code == 400
@@ -0,0 +1,194 @@
+"""Bulk risk import tests."""
+
+import json
+
+import pytest
+
+from app.models.risk import Risk, RiskLevel
+from app.models.user import User, Role
+from app.services import risk_import
+from app.services.risk_import import (
+    detect_format,
+    import_risks,
+    iter_lines,
+    iter_records,
+    parse_row,
+)
+
+HEADER = "title_en,title_ar,description_en,description_ar,asset,threat,vulnerability,impact_score,likelihood_score,treatment,owner_id"
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def risk_row(owner_id, title="Phishing", impact=4, likelihood=5, treatment="MITIGATE"):
+    return {
+        "title_en": title,
+        "title_ar": "تصيد",
+        "description_en": "Credential phishing",
+        "description_ar": "تصيد بيانات الدخول",
+        "asset": "Email",
+        "threat": "External attacker",
+        "vulnerability": "User awareness",
+        "impact_score": impact,
+        "likelihood_score": likelihood,
+        "treatment": treatment,
+        "owner_id": owner_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_lines_survive_split_multibyte_characters():
+    """Test decoding across read boundaries, with a BOM and CRLF line endings."""
+    data = "﻿أ,ب\r\nline two\r\nlast".encode()
+
+    assert await collect(iter_lines(chunked(data, 3))) == ["أ,ب", "line two", "last"]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_keep_line_numbers():
+    """Test CSV rows map to the header, with quoted newlines and bad rows reported."""
+    lines = chunked(
+        f'{HEADER}\n'
+        f'"Multi\nline",t,d,d,a,t,v,3,3,MITIGATE,abc\n'
+        f'\n'
+        f'too,few\n'.encode(),
+        7,
+    )
+
+    records = await collect(iter_records(iter_lines(lines), "csv"))
+
+    assert records[0][0] == 2
+    assert records[0][1]["title_en"] == "Multi\nline"
+    assert records[0][1]["owner_id"] == "abc"
+    assert records[1] == (5, None, "Expected 11 columns, got 2")
+
+
+@pytest.mark.asyncio
+async def test_csv_literal_quote_in_unquoted_field():
+    """Test a quote inside an unquoted field (an inch mark) does not swallow later rows."""
+    rows = "".join(f"Risk {n},t,d,d,a,t,v,3,3,MITIGATE,abc\n" for n in range(2000))
+    lines = chunked(f'{HEADER}\nMonitor 27" screen,t,d,d,a,t,v,3,3,MITIGATE,abc\n{rows}'.encode(), 4096)
+
+    records = await collect(iter_records(iter_lines(lines), "csv"))
+
+    assert len(records) == 2001
+    assert all(error is None for _, _, error in records)
+    assert records[0][1]["title_en"] == 'Monitor 27" screen'
+    assert records[-1][0] == 2002
+    assert records[-1][1]["title_en"] == "Risk 1999"
+
+
+@pytest.mark.asyncio
+async def test_csv_unterminated_quote_reported_once():
+    """Test an opening quote that is never closed is one error at its first line."""
+    lines = chunked(f'{HEADER}\nok,t,d,d,a,t,v,3,3,MITIGATE,abc\n"open,t\nmore\nrows\n'.encode(), 5)
+
+    records = await collect(iter_records(iter_lines(lines), "csv"))
+
+    assert records[0][0] == 2
+    assert records[1] == (3, None, "Unterminated quoted field")
+
+
+@pytest.mark.asyncio
+async def test_partial_import_bumps_version(monkeypatch):
+    """Test rows committed before a failure still invalidate cached risk lists."""
+    bumps = []
+
+    async def noop(*args):
+        return None
+
+    async def import_chunk(chunk, report, year):
+        report.imported += len(chunk)
+
+    async def bump_version(scope):
+        bumps.append(scope)
+
+    async def records():
+        for row in range(1, 4):
+            yield row, {key: str(value) for key, value in risk_row("abc").items()}, None
+        raise ValueError("CSV file has no header row")
+
+    monkeypatch.setattr(risk_import.sequences, "catch_up", noop)
+    monkeypatch.setattr(risk_import, "_import_chunk", import_chunk)
+    monkeypatch.setattr(risk_import, "bump_version", bump_version)
+
+    with pytest.raises(ValueError):
+        await import_risks(records(), chunk_size=2)
+    assert bumps == ["risks"]
+
+
+@pytest.mark.asyncio
+async def test_jsonl_records_report_invalid_lines():
+    """Test JSON Lines parsing reports malformed lines and skips blank ones."""
+    lines = chunked(b'{"title_en": "A"}\n\nnot json\n[1]\n', 5)
+
+    records = await collect(iter_records(iter_lines(lines), "jsonl"))
+
+    assert records[0] == (1, {"title_en": "A"}, None)
+    assert records[1][0] == 3 and records[1][2].startswith("Invalid JSON")
+    assert records[2] == (4, None, "Expected a JSON object")
+
+
+@pytest.mark.asyncio
+async def test_csv_without_header_rejected():
+    """Test an empty CSV file is a file-level error."""
+    with pytest.raises(ValueError):
+        await collect(iter_records(iter_lines(chunked(b"\n", 10)), "csv"))
+
+
+def test_parse_row_treats_blank_cells_as_missing():
+    """Test CSV string cells validate against RiskCreate."""
+    row = {key: str(value) for key, value in risk_row("abc").items()}
+    row["treatment_plan"] = ""
+    row["review_date"] = ""
+
+    data = parse_row(row)
+
+    assert data.impact_score == 4
+    assert data.treatment_plan is None
+
+    with pytest.raises(ValueError, match="impact_score"):
+        parse_row({**row, "impact_score": "9"})
+    with pytest.raises(ValueError):
+        parse_row({**row, "treatment": "IGNORE"})
+
+
+def test_detect_format():
+    """Test the format follows the file extension."""
+    assert detect_format("register.CSV") == "csv"
+    assert detect_format("register.ndjson") == "jsonl"
+    assert detect_format("register.xlsx") is None
+
+
+@pytest.mark.asyncio
+async def test_import_inserts_valid_rows_in_chunks(db):
+    """Test valid rows are scored and numbered while failed rows are reported."""
+    owner = User(
+        username="owner",
+        email="owner@example.com",
+        full_name_en="Owner",
+        full_name_ar="المالك",
+        role=Role.RISK_OFFICER,
+    )
+    await owner.insert()
+
+    rows = [risk_row(str(owner.id), title=f"Risk {i}") for i in range(5)]
+    rows.insert(2, risk_row("0" * 24))
+    rows.insert(4, risk_row(str(owner.id), impact=0))
+    data = "\n".join(json.dumps(row) for row in rows).encode()
+
+    report = await import_risks(iter_records(iter_lines(chunked(data, 100)), "jsonl"), chunk_size=2)
+
+    assert (report.total, report.imported, report.failed) == (7, 5, 2)
+    assert [error["row"] for error in report.errors] == [3, 5]
+
+    risks = await Risk.find_all().to_list()
+    assert len({risk.risk_id for risk in risks}) == 5
+    assert all(risk.risk_score == 20 and risk.risk_level == RiskLevel.HIGH for risk in risks)
@@ -0,0 +1,109 @@
+"""Bilingual control search tests."""
+
+from types import SimpleNamespace
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.models.control import Control
+from app.services.search import ControlSearchIndex, analyze, normalize_arabic, stem_english
+
+
+def make_control(control_id, title_en, title_ar, description_en="", description_ar="", standard_id=None):
+    return Control.model_construct(
+        id=PydanticObjectId(),
+        standard=SimpleNamespace(ref=SimpleNamespace(id=standard_id or PydanticObjectId())),
+        control_id=control_id,
+        domain_en="Cybersecurity Defense",
+        domain_ar="تعزيز الأمن السيبراني",
+        title_en=title_en,
+        title_ar=title_ar,
+        description_en=description_en,
+        description_ar=description_ar,
+    )
+
+
+@pytest.fixture
+def controls():
+    return [
+        make_control(
+            "ECC-2-8", "Cryptography", "التشفير",
+            "Encryption of data at rest and in transit.", "تشفير البيانات المخزنة والمنقولة.",
+        ),
+        make_control(
+            "ECC-2-12", "Cybersecurity Event Logs", "سجلات الأحداث",
+            "Logging and monitoring of security events.", "تسجيل ومراقبة الأحداث الأمنية.",
+        ),
+        make_control(
+            "PDPL-3-1", "Personal Data Protection", "حماية البيانات الشخصية",
+            "Protect personal data processed by the organization.", "حماية البيانات الشخصية التي تعالجها الجهة.",
+        ),
+    ]
+
+
+def test_arabic_normalization():
+    """Test diacritics and tatweel are removed and letter variants folded."""
+    assert normalize_arabic("الأَمْنُ") == "الامن"
+    assert normalize_arabic("إدارة ـالمخاطر") == "اداره المخاطر"
+    assert analyze("الأمن") == analyze("أمن") == analyze("امن")
+    assert analyze("والمسؤوليات") == analyze("مسؤولية")
+    assert analyze("في البيانات") == analyze("بيانات")
+
+
+def test_english_stemming():
+    """Test inflections share a stem and stopwords are dropped."""
+    assert stem_english("encrypted") == stem_english("encryption") == stem_english("encrypt")
+    assert stem_english("policies") == stem_english("policy")
+    assert stem_english("logging") == stem_english("logs")
+    assert stem_english("access") == "access"
+    assert analyze("The Management of Assets") == [stem_english("management"), stem_english("assets")]
+    assert analyze("ECC-2-8") == ["ecc-2-8", "ecc"]
+
+
+def test_ranks_title_matches_first(controls):
+    """Test BM25 ranks a title match above description-only matches, in both languages."""
+    index = ControlSearchIndex()
+    index.sync(controls)
+
+    assert [doc_id for doc_id, _ in index.search("data protection")][0] == str(controls[2].id)
+    assert [doc_id for doc_id, _ in index.search("encrypting")] == [str(controls[0].id)]
+    assert index.search("تَشْفِير")[0][0] == str(controls[0].id)
+    assert index.search("ECC-2-12")[0][0] == str(controls[1].id)
+    assert index.search("nonexistent") == []
+
+
+def test_accept_filters_candidates(controls):
+    """Test ranking only considers accepted ids."""
+    index = ControlSearchIndex()
+    index.sync(controls)
+
+    hits = index.search("البيانات", accept=lambda doc_id: doc_id == str(controls[0].id))
+
+    assert [doc_id for doc_id, _ in hits] == [str(controls[0].id)]
+
+
+def test_incremental_updates(controls):
+    """Test changed text is re-indexed, unchanged controls are skipped and removed ones dropped."""
+    index = ControlSearchIndex()
+    assert index.sync(controls) == 3
+
+    renamed = controls[0].model_copy(update={"title_en": "Key Management", "implementation_notes": "x"})
+    status_only = controls[1].model_copy(update={"implementation_notes": "Reviewed"})
+
+    assert index.index(renamed)
+    assert not index.index(status_only)
+    assert index.search("key")[0][0] == str(renamed.id)
+    assert index.search("cryptography") == []
+
+    assert index.sync([renamed, status_only]) == 1
+    assert len(index) == 2
+    assert index.search("personal") == []
+
+
+def test_search_over_empty_text():
+    """Test a catalog without any indexed text returns no matches instead of failing."""
+    blank = make_control("", "", "").model_copy(update={"domain_en": "", "domain_ar": ""})
+    index = ControlSearchIndex()
+    index.sync([blank])
+
+    assert index.search("encryption") == []
@@ -0,0 +1,87 @@
+"""Password hashing executor tests."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.security import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip():
+    """Test hashing and verification run on the pool."""
+    hasher = PasswordHasher(max_workers=2, max_pending=4)
+    try:
+        hashed = await hasher.hash("s3cret-pass")
+
+        assert await hasher.verify("s3cret-pass", hashed)
+        assert not await hasher.verify("wrong-pass", hashed)
+        assert hasher.stats()["completed"] == 3
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_saturated():
+    """Test requests beyond the pending cap are rejected instead of queued."""
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    try:
+        slow = asyncio.create_task(hasher._run(time.sleep, 0.2))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(ServiceUnavailableError):
+            await hasher._run(time.sleep, 0)
+
+        await slow
+        stats = hasher.stats()
+        assert stats["rejected"] == 1
+        assert stats["pending"] == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_counts_cancelled_work_until_it_finishes():
+    """Test a cancelled request keeps its slot while its hash is still running."""
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    try:
+        request = asyncio.create_task(hasher._run(time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+        assert hasher.stats()["pending"] == 1
+        with pytest.raises(ServiceUnavailableError):
+            await hasher._run(time.sleep, 0)
+
+        await asyncio.sleep(0.3)
+        assert hasher.stats()["pending"] == 0
+        assert hasher.stats()["completed"] == 1
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_keeps_event_loop_free():
+    """Test the event loop keeps running while a hash is computed."""
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    try:
+        await hasher._run(time.sleep, 0.1)
+    finally:
+        task.cancel()
+        hasher.shutdown()
+
+    assert ticks > 5
+    assert hasher.stats()["queue_time_max"] >= 0.0
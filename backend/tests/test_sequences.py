@@ -0,0 +1,96 @@
+"""Sequence generator tests."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.models.risk import Risk, RiskTreatment
+from app.models.user import User, Role
+from app.services.sequences import SequenceGenerator, format_id
+
+
+class CountingGenerator(SequenceGenerator):
+    """Generator with an in-memory counter that records round-trips."""
+
+    def __init__(self, block_size):
+        super().__init__(block_size)
+        self.value = 0
+        self.round_trips = 0
+
+    async def reserve(self, prefix, count=1, year=None):
+        self.round_trips += 1
+        await asyncio.sleep(0)
+        self.value += count
+        return range(self.value - count + 1, self.value + 1)
+
+
+def test_format_id():
+    """Test IDs are zero-padded per prefix and year."""
+    assert format_id("RISK", 2024, 7) == "RISK-2024-0007"
+    assert format_id("AUD", 2025, 12345) == "AUD-2025-12345"
+
+
+@pytest.mark.asyncio
+async def test_block_allocation_mints_locally():
+    """Test pre-allocated blocks hand out unique IDs with one round-trip per block."""
+    generator = CountingGenerator(block_size=10)
+
+    ids = await asyncio.gather(*(generator.next_id("RISK", 2024) for _ in range(25)))
+
+    assert len(set(ids)) == 25
+    assert sorted(ids) == [format_id("RISK", 2024, n) for n in range(1, 26)]
+    assert generator.round_trips == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_are_unique(db):
+    """Test concurrent reservations never hand out the same number."""
+    generator = SequenceGenerator()
+
+    ids = await asyncio.gather(*(generator.next_id("RISK", 2024) for _ in range(50)))
+    block = await generator.reserve_ids("RISK", 100, 2024)
+
+    assert len(set(ids)) == 50
+    assert block[0] == "RISK-2024-0051"
+    assert block[-1] == "RISK-2024-0150"
+
+
+@pytest.mark.asyncio
+async def test_insert_retries_past_existing_ids(db):
+    """Test inserting catches the counter up when IDs already exist."""
+    generator = SequenceGenerator()
+    owner = User(
+        username="owner",
+        email="owner@example.com",
+        full_name_en="Owner",
+        full_name_ar="المالك",
+        role=Role.RISK_OFFICER,
+    )
+    await owner.insert()
+
+    def make_risk(risk_id=""):
+        risk = Risk(
+            risk_id=risk_id,
+            title_en="Risk",
+            title_ar="مخاطرة",
+            description_en="Description",
+            description_ar="وصف",
+            asset="Asset",
+            threat="Threat",
+            vulnerability="Vulnerability",
+            impact_score=2,
+            likelihood_score=2,
+            treatment=RiskTreatment.MITIGATE,
+            owner=owner,
+        )
+        risk.calculate_risk_score()
+        return risk
+
+    year = datetime.now().year
+    for n in range(1, 4):
+        await make_risk(format_id("RISK", year, n)).insert()
+
+    risk = await generator.insert_with_id(make_risk(), "risk_id", "RISK")
+
+    assert risk.risk_id == format_id("RISK", year, 4)
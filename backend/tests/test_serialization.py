@@ -0,0 +1,172 @@
+"""Fast-path serialization tests."""
+
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import DBRef, ObjectId
+from fastapi import HTTPException, Response
+
+from app.api.fields import get_language, localized, set_content_language, sparse_fields
+from app.core.serialization import ModelSerializer
+from app.main import app
+from app.models.nonconformity import NonConformity, NonConformityStatus, Severity
+from app.models.risk import Risk, RiskLevel, RiskTreatment
+from app.schemas.audit import NonConformityResponse
+from app.schemas.risk import RiskResponse
+
+risk_serializer = ModelSerializer(RiskResponse, owner_id="owner.$id")
+
+
+def risk_row():
+    return {
+        "_id": ObjectId(),
+        "risk_id": "RISK-2024-0001",
+        "title_en": "Data leak",
+        "title_ar": "تسريب البيانات",
+        "description_en": "Description",
+        "description_ar": "وصف",
+        "asset": "CRM",
+        "threat": "Insider",
+        "vulnerability": "Excessive access",
+        "impact_score": 4,
+        "likelihood_score": 5,
+        "risk_score": 20,
+        "risk_level": "HIGH",
+        "treatment": "MITIGATE",
+        "treatment_plan": None,
+        "status": "OPEN",
+        "owner": DBRef("users", ObjectId()),
+        "review_date": None,
+        "created_at": datetime(2024, 3, 1, 8, 30, 15, 250000),
+        "updated_at": datetime(2024, 3, 2),
+    }
+
+
+def test_documents_and_bson_match_response_model():
+    """Test both input kinds produce exactly what the response model would."""
+    row = risk_row()
+    fields = {k: v for k, v in row.items() if k not in ("_id", "owner")}
+    document = Risk.model_construct(
+        id=row["_id"],
+        owner=SimpleNamespace(ref=row["owner"]),
+        **{**fields, "risk_level": RiskLevel.HIGH, "treatment": RiskTreatment.MITIGATE},
+    )
+    expected = json.loads(RiskResponse(
+        **{**fields, "id": str(row["_id"]), "owner_id": str(row["owner"].id)}
+    ).model_dump_json())
+
+    assert json.loads(risk_serializer.dumps(document)) == expected
+    assert json.loads(risk_serializer.dumps(row)) == expected
+
+
+def test_optional_references_serialize_as_null():
+    """Test missing links become null instead of failing."""
+    serializer = ModelSerializer(
+        NonConformityResponse,
+        audit_id="audit.$id",
+        control_id="control.$id",
+        assigned_to_id="assigned_to.$id",
+    )
+    audit_id = ObjectId()
+    finding = NonConformity.model_construct(
+        id=ObjectId(),
+        audit=SimpleNamespace(ref=DBRef("audits", audit_id)),
+        control=None,
+        assigned_to=None,
+        finding="Missing MFA",
+        severity=Severity.MAJOR,
+        status=NonConformityStatus.OPEN,
+        corrective_action=None,
+        due_date=None,
+        resolution_notes=None,
+        resolved_at=None,
+        created_at=datetime(2024, 1, 1),
+    )
+
+    row = serializer.row(finding)
+
+    assert row["audit_id"] == str(audit_id)
+    assert row["control_id"] is None
+    assert row["severity"] == "MAJOR"
+
+
+def test_list_response_keeps_endpoint_headers():
+    """Test headers set on the sub-response (cursor, ETag) survive."""
+    sub_response = Response()
+    sub_response.headers["X-Next-Cursor"] = "abc"
+
+    response = risk_serializer.list_response([risk_row()], sub_response)
+
+    assert response.headers["x-next-cursor"] == "abc"
+    assert response.headers["content-type"] == "application/json"
+    assert len(json.loads(response.body)) == 1
+
+
+def test_openapi_schemas_unchanged():
+    """Test endpoints still document their response models."""
+    schema = app.openapi()
+    list_risks = schema["paths"]["/api/v1/risks/"]["get"]["responses"]["200"]
+    assert list_risks["content"]["application/json"]["schema"]["items"]["$ref"].endswith("/RiskResponse")
+
+
+def test_sparse_fields_project_only_requested_columns():
+    """Test ?fields= narrows both the MongoDB projection and the output."""
+    serializer = sparse_fields(risk_serializer, "risk_id, owner_id,title_en")
+
+    assert serializer.fields == ("id", "risk_id", "title_en", "owner_id")
+    assert serializer.projection() == {"_id": 1, "risk_id": 1, "title_en": 1, "owner": 1}
+    assert set(serializer.row(risk_row())) == {"id", "risk_id", "title_en", "owner_id"}
+    assert sparse_fields(risk_serializer, "title_en,risk_id,owner_id") is serializer
+    assert sparse_fields(risk_serializer, None) is risk_serializer
+
+
+def test_unknown_sparse_field_rejected():
+    """Test unknown field names are a 400, not silently ignored."""
+    with pytest.raises(HTTPException) as exc:
+        sparse_fields(risk_serializer, "risk_id,hashed_password")
+    assert exc.value.status_code == 400
+    assert "hashed_password" in exc.value.detail
+
+
+@pytest.mark.parametrize(
+    "lang,accept_language,expected",
+    [
+        (None, None, None),
+        ("ar", None, "ar"),
+        ("en", "ar", "en"),
+        (None, "ar", "ar"),
+        (None, "ar-SA", "ar"),
+        (None, "en-US,en;q=0.9,ar;q=0.8", None),
+        (None, "fr", None),
+    ],
+)
+def test_language_negotiation(lang, accept_language, expected):
+    """Test ?lang= wins and only a single-language Accept-Language is honoured."""
+    assert get_language(lang, accept_language) == expected
+
+
+def test_localized_serializer_drops_other_language():
+    """Test single-language mode projects and returns only that language."""
+    arabic = localized(sparse_fields(risk_serializer, "risk_id,title_en,title_ar"), "ar")
+
+    assert arabic.fields == ("id", "risk_id", "title_ar")
+    assert "title_en" not in arabic.projection()
+    assert localized(risk_serializer, None) is risk_serializer
+    assert "description_en" in localized(risk_serializer, "en").fields
+    assert "description_ar" not in localized(risk_serializer, "en").fields
+
+
+def test_language_responses_vary_on_accept_language():
+    """Test negotiated responses list Accept-Language in Vary, bilingual or not, without duplicates."""
+    bilingual, arabic = Response(), Response()
+    bilingual.headers["Vary"] = "Authorization, Accept-Language"
+
+    set_content_language(bilingual, None)
+    set_content_language(arabic, "ar")
+
+    assert bilingual.headers["Vary"] == "Authorization, Accept-Language"
+    assert "Content-Language" not in bilingual.headers
+    assert arabic.headers["Vary"] == "Accept-Language"
+    assert arabic.headers["Content-Language"] == "ar"
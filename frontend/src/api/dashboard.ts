@@ -11,6 +11,13 @@ export interface DashboardSummary {
   total_audits: number
   active_audits: number
   open_findings: number
+  controls_by_status: Record<string, number>
+  controls_by_priority: Record<string, number>
+  risks_by_status: Record<string, number>
+  risks_by_level: Record<string, number>
+  audits_by_status: Record<string, number>
+  findings_by_status: Record<string, number>
+  findings_by_severity: Record<string, number>
 }
 
 export const useDashboardSummary = () => {
@@ -22,3 +29,40 @@ export const useDashboardSummary = () => {
     },
   })
 }
+
+export interface ComplianceScore {
+  total_controls: number
+  applicable_controls: number
+  implemented_controls: number
+  compliance_percentage: number
+  weighted_compliance_percentage: number
+  by_status: Record<string, number>
+}
+
+export interface DomainCompliance extends ComplianceScore {
+  domain_en: string
+  domain_ar: string
+  by_priority: Record<string, Record<string, number>>
+}
+
+export interface StandardCompliance extends ComplianceScore {
+  standard_id: string
+  code: string | null
+  name_en: string | null
+  name_ar: string | null
+  domains: DomainCompliance[]
+}
+
+export interface ComplianceRollup extends ComplianceScore {
+  standards: StandardCompliance[]
+}
+
+export const useComplianceRollup = () => {
+  return useQuery({
+    queryKey: ['dashboard-compliance'],
+    queryFn: async () => {
+      const response = await apiClient.get<ComplianceRollup>('/dashboard/compliance')
+      return response.data
+    },
+  })
+}
@@ -1,4 +1,4 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { apiClient } from './client'
 
 export interface Risk {
@@ -13,13 +13,26 @@ export interface Risk {
   status: string
 }
 
+// Columns the register renders; the API returns only these
+const RISK_LIST_FIELDS =
+  'risk_id,title_en,title_ar,impact_score,likelihood_score,risk_score,risk_level,status'
+
+// Risks per page; the register loads further pages on request
+const RISK_PAGE_SIZE = 50
+
 export const useRisks = () => {
-  return useQuery({
+  return useInfiniteQuery({
     queryKey: ['risks'],
-    queryFn: async () => {
-      const response = await apiClient.get<Risk[]>('/risks')
-      return response.data
+    queryFn: async ({ pageParam }) => {
+      const response = await apiClient.get<Risk[]>('/risks', {
+        params: { limit: RISK_PAGE_SIZE, cursor: pageParam, fields: RISK_LIST_FIELDS },
+      })
+      return { risks: response.data, nextCursor: response.headers['x-next-cursor'] as string | undefined }
     },
+    initialPageParam: undefined as string | undefined,
+    // The header is absent on the last page
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    select: (data) => data.pages.flatMap((page) => page.risks),
   })
 }
 
@@ -10,7 +10,7 @@ import RiskForm from '../components/risks/RiskForm'
 export default function RiskRegisterPage() {
   const { t, i18n } = useTranslation()
   const isArabic = i18n.language === 'ar'
-  const { data: risks, isLoading, refetch } = useRisks()
+  const { data: risks, isLoading, refetch, hasNextPage, fetchNextPage, isFetchingNextPage } = useRisks()
   const [showForm, setShowForm] = useState(false)
   const [view, setView] = useState<'table' | 'matrix' | 'heatmap'>('table')
 
@@ -137,6 +137,18 @@ export default function RiskRegisterPage() {
           )}
         </div>
       )}
+
+      {hasNextPage && (
+        <div className="flex justify-center">
+          <button
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+            className="rounded-md border px-4 py-2 text-sm font-medium hover:bg-accent disabled:opacity-50"
+          >
+            {isFetchingNextPage ? t('common.loading') : t('common.loadMore')}
+          </button>
+        </div>
+      )}
     </div>
   )
 }